@@ -0,0 +1,222 @@
+# benchmarks/bench_market_account.py
+"""Microbenchmarks for the market account helpers (base58 and queue lookup).
+
+Usage:
+    python benchmarks/bench_market_account.py [--sizes 1024 16384 262144 1048576]
+        [--queues 0 10 314 1000 10000] [--json results.json] [--compare previous.json]
+
+`market_account.py` has no Home Assistant imports and is loaded straight from
+its file, so this runs without Home Assistant installed. Synthetic
+MarketAccount blobs of each size are generated with a node queue of each
+length, with the node's key in the last slot (or absent for an empty queue).
+Blob/queue combinations that do not fit are skipped. Timed paths:
+
+- `baseline_extract` / `baseline_lookup`: the original per-byte `Vec<Pubkey>`
+  candidate scanner, and its lookup that base58-encodes every candidate key
+  (kept below as the reference implementation)
+- `b58encode`: encoding every queued key, i.e. the baseline's per-key cost
+- `lookup_layout`: `_get_queue_position` on a blob with the MarketAccount discriminator
+- `lookup_heuristic`: the same blob without the discriminator (`_find_pubkey_in_vecs` fallback)
+- `lookup_slice`: `_get_queue_position_from_slice` on the RPC `dataSlice` (queues up to capacity)
+
+Results are emitted as JSON, with the commit they were measured on, so runs can
+be compared across commits with `--compare`.
+"""
+import argparse
+import importlib.util
+import json
+import platform
+import random
+import struct
+import subprocess
+import sys
+import timeit
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+MODULE_PATH = REPO_ROOT / "custom_components" / "nosana_node" / "market_account.py"
+
+
+def _load_market_account():
+    spec = importlib.util.spec_from_file_location("nosana_market_account", MODULE_PATH)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+ma = _load_market_account()
+
+
+# --- baseline: the original heuristic scanner, before the layout-aware decoder ---
+def _extract_pubkey_vec_candidates(raw: bytes) -> List[List[bytes]]:
+    """Heuristic: find possible borsh Vec(pubkey) occurrences in raw bytes.
+
+    Borsh vec encodes a u32 little-endian length followed by N items. For pubkeys
+    items are 32 bytes each. This scans for any plausible (length, items) slice
+    and returns candidate lists of pubkey byte sequences.
+    """
+    candidates: List[List[bytes]] = []
+    if not raw:
+        return candidates
+    Lmax = (len(raw) // 32) + 1
+    for i in range(0, max(1, len(raw) - 4)):
+        length = int.from_bytes(raw[i : i + 4], "little")
+        if length <= 0 or length > Lmax:
+            continue
+        start = i + 4
+        needed = length * 32
+        if start + needed <= len(raw):
+            pubkeys = [raw[start + j * 32 : start + (j + 1) * 32] for j in range(length)]
+            if all(len(pk) == 32 for pk in pubkeys):
+                candidates.append(pubkeys)
+    return candidates
+
+
+def _baseline_queue_position(market_raw: bytes, node_addr_b58: str) -> Optional[Tuple[int, int]]:
+    """Original lookup: longest candidate first, comparing base58 strings."""
+    candidates = _extract_pubkey_vec_candidates(market_raw)
+    if not candidates:
+        return None
+    candidates.sort(key=lambda c: len(c), reverse=True)
+    for pubkeys in candidates:
+        pubkey_strs = [ma._b58encode(pk) for pk in pubkeys]
+        try:
+            idx = pubkey_strs.index(node_addr_b58)
+            return idx + 1, len(pubkey_strs)
+        except ValueError:
+            continue
+    return None
+
+
+# --- synthetic market accounts ---
+def _random_key(rng: random.Random) -> bytes:
+    return rng.randbytes(32)
+
+
+def _market_blob(rng: random.Random, size: int, keys: List[bytes], discriminator: bool) -> bytes:
+    """A MarketAccount of `size` bytes holding `keys` as a node queue, padded with random bytes."""
+    header = bytearray(rng.randbytes(ma.MARKET_QUEUE_TYPE_OFFSET))
+    header[:8] = ma.MARKET_ACCOUNT_DISCRIMINATOR if discriminator else bytes(8)
+    blob = bytes(header) + bytes([ma.QUEUE_TYPE_NODE]) + struct.pack("<I", len(keys)) + b"".join(keys)
+    padding = size - len(blob)
+    return blob + rng.randbytes(padding)
+
+
+def _queue_slice(keys: List[bytes]) -> bytes:
+    body = bytes([ma.QUEUE_TYPE_NODE]) + struct.pack("<I", len(keys)) + b"".join(keys)
+    return body + bytes(ma.MARKET_QUEUE_SLICE_LENGTH - len(body))
+
+
+def _time(fn: Callable[[], Any], repeat: int) -> Dict[str, Any]:
+    """Best-of-repeat seconds per call; each repeat runs for at least 0.2 s."""
+    timer = timeit.Timer(fn)
+    number, _ = timer.autorange()
+    best = min(timer.repeat(repeat=repeat, number=number)) / number
+    return {"seconds_per_call": best, "calls": number * repeat}
+
+
+def _cases(size: int, queue: int, rng: random.Random, baseline: bool) -> List[Tuple[str, Callable[[], Any]]]:
+    keys = [_random_key(rng) for _ in range(queue)]
+    node_key = keys[-1] if keys else _random_key(rng)
+    node_addr = ma._b58encode(node_key)
+    with_layout = _market_blob(rng, size, keys, discriminator=True)
+    without_layout = _market_blob(rng, size, keys, discriminator=False)
+
+    cases: List[Tuple[str, Callable[[], Any]]] = []
+    if baseline:
+        cases.append(("baseline_extract", lambda: _extract_pubkey_vec_candidates(without_layout)))
+        cases.append(("baseline_lookup", lambda: _baseline_queue_position(without_layout, node_addr)))
+    if keys:
+        cases.append(("b58encode", lambda: [ma._b58encode(k) for k in keys]))
+    cases.append(("lookup_layout", lambda: ma._get_queue_position(with_layout, node_key)))
+    cases.append(("lookup_heuristic", lambda: ma._get_queue_position(without_layout, node_key)))
+    if queue <= ma.MARKET_QUEUE_CAPACITY:
+        queue_slice = _queue_slice(keys)
+        cases.append(("lookup_slice", lambda: ma._get_queue_position_from_slice(queue_slice, node_key)))
+    return cases
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        out = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=REPO_ROOT, capture_output=True, text=True, check=True
+        )
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return out.stdout.strip() or None
+
+
+def run(args: argparse.Namespace) -> Dict[str, Any]:
+    rng = random.Random(args.seed)
+    results: List[Dict[str, Any]] = []
+    for size in args.sizes:
+        for queue in args.queues:
+            if ma.MARKET_QUEUE_OFFSET + 4 + 32 * queue > size:
+                continue
+            baseline = not args.skip_baseline and size <= args.max_baseline_bytes
+            for name, fn in _cases(size, queue, rng, baseline):
+                timing = _time(fn, args.repeat)
+                result = fn()
+                results.append(
+                    {
+                        "case": name,
+                        "blob_bytes": size,
+                        "queue_keys": queue,
+                        **timing,
+                        # lookups report (position, total); list-valued paths their item count
+                        "result": len(result) if isinstance(result, list) else repr(result)[:40],
+                    }
+                )
+                print(f"{name:>17} {size:>8} B {queue:>6} keys  {timing['seconds_per_call'] * 1e6:14.2f} us", file=sys.stderr)
+    return {
+        "meta": {
+            "commit": _git_commit(),
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "python": platform.python_version(),
+            "numpy": getattr(ma.np, "__version__", None),
+            "seed": args.seed,
+        },
+        "results": results,
+    }
+
+
+def compare(current: Dict[str, Any], previous: Dict[str, Any]) -> None:
+    """Print current/previous time ratios for the cases both runs measured."""
+    before = {(r["case"], r["blob_bytes"], r["queue_keys"]): r["seconds_per_call"] for r in previous["results"]}
+    print(f"vs {previous['meta'].get('commit')} (ratio < 1 is faster)")
+    for r in current["results"]:
+        key = (r["case"], r["blob_bytes"], r["queue_keys"])
+        if key in before and before[key] > 0:
+            print(f"{r['case']:>17} {r['blob_bytes']:>8} B {r['queue_keys']:>6} keys  {r['seconds_per_call'] / before[key]:8.3f}x")
+
+
+def _parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1024, 16384, 262144, 1048576], help="blob sizes in bytes")
+    parser.add_argument("--queues", type=int, nargs="+", default=[0, 10, 314, 1000, 10000], help="queue lengths in keys")
+    parser.add_argument("--repeat", type=int, default=3, help="timing repeats (best is kept)")
+    parser.add_argument("--seed", type=int, default=1, help="seed for the synthetic blobs")
+    parser.add_argument("--skip-baseline", action="store_true", help="do not time the original scanner")
+    parser.add_argument(
+        "--max-baseline-bytes", type=int, default=1048576, help="largest blob the original scanner is timed on"
+    )
+    parser.add_argument("--json", type=Path, help="write the results to this file (default: stdout)")
+    parser.add_argument("--compare", type=Path, help="previous results file to compare against")
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    args = _parse_args(argv)
+    results = run(args)
+    if args.json:
+        args.json.write_text(json.dumps(results, indent=2))
+    else:
+        print(json.dumps(results, indent=2))
+    if args.compare:
+        compare(results, json.loads(args.compare.read_text()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,216 @@
+# benchmarks/bench_refresh.py
+"""Refresh benchmark for Nosana Node coordinators against a local stand-in API.
+
+Usage:
+    python benchmarks/bench_refresh.py [--nodes 1 10 100] [--rounds 20] [--latency-ms 20]
+        [--payload-bytes 0] [--error-rate 0] [--rate-429 0] [--json results.json]
+
+For each fleet size, N coordinators are created on a throwaway Home Assistant
+instance with their endpoint URLs pointed at `standin.py`. Each round then
+drives `NosanaNodeCoordinator._async_update_data` for every node concurrently,
+which is the fleet scheduler's worst case. Per fleet size it reports:
+
+- p50/p99 refresh latency (ms) over the warm rounds, plus the cold first round
+- allocations of one warm round under tracemalloc (peak KiB, new blocks)
+- requests per minute seen by the server, and requests per node refresh by endpoint
+
+Needs Home Assistant (and thus aiohttp) installed, like the integration itself.
+No network access is required.
+"""
+import argparse
+import asyncio
+import json
+import logging
+import math
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(REPO_ROOT))
+
+from homeassistant.core import HomeAssistant  # noqa: E402
+
+from custom_components.nosana_node.const import DOMAIN, DATA_RATE_LIMITER  # noqa: E402
+from custom_components.nosana_node.coordinator import NosanaNodeCoordinator  # noqa: E402
+from custom_components.nosana_node.market_account import _b58encode  # noqa: E402
+from custom_components.nosana_node.markets import get_markets_service  # noqa: E402
+from custom_components.nosana_node.ratelimit import NosanaRateLimiter  # noqa: E402
+
+from standin import StandInConfig, StandInServer  # noqa: E402
+
+
+def _percentile(samples: List[float], pct: float) -> Optional[float]:
+    """Nearest-rank percentile (None for no samples)."""
+    if not samples:
+        return None
+    ordered = sorted(samples)
+    rank = max(0, min(len(ordered) - 1, math.ceil(pct / 100.0 * len(ordered)) - 1))
+    return ordered[rank]
+
+
+def _node_address(rng: random.Random) -> str:
+    return _b58encode(bytes(rng.getrandbits(8) for _ in range(32)))
+
+
+def _create_coordinators(hass: HomeAssistant, base_url: str, count: int, rng: random.Random) -> List[NosanaNodeCoordinator]:
+    """Create fleet-mode coordinators (no timers of their own) aimed at the stand-in server."""
+    get_markets_service(hass).markets_url = f"{base_url}/api/markets"
+    coordinators = []
+    for _ in range(count):
+        address = _node_address(rng)
+        coordinator = NosanaNodeCoordinator(hass, address, fleet_mode=True, rpc_url=f"{base_url}/rpc")
+        coordinator.info_url = f"{base_url}/nodes/{address}/node/info"
+        coordinator.metrics_url = f"{base_url}/api/nodes/{address}/metrics"
+        coordinator.jobs_url_base = f"{base_url}/api/jobs"
+        coordinators.append(coordinator)
+    return coordinators
+
+
+async def _timed_refresh(coordinator: NosanaNodeCoordinator) -> Tuple[float, bool]:
+    """Run one refresh the way DataUpdateCoordinator does; returns (seconds, ok)."""
+    start = time.perf_counter()
+    try:
+        coordinator.data = await coordinator._async_update_data()
+        ok = True
+    except Exception:
+        ok = False
+    return time.perf_counter() - start, ok
+
+
+async def _round(coordinators: List[NosanaNodeCoordinator]) -> List[Tuple[float, bool]]:
+    return await asyncio.gather(*(_timed_refresh(c) for c in coordinators))
+
+
+async def _measure_allocations(coordinators: List[NosanaNodeCoordinator]) -> Dict[str, float]:
+    """Allocation profile of one warm round."""
+    tracemalloc.start()
+    try:
+        before = tracemalloc.take_snapshot()
+        baseline, _ = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+        await _round(coordinators)
+        _, peak = tracemalloc.get_traced_memory()
+        after = tracemalloc.take_snapshot()
+    finally:
+        tracemalloc.stop()
+    blocks = sum(stat.count_diff for stat in after.compare_to(before, "filename") if stat.count_diff > 0)
+    return {"alloc_peak_kib": round((peak - baseline) / 1024.0, 1), "alloc_blocks": blocks}
+
+
+async def _run_size(args: argparse.Namespace, nodes: int) -> Dict[str, Any]:
+    """Benchmark one fleet size on a fresh Home Assistant instance and server."""
+    config = StandInConfig(
+        latency_ms=args.latency_ms,
+        jitter_ms=args.jitter_ms,
+        payload_bytes=args.payload_bytes,
+        error_rate=args.error_rate,
+        rate_429=args.rate_429,
+        retry_after=args.retry_after,
+        jobs_per_page=args.jobs_per_page,
+        seed=args.seed,
+    )
+    server = StandInServer(config)
+    base_url = await server.async_start()
+    coordinators: List[NosanaNodeCoordinator] = []
+    with tempfile.TemporaryDirectory() as config_dir:
+        hass = HomeAssistant(config_dir)
+        try:
+            if args.rate > 0:
+                # everything is served from one local host: lift the per-host limit unless asked not to
+                hass.data.setdefault(DOMAIN, {})[DATA_RATE_LIMITER] = NosanaRateLimiter(
+                    rate=args.rate, capacity=args.rate
+                )
+            coordinators = _create_coordinators(hass, base_url, nodes, random.Random(args.seed))
+
+            cold = await _round(coordinators)
+            server.reset_counters()
+            warm: List[Tuple[float, bool]] = []
+            for _ in range(args.rounds):
+                warm.extend(await _round(coordinators))
+                if args.interval:
+                    await asyncio.sleep(args.interval)
+            elapsed = time.monotonic() - server.started
+            requests = dict(server.requests)
+            statuses = dict(server.statuses)
+            bytes_sent = server.bytes_sent
+
+            allocations = await _measure_allocations(coordinators)
+        finally:
+            for coordinator in coordinators:
+                await coordinator.async_flush_store()
+            await server.async_stop()
+            await hass.async_stop(force=True)
+
+    latencies = [seconds * 1000.0 for seconds, _ in warm]
+    refreshes = len(warm)
+    total_requests = sum(requests.values())
+    return {
+        "nodes": nodes,
+        "rounds": args.rounds,
+        "refreshes": refreshes,
+        "failed": sum(1 for _, ok in warm if not ok),
+        "cold_p50_ms": round(_percentile([s * 1000.0 for s, _ in cold], 50), 2),
+        "p50_ms": round(_percentile(latencies, 50), 2) if latencies else None,
+        "p99_ms": round(_percentile(latencies, 99), 2) if latencies else None,
+        **allocations,
+        "requests_per_minute": round(total_requests / elapsed * 60.0, 1) if elapsed > 0 else None,
+        "requests_per_refresh": {
+            endpoint: round(count / refreshes, 3) for endpoint, count in sorted(requests.items())
+        }
+        if refreshes
+        else {},
+        "statuses": {str(status): count for status, count in sorted(statuses.items())},
+        "kib_per_refresh": round(bytes_sent / 1024.0 / refreshes, 2) if refreshes else None,
+    }
+
+
+def _print_table(results: List[Dict[str, Any]]) -> None:
+    columns = ("nodes", "refreshes", "failed", "cold_p50_ms", "p50_ms", "p99_ms", "alloc_peak_kib", "alloc_blocks", "requests_per_minute")
+    print("  ".join(f"{c:>19}" for c in columns))
+    for result in results:
+        print("  ".join(f"{str(result[c]):>19}" for c in columns))
+    for result in results:
+        print(f"\n{result['nodes']} node(s): requests per refresh {result['requests_per_refresh']}, statuses {result['statuses']}")
+
+
+def _parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--nodes", type=int, nargs="+", default=[1, 10, 100], help="fleet sizes to benchmark")
+    parser.add_argument("--rounds", type=int, default=20, help="warm refresh rounds per fleet size")
+    parser.add_argument("--interval", type=float, default=0.0, help="seconds to sleep between rounds")
+    parser.add_argument("--latency-ms", type=float, default=20.0, help="mean server latency")
+    parser.add_argument("--jitter-ms", type=float, default=10.0, help="uniform latency jitter (+/-)")
+    parser.add_argument("--payload-bytes", type=int, default=0, help="filler added to metrics/markets payloads")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="share of requests answered with 500")
+    parser.add_argument("--rate-429", type=float, default=0.0, help="share of requests answered with 429")
+    parser.add_argument("--retry-after", type=float, default=1.0, help="Retry-After seconds sent with 429s")
+    parser.add_argument("--jobs-per-page", type=int, default=10, help="jobs returned per /api/jobs page")
+    parser.add_argument(
+        "--rate", type=float, default=1000.0, help="rate limiter tokens/s per host (0 keeps the integration defaults)"
+    )
+    parser.add_argument("--seed", type=int, default=1, help="seed for latency jitter, errors and node addresses")
+    parser.add_argument("--json", type=Path, help="also write the results as JSON to this file")
+    parser.add_argument("--verbose", action="store_true", help="show the integration's log output")
+    return parser.parse_args(argv)
+
+
+async def _async_main(args: argparse.Namespace) -> List[Dict[str, Any]]:
+    return [await _run_size(args, nodes) for nodes in args.nodes]
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    args = _parse_args(argv)
+    logging.basicConfig(level=logging.DEBUG if args.verbose else logging.CRITICAL)
+    results = asyncio.run(_async_main(args))
+    _print_table(results)
+    if args.json:
+        args.json.write_text(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,276 @@
+# benchmarks/standin.py
+"""Local stand-in for the Nosana APIs polled by the integration.
+
+Serves the endpoints a coordinator refresh touches, on one local port:
+
+- `/nodes/{address}/node/info`      (stands in for `https://{address}.node.k8s.prd.nos.ci/node/info`)
+- `/api/nodes/{address}/metrics`    (dashboard metrics, with ETag / 304 support)
+- `/api/markets`                    (dashboard markets, with ETag / 304 support)
+- `/api/jobs?node=&limit=&offset=`  (dashboard jobs)
+- `/rpc`                            (Solana JSON-RPC `getMultipleAccounts` for market queues)
+
+Latency, payload size, error rate and the share of 429 responses are
+configurable, and every request is counted per endpoint so the benchmark can
+report request rates. `/rpc` also logs the addresses of every
+`getMultipleAccounts` call (`rpc_calls`) and answers with the queue slice set
+in `queues` (an empty queue by default), so the tests can check batching.
+A websocket on the same path answers `accountSubscribe`/`accountUnsubscribe`
+and sends `accountNotification` frames on demand (`async_notify`); sockets can
+be dropped and handshakes refused to exercise the reconnect path.
+"""
+import asyncio
+import base64
+import hashlib
+import json
+import random
+import time
+from collections import Counter
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from aiohttp import WSMsgType, web
+
+# queue type 255 (empty) followed by a zero vec length: the smallest valid queue slice
+_EMPTY_QUEUE_SLICE = bytes([255]) + (0).to_bytes(4, "little")
+
+MARKET_ADDRESS = "97G9NnvBDQ2WpKu6fasoMsAKmfj63C9rhysJnkeWodAf"
+
+
+@dataclass
+class StandInConfig:
+    """Behaviour of the stand-in server."""
+
+    latency_ms: float = 20.0
+    jitter_ms: float = 10.0
+    # extra bytes of filler in metrics and markets payloads
+    payload_bytes: int = 0
+    # share of requests answered with 500 / 429
+    error_rate: float = 0.0
+    rate_429: float = 0.0
+    retry_after: float = 1.0
+    jobs_per_page: int = 10
+    markets: int = 20
+    seed: Optional[int] = None
+
+
+class StandInServer:
+    """aiohttp application serving synthetic Nosana payloads."""
+
+    def __init__(self, config: StandInConfig):
+        self.config = config
+        self.requests: Counter = Counter()
+        self.statuses: Counter = Counter()
+        self.bytes_sent = 0
+        self.started = time.monotonic()
+        self._random = random.Random(config.seed)
+        self._runner: Optional[web.AppRunner] = None
+        self.base_url = ""
+        self._markets_body = self._encode(self._markets_payload())
+        # market address -> queue slice served by getMultipleAccounts (as if cut by its dataSlice)
+        self.queues: Dict[str, bytes] = {}
+        # addresses of each getMultipleAccounts call, in order
+        self.rpc_calls: List[List[str]] = []
+        # push feed: handshakes are refused (503) while disabled
+        self.ws_enabled = True
+        # monotonic time of every websocket handshake attempt
+        self.ws_connects: List[float] = []
+        self._sockets: Set[web.WebSocketResponse] = set()
+        # subscription id -> (socket, market address)
+        self.subscriptions: Dict[int, Tuple[web.WebSocketResponse, str]] = {}
+        self._next_subscription = 1
+
+    def reset_counters(self) -> None:
+        """Zero the request counters (e.g. after a warm-up round)."""
+        self.requests.clear()
+        self.statuses.clear()
+        self.bytes_sent = 0
+        self.rpc_calls.clear()
+        self.started = time.monotonic()
+
+    async def async_start(self, host: str = "127.0.0.1", port: int = 0) -> str:
+        """Start serving; returns the base URL."""
+        app = web.Application(middlewares=[self._middleware])
+        app.router.add_get("/nodes/{address}/node/info", self._info)
+        app.router.add_get("/api/nodes/{address}/metrics", self._metrics)
+        app.router.add_get("/api/markets", self._markets)
+        app.router.add_get("/api/jobs", self._jobs)
+        app.router.add_post("/rpc", self._rpc)
+        app.router.add_get("/rpc", self._rpc_ws)
+        self._runner = web.AppRunner(app, access_log=None)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, host, port)
+        await site.start()
+        sockets = site._server.sockets  # bound port when port=0
+        self.base_url = f"http://{host}:{sockets[0].getsockname()[1]}"
+        return self.base_url
+
+    async def async_stop(self) -> None:
+        """Stop serving."""
+        await self.async_drop_sockets()
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+
+    @web.middleware
+    async def _middleware(self, request: web.Request, handler) -> web.StreamResponse:
+        endpoint = request.match_info.route.resource.canonical if request.match_info.route.resource else "?"
+        self.requests[endpoint] += 1
+        config = self.config
+        delay = max(0.0, config.latency_ms + self._random.uniform(-config.jitter_ms, config.jitter_ms))
+        await asyncio.sleep(delay / 1000.0)
+        roll = self._random.random()
+        if roll < config.rate_429:
+            response = web.Response(status=429, headers={"Retry-After": f"{config.retry_after:g}"})
+        elif roll < config.rate_429 + config.error_rate:
+            response = web.Response(status=500)
+        else:
+            response = await handler(request)
+        self.statuses[response.status] += 1
+        self.bytes_sent += response.content_length or 0
+        return response
+
+    def _encode(self, payload: Any) -> bytes:
+        return json.dumps(payload).encode()
+
+    def _json(self, request: web.Request, body: bytes, conditional: bool = False) -> web.Response:
+        if not conditional:
+            return web.Response(body=body, content_type="application/json")
+        etag = '"' + hashlib.sha1(body).hexdigest() + '"'
+        if request.headers.get("If-None-Match") == etag:
+            return web.Response(status=304, headers={"ETag": etag})
+        return web.Response(body=body, content_type="application/json", headers={"ETag": etag})
+
+    def _filler(self) -> str:
+        return "x" * self.config.payload_bytes
+
+    def _markets_payload(self) -> List[Dict[str, Any]]:
+        markets = [
+            {
+                "address": MARKET_ADDRESS if i == 0 else f"market{i:040d}",
+                "name": f"Market {i}",
+                "type": "PREMIUM",
+                "slug": f"market-{i}",
+                "usdRewardPerHour": 0.192,
+                "nosRewardPerSecond": 0.0001,
+            }
+            for i in range(self.config.markets)
+        ]
+        if self.config.payload_bytes and markets:
+            markets[-1]["description"] = self._filler()
+        return markets
+
+    async def _info(self, request: web.Request) -> web.Response:
+        address = request.match_info["address"]
+        payload = {"state": "QUEUED", "address": address, "version": "1.0.0", "country": "NL"}
+        return self._json(request, self._encode(payload))
+
+    async def _metrics(self, request: web.Request) -> web.Response:
+        payload = {
+            "marketAddress": MARKET_ADDRESS,
+            "metrics": {
+                "package_version": "1.0.0",
+                "system_environment": "linux",
+                "ram_gb": 64,
+                "disk_gb": 512,
+                "network": {"ping_ms": 12, "download_mbps": 900, "upload_mbps": 400, "country": "NL"},
+                "cpu": {"cpu_model": "AMD EPYC", "logical_cores": 32, "physical_cores": 16},
+                "gpu": {"devices": [{"name": "NVIDIA RTX 4090", "vram_total_mb": 24564}]},
+                "llama3_tokens_per_second_mean": 91.5,
+                "filler": self._filler(),
+            },
+        }
+        return self._json(request, self._encode(payload), conditional=True)
+
+    async def _markets(self, request: web.Request) -> web.Response:
+        return self._json(request, self._markets_body, conditional=True)
+
+    async def _jobs(self, request: web.Request) -> web.Response:
+        limit = min(int(request.query.get("limit", 10)), self.config.jobs_per_page)
+        offset = int(request.query.get("offset", 0))
+        now = int(time.time())
+        jobs = [
+            {
+                "id": offset + i + 1,
+                "timeStart": now - 3600 * (offset + i + 1),
+                "timeEnd": now - 3600 * (offset + i + 1) + 1800,
+                "timeout": 3600,
+                "usdRewardPerHour": 0.192,
+            }
+            # the job history ends after a few pages so backfill passes terminate
+            for i in range(max(0, min(limit, 50 - offset)))
+        ]
+        return self._json(request, self._encode({"jobs": jobs}))
+
+    async def _rpc(self, request: web.Request) -> web.Response:
+        body = await request.json()
+        addresses = (body.get("params") or [[]])[0]
+        self.rpc_calls.append(list(addresses))
+        value = [
+            {"data": [base64.b64encode(self.queues.get(address, _EMPTY_QUEUE_SLICE)).decode(), "base64"]}
+            for address in addresses
+        ]
+        payload = {"jsonrpc": "2.0", "id": body.get("id"), "result": {"value": value}}
+        return self._json(request, self._encode(payload))
+
+    async def _rpc_ws(self, request: web.Request) -> web.StreamResponse:
+        self.ws_connects.append(time.monotonic())
+        if not self.ws_enabled:
+            return web.Response(status=503)
+        ws = web.WebSocketResponse()
+        await ws.prepare(request)
+        self._sockets.add(ws)
+        try:
+            async for message in ws:
+                if message.type != WSMsgType.TEXT:
+                    continue
+                body = message.json()
+                method = body.get("method")
+                params = body.get("params") or [None]
+                if method == "accountSubscribe":
+                    result: Any = self._next_subscription
+                    self._next_subscription += 1
+                    self.subscriptions[result] = (ws, params[0])
+                elif method == "accountUnsubscribe":
+                    result = self.subscriptions.pop(params[0], None) is not None
+                else:
+                    error = {"code": -32601, "message": "Method not found"}
+                    await ws.send_json({"jsonrpc": "2.0", "id": body.get("id"), "error": error})
+                    continue
+                await ws.send_json({"jsonrpc": "2.0", "id": body.get("id"), "result": result})
+        finally:
+            self._sockets.discard(ws)
+            for sub_id in [s for s, (socket, _) in self.subscriptions.items() if socket is ws]:
+                del self.subscriptions[sub_id]
+        return ws
+
+    def subscribed(self, market_address: str) -> bool:
+        """Return True when some socket holds a subscription to the market."""
+        return any(market == market_address for _, market in self.subscriptions.values())
+
+    async def async_notify(self, market_address: str, account: bytes) -> int:
+        """Send an accountNotification with the full account data to every subscriber; returns the count."""
+        data = base64.b64encode(account).decode()
+        sent = 0
+        for sub_id, (ws, market) in list(self.subscriptions.items()):
+            if market != market_address or ws.closed:
+                continue
+            params = {
+                "result": {
+                    "context": {"slot": 1},
+                    "value": {"data": [data, "base64"], "executable": False, "lamports": 1, "owner": "", "rentEpoch": 0},
+                },
+                "subscription": sub_id,
+            }
+            await ws.send_json({"jsonrpc": "2.0", "method": "accountNotification", "params": params})
+            sent += 1
+        return sent
+
+    async def async_send_raw(self, text: str) -> None:
+        """Send a raw text frame on every open socket (e.g. malformed messages)."""
+        for ws in list(self._sockets):
+            await ws.send_str(text)
+
+    async def async_drop_sockets(self) -> None:
+        """Close every open websocket, as a restarting RPC node would."""
+        for ws in list(self._sockets):
+            await ws.close()
@@ -4,8 +4,11 @@ from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant
 from homeassistant.const import Platform
 
-from .const import DOMAIN
+from .conditional import get_conditional_cache
+from .const import DOMAIN, CONF_COUNTDOWN_RESOLUTION, CONF_FLEET_MODE, CONF_PUSH_MODE, CONF_RPC_URL, DEFAULT_COUNTDOWN_RESOLUTION
 from .coordinator import NosanaNodeCoordinator
+from .fleet import get_fleet_scheduler
+from .profiler import async_register_services, async_unload_services
 
 PLATFORMS = [Platform.SENSOR]
 
@@ -15,19 +18,51 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     hass.data.setdefault(DOMAIN, {})
 
     node_address = entry.data["node_address"]
-    coordinator = NosanaNodeCoordinator(hass, node_address)
+    fleet_mode = bool(entry.options.get(CONF_FLEET_MODE, False))
+    coordinator = NosanaNodeCoordinator(
+        hass, node_address, fleet_mode=fleet_mode, rpc_url=entry.options.get(CONF_RPC_URL)
+    )
 
     # Fetch initial data
     await coordinator.async_config_entry_first_refresh()
 
     hass.data[DOMAIN][entry.entry_id] = coordinator
+    # Job countdown ticks locally between polls; the sensors listen to it
+    coordinator.enable_countdown(entry.options.get(CONF_COUNTDOWN_RESOLUTION, DEFAULT_COUNTDOWN_RESOLUTION))
     await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
 
+    # Complete the earnings ledger from the paginated job history in the background
+    coordinator.enable_backfill()
+
+    if entry.options.get(CONF_PUSH_MODE, False):
+        # Market queue updates pushed over the RPC websocket
+        coordinator.enable_queue_push()
+
+    if fleet_mode:
+        # One shared scheduler drives all fleet-mode nodes
+        get_fleet_scheduler(hass).async_add(coordinator)
+
+    # nosana_node.profile_refresh
+    async_register_services(hass)
+
+    entry.async_on_unload(entry.add_update_listener(_async_options_updated))
+
     return True
 
 
+async def _async_options_updated(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Reload the entry so option changes (e.g. fleet mode, RPC URL) take effect."""
+    await hass.config_entries.async_reload(entry.entry_id)
+
+
 async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Unload a config entry."""
     if unload_ok := await hass.config_entries.async_unload_platforms(entry, PLATFORMS):
-        hass.data[DOMAIN].pop(entry.entry_id)
+        coordinator = hass.data[DOMAIN].pop(entry.entry_id)
+        await coordinator.async_flush_store()
+        async_unload_services(hass, coordinator)
+        # drop the cached metrics payload and validators of the removed node
+        get_conditional_cache(hass).forget(coordinator.metrics_url)
+        if coordinator.fleet_mode:
+            get_fleet_scheduler(hass).async_remove(coordinator)
     return unload_ok
\ No newline at end of file
@@ -0,0 +1,122 @@
+# custom_components/nosana_node/backfill.py
+"""Background job-history backfill for Nosana Node integration.
+
+The regular jobs fetch only sees the 10 most recent jobs, so a job that drops
+out of that window between fetches would never be counted. The backfill
+engine pages through `/api/jobs` with offset/limit in the background and feeds
+every job into the node's ledger:
+
+- The first pass walks the whole history, resuming from a cursor persisted in
+  the jobs Store, until the API returns a short page.
+- Later passes start from offset 0 and stop as soon as a page reaches jobs the
+  ledger already knows in their final state.
+- Pages are spaced by `page_interval` seconds, go through the shared rate
+  limiter at backfill (lowest) priority, and a pass is capped at `max_pages`
+  so the backfill never competes with status polling.
+"""
+import asyncio
+import logging
+from datetime import datetime, timezone
+from typing import TYPE_CHECKING, Optional
+
+from .ratelimit import PRIORITY_BACKFILL
+
+if TYPE_CHECKING:
+    from .coordinator import NosanaNodeCoordinator
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class JobsBackfill:
+    """Page through a node's job history and merge it into its ledger."""
+
+    def __init__(
+        self,
+        coordinator: "NosanaNodeCoordinator",
+        page_size: int = 50,
+        page_interval: float = 5.0,
+        max_pages: int = 20,
+    ):
+        """Initialize the backfill engine."""
+        self._coordinator = coordinator
+        self.page_size = page_size
+        self.page_interval = page_interval
+        self.max_pages = max_pages
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def running(self) -> bool:
+        """Return True while a backfill pass is in progress."""
+        return self._task is not None and not self._task.done()
+
+    def async_start(self) -> None:
+        """Start a backfill pass in the background unless one is running."""
+        if self.running:
+            return
+        hass = self._coordinator.hass
+        self._task = hass.async_create_background_task(
+            self.async_run(), f"nosana_node jobs backfill {self._coordinator.node_address[:8]}"
+        )
+
+    def async_cancel(self) -> None:
+        """Cancel a running backfill pass (the cursor keeps its progress)."""
+        if self.running:
+            self._task.cancel()
+        self._task = None
+
+    async def async_run(self) -> None:
+        """Run one backfill pass."""
+        ledger = await self._coordinator.async_get_ledger()
+        cursor = ledger.backfill
+        complete = bool(cursor.get("complete"))
+        offset = 0 if complete else int(cursor.get("offset", 0) or 0)
+        pages = 0
+        ingested = 0
+
+        while pages < self.max_pages:
+            if pages:
+                # self rate-limit between pages
+                await asyncio.sleep(self.page_interval)
+            page = await self._coordinator.async_fetch_jobs_page(self.page_size, offset, PRIORITY_BACKFILL)
+            if page is None:
+                break
+            pages += 1
+
+            reached_known = False
+            for job in page:
+                if not isinstance(job, dict):
+                    continue
+                known = ledger.jobs.get(str(job.get("id")))
+                changed, _ = ledger.ingest(job)
+                if changed:
+                    ingested += 1
+                elif known is not None and known.get("finalized"):
+                    reached_known = True
+
+            offset += len(page)
+            if not complete:
+                # persist the resume cursor with the records
+                cursor["offset"] = offset
+                ledger.dirty = True
+
+            if len(page) < self.page_size:
+                # end of history: the first full pass is done
+                if not complete:
+                    cursor["complete"] = True
+                    cursor["offset"] = 0
+                    ledger.dirty = True
+                break
+            if complete and reached_known:
+                # incremental pass reached already-known history
+                break
+
+        cursor["last_run"] = datetime.now(timezone.utc).isoformat()
+        ledger.dirty = True
+        self._coordinator.schedule_ledger_save()
+        _LOGGER.debug(
+            "Jobs backfill for %s: %s page(s), %s job(s) added/updated, complete=%s",
+            self._coordinator.node_address,
+            pages,
+            ingested,
+            cursor.get("complete"),
+        )
@@ -0,0 +1,91 @@
+# custom_components/nosana_node/conditional.py
+"""Conditional GET support for Nosana Node integration.
+
+Keeps the validators (ETag / Last-Modified) and the parsed JSON body of each
+URL, and sends `If-None-Match` / `If-Modified-Since` on the next request. A
+`304 Not Modified` answer returns the previously parsed object itself, so
+callers can detect "unchanged" by identity and skip any normalization work.
+"""
+import logging
+from typing import Any, Dict, Optional, Tuple
+
+from homeassistant.core import HomeAssistant
+
+from .const import DOMAIN, DATA_CONDITIONAL_CACHE
+from .instrumentation import EndpointStats
+from .ratelimit import PRIORITY_STATUS
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class _Entry:
+    """Validators and parsed body of one URL."""
+
+    __slots__ = ("etag", "last_modified", "payload")
+
+    def __init__(self, etag: Optional[str], last_modified: Optional[str], payload: Any):
+        self.etag = etag
+        self.last_modified = last_modified
+        self.payload = payload
+
+
+class ConditionalCache:
+    """Per-URL validator cache shared by all coordinators."""
+
+    def __init__(self):
+        """Initialize the cache."""
+        self._entries: Dict[str, _Entry] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def forget(self, url: str) -> None:
+        """Drop the validators of url (e.g. when the node is removed)."""
+        self._entries.pop(url, None)
+
+    async def async_get_json(
+        self, session, limiter, url: str, priority: int = PRIORITY_STATUS, stats: Optional[EndpointStats] = None
+    ) -> Tuple[int, Any]:
+        """GET url as JSON with validators; return (status, payload).
+
+        On 304 the status is reported as 304 and the payload is the cached object
+        (identity preserved). For other non-200 statuses the payload is None.
+        """
+        entry = self._entries.get(url)
+        headers: Dict[str, str] = {}
+        if entry is not None:
+            if entry.etag:
+                headers["If-None-Match"] = entry.etag
+            if entry.last_modified:
+                headers["If-Modified-Since"] = entry.last_modified
+
+        resp = await limiter.async_get(session, url, priority, stats, headers=headers or None)
+        if resp.status == 304 and entry is not None:
+            self.hits += 1
+            return 304, entry.payload
+        if resp.status != 200:
+            return resp.status, None
+
+        self.misses += 1
+        payload = await resp.json()
+        resp_headers = getattr(resp, "headers", None) or {}
+        etag = resp_headers.get("ETag")
+        last_modified = resp_headers.get("Last-Modified")
+        if etag or last_modified:
+            self._entries[url] = _Entry(etag, last_modified, payload)
+        else:
+            # server doesn't support validators for this URL; don't keep the body around
+            self._entries.pop(url, None)
+        return 200, payload
+
+
+def get_conditional_cache(hass: HomeAssistant) -> ConditionalCache:
+    """Return the shared conditional-request cache, creating it on first use."""
+    domain_data = hass.data.setdefault(DOMAIN, {})
+    cache = domain_data.get(DATA_CONDITIONAL_CACHE)
+    if cache is None:
+        cache = ConditionalCache()
+        domain_data[DATA_CONDITIONAL_CACHE] = cache
+    return cache
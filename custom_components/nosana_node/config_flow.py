@@ -2,9 +2,19 @@
 """Config flow for Nosana Node integration."""
 from homeassistant import config_entries
 from homeassistant.const import CONF_NAME
+from homeassistant.core import callback
 import voluptuous as vol
 
-from .const import DOMAIN, CONF_NODE_ADDRESS
+from .const import (
+    DOMAIN,
+    CONF_NODE_ADDRESS,
+    CONF_FLEET_MODE,
+    CONF_PUSH_MODE,
+    CONF_RPC_URL,
+    CONF_COUNTDOWN_RESOLUTION,
+    DEFAULT_COUNTDOWN_RESOLUTION,
+    DEFAULT_RPC_URL,
+)
 from .coordinator import NosanaNodeCoordinator
 
 
@@ -13,6 +23,12 @@ class NosanaNodeConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
 
     VERSION = 1
 
+    @staticmethod
+    @callback
+    def async_get_options_flow(config_entry):
+        """Return the options flow handler."""
+        return NosanaNodeOptionsFlow(config_entry)
+
     async def async_step_user(self, user_input=None):
         """Handle the initial step."""
         errors = {}
@@ -37,6 +53,9 @@ class NosanaNodeConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
                     )
             except Exception:
                 errors["base"] = "cannot_connect"
+            finally:
+                # release the shared market queue registration of the throwaway coordinator
+                await coordinator.async_flush_store()
 
         data_schema = vol.Schema({
             vol.Required(CONF_NODE_ADDRESS): str,
@@ -47,4 +66,34 @@ class NosanaNodeConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
             step_id="user",
             data_schema=data_schema,
             errors=errors,
-        )
\ No newline at end of file
+        )
+
+
+class NosanaNodeOptionsFlow(config_entries.OptionsFlow):
+    """Handle Nosana Node options."""
+
+    def __init__(self, config_entry):
+        """Initialize the options flow."""
+        self._entry = config_entry
+
+    async def async_step_init(self, user_input=None):
+        """Manage the options."""
+        if user_input is not None:
+            return self.async_create_entry(title="", data=user_input)
+
+        options = self._entry.options
+        data_schema = vol.Schema({
+            # Fleet mode: one shared scheduler drives all fleet-mode nodes
+            vol.Optional(CONF_FLEET_MODE, default=options.get(CONF_FLEET_MODE, False)): bool,
+            # Solana RPC used for market queue lookups; empty disables them (no RPC calls)
+            vol.Optional(CONF_RPC_URL, default=options.get(CONF_RPC_URL, DEFAULT_RPC_URL)): str,
+            # Push mode: accountSubscribe over the RPC websocket, polling as fallback
+            vol.Optional(CONF_PUSH_MODE, default=options.get(CONF_PUSH_MODE, False)): bool,
+            # Seconds between local updates of the job time-left sensor
+            vol.Optional(
+                CONF_COUNTDOWN_RESOLUTION,
+                default=options.get(CONF_COUNTDOWN_RESOLUTION, DEFAULT_COUNTDOWN_RESOLUTION),
+            ): vol.All(vol.Coerce(int), vol.Range(min=1, max=3600)),
+        })
+
+        return self.async_show_form(step_id="init", data_schema=data_schema)
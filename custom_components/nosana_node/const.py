@@ -2,4 +2,30 @@
 """Constants for the Nosana Node integration."""
 
 DOMAIN = "nosana_node"
-CONF_NODE_ADDRESS = "node_address"
\ No newline at end of file
+CONF_NODE_ADDRESS = "node_address"
+CONF_FLEET_MODE = "fleet_mode"
+
+# hass.data[DOMAIN] keys for fleet-wide shared services (entries are keyed by entry_id)
+DATA_MARKETS = "markets"
+DATA_FLEET = "fleet"
+DATA_RATE_LIMITER = "rate_limiter"
+DATA_CONDITIONAL_CACHE = "conditional_cache"
+DATA_MARKET_QUEUES = "market_queues"
+DATA_PROFILER = "profiler"
+
+# Solana RPC used for market queue lookups (any JSON-RPC endpoint, e.g. a local mock).
+# Opt-in: without an RPC URL the queue sensors stay empty and no RPC calls are made.
+CONF_RPC_URL = "rpc_url"
+DEFAULT_RPC_URL = ""
+# subscribe to market accounts over the RPC websocket instead of polling them
+CONF_PUSH_MODE = "push_mode"
+
+# seconds between local ticks of the job countdown sensors (no network calls)
+CONF_COUNTDOWN_RESOLUTION = "countdown_resolution"
+DEFAULT_COUNTDOWN_RESOLUTION = 60
+# fired on the event bus when a running job reaches its timeout
+EVENT_JOB_EXPIRED = f"{DOMAIN}_job_expired"
+
+# profile the next refreshes of one node; stats are written to the config directory
+SERVICE_PROFILE_REFRESH = "profile_refresh"
+DEFAULT_PROFILE_REFRESHES = 5
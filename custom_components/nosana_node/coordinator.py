@@ -1,14 +1,35 @@
 # custom_components/nosana_node/coordinator.py
 """Data coordinator for Nosana Node integration."""
+import asyncio
 import logging
+import time
+from collections import deque
 from datetime import timedelta, datetime, timezone
-from typing import Optional, Tuple, List, Dict, Any
+from typing import Callable, Deque, FrozenSet, Mapping, Optional, Tuple, List, Dict, Any
 
 import async_timeout
+from homeassistant.core import callback
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator
 from homeassistant.helpers.aiohttp_client import async_get_clientsession
 from homeassistant.helpers.storage import Store
 
+from .backfill import JobsBackfill
+from .conditional import get_conditional_cache
+from .countdown import JobCountdown, _job_expiry_ts
+from .instrumentation import CacheStats, EndpointStats, LatencyHistogram, RefreshTrace
+from .ledger import JobsLedger
+from .market_account import (
+    _get_queue_position_from_slice,
+    _node_key,
+    QUEUE_TYPE_EMPTY,
+    QUEUE_TYPE_JOB,
+    QUEUE_TYPE_NODE,
+)
+from .market_queue import NosanaMarketQueueService, get_market_queue_service
+from .markets import get_markets_service
+from .ratelimit import PRIORITY_STATUS, RateLimited, get_rate_limiter
+from .snapshot import ALL_SECTIONS, Earnings, Market, NodeSnapshot, Specs, build_snapshot, changed_sections
+
 # Import UpdateFailed in a way that works across Home Assistant versions
 try:
     # Preferred location in many versions
@@ -22,431 +43,702 @@ except Exception:  # pragma: no cover - defensive fallback
 
 _LOGGER = logging.getLogger(__name__)
 
+_QUEUE_TYPE_NAMES = {QUEUE_TYPE_JOB: "job", QUEUE_TYPE_NODE: "node", QUEUE_TYPE_EMPTY: "empty"}
+
+# refresh traces kept per node for the diagnostics download
+REFRESH_TRACES = 20
+
+
+def _normalize_info(info_fetch_ok: bool, info: Any) -> Tuple[Dict[str, Any], str]:
+    """Normalize status/state for automations; return (info, normalized_status)."""
+    normalized_status = "Offline"
+    raw_state = None
+    if info_fetch_ok and isinstance(info, dict):
+        raw_state = info.get("state") or info.get("status") or info.get("nodeStatus")
+        if isinstance(raw_state, str):
+            s = raw_state.upper()
+            if s == "OTHER":
+                normalized_status = "Running"
+            elif s == "QUEUED":
+                normalized_status = "Queued"
+            elif s in ("RUNNING", "ONLINE"):
+                normalized_status = "Running"
+            elif s in ("OFFLINE", "STOPPED", "ERROR"):
+                normalized_status = "Offline"
+            else:
+                # unknown state but endpoint responded; assume Running
+                normalized_status = "Running"
+        else:
+            # info responded but no usable state string
+            normalized_status = "Running"
+    else:
+        # info endpoint failed → Offline
+        normalized_status = "Offline"
 
-# --- minimal base58 encoding (pure python) ---
-_B58_ALPHABET = "123456789ABCDEFGHJKLMNPQRSTUVWXYZabcdefghijkmnopqrstuvwxyz"
-
-
-def _b58encode(data: bytes) -> str:
-    """Encode bytes to base58 (pure Python)."""
-    num = int.from_bytes(data, "big")
-    if num == 0:
-        # preserve leading zeros count
-        n_pad = len(data) - len(data.lstrip(b"\0"))
-        return _B58_ALPHABET[0] * n_pad
-    enc = []
-    while num > 0:
-        num, rem = divmod(num, 58)
-        enc.append(_B58_ALPHABET[rem])
-    # leading zero bytes -> '1'
-    n_pad = len(data) - len(data.lstrip(b"\0"))
-    return _B58_ALPHABET[0] * n_pad + "".join(reversed(enc))
-
-
-def _decode_account_data(raw) -> Optional[bytes]:
-    """Decode account data shapes returned by Solana RPC into raw bytes."""
-    if raw is None:
-        return None
-    # common RPC shape: [base64_string, "base64"]
-    if isinstance(raw, (list, tuple)) and len(raw) >= 1 and isinstance(raw[0], str):
-        import base64
-
-        return base64.b64decode(raw[0])
-    if isinstance(raw, (bytes, bytearray)):
-        return bytes(raw)
-    return None
-
-
-def _extract_pubkey_vec_candidates(raw: bytes) -> List[List[bytes]]:
-    """Heuristic: find possible borsh Vec(pubkey) occurrences in raw bytes.
-
-    Borsh vec encodes a u32 little-endian length followed by N items. For pubkeys
-    items are 32 bytes each. This scans for any plausible (length, items) slice
-    and returns candidate lists of pubkey byte sequences.
-    """
-    candidates: List[List[bytes]] = []
-    if not raw:
-        return candidates
-    Lmax = (len(raw) // 32) + 1
-    # scan through the blob looking for a 4-byte little-endian length that yields
-    # a plausible number of 32-byte pubkey entries remaining
-    for i in range(0, max(1, len(raw) - 4)):
-        # read u32 LE at position i
-        length = int.from_bytes(raw[i : i + 4], "little")
-        if length <= 0 or length > Lmax:
-            continue
-        start = i + 4
-        needed = length * 32
-        if start + needed <= len(raw):
-            pubkeys = [
-                raw[start + j * 32 : start + (j + 1) * 32] for j in range(length)
-            ]
-            if all(len(pk) == 32 for pk in pubkeys):
-                candidates.append(pubkeys)
-    return candidates
+    # Ensure consistent keys are present; uptime/network removed (no longer provided)
+    info = info if isinstance(info, dict) else {}
+    info["status"] = normalized_status
+    info["nodeStatus"] = normalized_status
+    info["state"] = raw_state if isinstance(raw_state, str) else normalized_status
+    return info, normalized_status
 
 
-def _get_queue_position_from_market_raw(market_raw: bytes, node_addr_b58: str) -> Optional[Tuple[int, int]]:
-    """Return (position, total) if node found in any plausible queue vec, else None.
+def _normalize_metrics(raw_metrics: Any) -> Tuple[Dict[str, Any], Optional[Dict[str, Any]]]:
+    """Normalize dashboard /metrics into the `specs` shape expected by sensors.
 
-    If multiple candidate vecs are found prefer the longest one.
+    Returns (specs, metrics_benchmark) where metrics_benchmark is the best
+    `*_tokens_per_second_mean` candidate found in the metrics, if any.
     """
-    candidates = _extract_pubkey_vec_candidates(market_raw)
-    if not candidates:
-        return None
-    candidates.sort(key=lambda c: len(c), reverse=True)
-    for pubkeys in candidates:
-        pubkey_strs = [_b58encode(pk) for pk in pubkeys]
-        try:
-            idx = pubkey_strs.index(node_addr_b58)
-            return idx + 1, len(pubkey_strs)
-        except ValueError:
-            continue
-    return None
+    specs: Dict[str, Any] = {}
+    metrics_benchmark = None
+    try:
+        metrics = raw_metrics.get("metrics") if isinstance(raw_metrics, dict) else None
+        # top-level package version and marketAddress
+        if isinstance(raw_metrics, dict):
+            # copy package version if present
+            pkg = raw_metrics.get("package_version") or (metrics.get("package_version") if isinstance(metrics, dict) else None)
+            if pkg:
+                specs["packageVersion"] = pkg
+            # marketAddress can be at top level
+            if raw_metrics.get("marketAddress"):
+                specs["marketAddress"] = raw_metrics.get("marketAddress")
+        if isinstance(metrics, dict):
+            # RAM: convert GB -> MB (use factor 1024)
+            try:
+                ram_gb = metrics.get("ram_gb")
+                if isinstance(ram_gb, (int, float)):
+                    specs["ram"] = int(ram_gb * 1024)
+            except Exception:
+                pass
+            # disk in GB
+            if metrics.get("disk_gb") is not None:
+                specs["diskSpace"] = metrics.get("disk_gb")
+            # network
+            network = metrics.get("network") or {}
+            if isinstance(network, dict):
+                specs["ping_ms"] = network.get("ping_ms")
+                specs["download_mbps"] = network.get("download_mbps")
+                specs["upload_mbps"] = network.get("upload_mbps")
+                specs["network_country"] = network.get("country")
+            # cpu
+            cpu = metrics.get("cpu") or {}
+            if isinstance(cpu, dict):
+                specs["cpu"] = cpu.get("cpu_model")
+                specs["logicalCores"] = cpu.get("logical_cores")
+                specs["physicalCores"] = cpu.get("physical_cores")
+            # gpus
+            gpu = metrics.get("gpu") or {}
+            if isinstance(gpu, dict):
+                devs = gpu.get("devices") or []
+                specs["gpus"] = []
+                if isinstance(devs, list):
+                    for d in devs:
+                        if isinstance(d, dict):
+                            specs["gpus"].append({"gpu": d.get("name")})
+                    # memoryGPU from first device
+                    if devs:
+                        first = devs[0]
+                        if isinstance(first, dict):
+                            specs["memoryGPU"] = first.get("vram_total_mb")
+            # package_version/system_environment
+            if metrics.get("package_version"):
+                specs["packageVersion"] = metrics.get("package_version")
+            if metrics.get("system_environment"):
+                specs["system_environment"] = metrics.get("system_environment")
+            # scan for model-specific tokens_per_second_mean keys
+            best_val = None
+            for k, v in metrics.items():
+                if isinstance(k, str) and k.endswith("_tokens_per_second_mean") and isinstance(v, (int, float)):
+                    # model id is key without suffix
+                    model_id = k[: -len("_tokens_per_second_mean")]
+                    # choose highest value as best candidate
+                    if best_val is None or float(v) > float(best_val):
+                        best_val = v
+                        metrics_benchmark = {"model_id": model_id, "tokens_per_second_mean": float(v)}
+    except Exception:
+        # Defensive: ensure specs present
+        metrics_benchmark = None
+    return specs, metrics_benchmark
 
 
 class NosanaNodeCoordinator(DataUpdateCoordinator):
     """Class to manage fetching Nosana node data."""
 
-    def __init__(self, hass, node_address: str):
-        """Initialize the coordinator."""
+    def __init__(self, hass, node_address: str, fleet_mode: bool = False, rpc_url: Optional[str] = None):
+        """Initialize the coordinator.
+
+        In fleet mode the coordinator has no timer of its own; the shared fleet
+        scheduler calls `async_refresh` on it instead.
+        """
         self.node_address = node_address
+        self.fleet_mode = fleet_mode
+        # raw 32-byte pubkey of the node, decoded once for byte-level queue lookups
+        self.node_key: Optional[bytes] = _node_key(node_address)
         self.info_url = f"https://{node_address}.node.k8s.prd.nos.ci/node/info"
         # /specs endpoint removed; use /metrics as the authoritative dashboard source
         self.metrics_url = f"https://dashboard.k8s.prd.nos.ci/api/nodes/{node_address}/metrics"
-        self.markets_url = "https://dashboard.k8s.prd.nos.ci/api/markets"
         self.jobs_url_base = "https://dashboard.k8s.prd.nos.ci/api/jobs"
         # Reuse Home Assistant's shared aiohttp session
         self._session = async_get_clientsession(hass)
-        # HA Store for per-node job accounting
+        # per-host token buckets shared by all coordinators (honours 429 Retry-After)
+        self._limiter = get_rate_limiter(hass)
+        # ETag/Last-Modified validators for mostly-static payloads (metrics)
+        self._conditional = get_conditional_cache(hass)
+        # HA Store for per-node job accounting; loaded once into a resident ledger
         self._store = Store(hass, 1, f"nosana_node/node-{node_address}.jobs.json")
-
-        # markets cache (avoid fetching the markets list every update)
-        self._markets_cache: Optional[list] = None
-        self._markets_last_fetch: Optional[datetime] = None
-        # configure how often to refetch markets (seconds)
-        self._markets_ttl_seconds = 300
+        self._ledger: Optional[JobsLedger] = None
+        # write-behind delay (seconds) for ledger persistence
+        self._store_save_delay = 10
+        # background job-history backfill (enabled for configured entries only)
+        self._backfill: Optional[JobsBackfill] = None
+        # local timer counting down the running job (enabled for configured entries only)
+        self.countdown: Optional[JobCountdown] = None
+
+        # fleet-wide markets cache shared by all coordinators (one TTL, single-flight)
+        self._markets = get_markets_service(hass)
+        # market queue slices over Solana RPC, batched across all nodes on the same RPC URL
+        # (None unless an RPC URL is configured)
+        self._market_queues: Optional[NosanaMarketQueueService] = (
+            get_market_queue_service(hass, rpc_url) if rpc_url else None
+        )
+        self._queue_market: Optional[str] = None
+        self._unsub_queue_market: Optional[Callable[[], None]] = None
+        self._unsub_queue_push: Optional[Callable[[], None]] = None
         # jobs fetch TTL (seconds) and last status tracking
         self._jobs_last_fetch: Optional[datetime] = None
         self._jobs_ttl_seconds = 15 * 60  # 15 minutes
         self._last_status: Optional[str] = None
+        self._status_since: Optional[datetime] = None
+        # adaptive polling: interval picked after every refresh from node state
+        self._poll_default = timedelta(seconds=30)
+        self._poll_offline = timedelta(seconds=120)
+        self._poll_queued_long = timedelta(seconds=60)
+        self._poll_fast = timedelta(seconds=10)
+        self._poll_max = timedelta(seconds=600)
+        # a node queued for longer than this is polled at _poll_queued_long
+        self._queued_long_after = timedelta(minutes=10)
+        # poll fast when a running job's timeout is this close
+        self._transition_window = timedelta(seconds=120)
+        self._consecutive_failures = 0
+        self.poll_interval: timedelta = self._poll_default
+        self._next_refresh: Optional[datetime] = None
+        # per-endpoint deadlines (seconds); a slow endpoint only loses its own section
+        self._endpoint_timeouts: Dict[str, float] = {
+            "info": 10,
+            "metrics": 10,
+            "jobs": 20,
+            "queue": 10,
+        }
+        # last successful fetch per endpoint, used to tag stale sections
+        self._last_success: Dict[str, datetime] = {}
+        # request counters of this node's own endpoints, jobs TTL hits and refresh durations
+        self._endpoint_stats: Dict[str, EndpointStats] = {
+            "info": EndpointStats(),
+            "metrics": EndpointStats(),
+            "jobs": EndpointStats(),
+        }
+        self._jobs_cache = CacheStats()
+        self.refresh_latency = LatencyHistogram()
+        # per-stage timings of the last refreshes, and the one in progress
+        self.traces: Deque[RefreshTrace] = deque(maxlen=REFRESH_TRACES)
+        self._trace: Optional[RefreshTrace] = None
+        # last good metrics payload, reused when a metrics fetch fails or is unchanged (304)
+        self._last_raw_metrics: Optional[Dict[str, Any]] = None
+        # (raw payload, specs, benchmark) of the last normalization; skipped while raw is identical
+        self._normalized_metrics: Optional[Tuple[Any, Specs, Optional[Dict[str, Any]]]] = None
+        # (shared market dict, Market) of the last lookup; the markets index hands out the same dict
+        self._market_view: Optional[Tuple[Dict[str, Any], Market]] = None
+        # last good info payload, reused (instead of reporting Offline) while throttled
+        self._last_raw_info: Optional[Dict[str, Any]] = None
+        self._info_throttled = False
+        # sections that changed in the last update; entities skip state writes for the rest
+        self.changed_sections: FrozenSet[str] = ALL_SECTIONS
 
         super().__init__(
             hass,
             _LOGGER,
             name="Nosana Node",
-            update_interval=timedelta(seconds=30),
+            update_interval=None if fleet_mode else timedelta(seconds=30),
         )
 
-    async def _async_update_data(self):
-        """Fetch data from Nosana API and related endpoints.
+    async def _async_fetch_info(self) -> Tuple[bool, Dict[str, Any]]:
+        """Fetch the per-node info endpoint on the node subdomain.
 
-        Returns a dict that preserves the original `/node/info` top-level keys
-        for backward compatibility, and adds `specs`, `market`, and `earnings` dicts.
+        Returns (ok, info). A failed fetch is not an error: the node is simply
+        reported as Offline by the merge stage. A throttled (429) fetch is not a
+        sign the node is down, so the last good info is reused and tagged stale.
         """
+        self._info_throttled = False
         try:
-            async with async_timeout.timeout(15):
-                # Fetch the node info (graceful fallback to Offline)
-                info: dict = {}
-                info_fetch_ok = False
-                try:
-                    # Fetch the per-node info endpoint on the node subdomain
-                    try:
-                        resp_info = await self._session.get(self.info_url)
-                        if resp_info.status == 200:
-                            info = await resp_info.json()
-                            info_fetch_ok = True
-                        else:
-                            _LOGGER.warning(
-                                "Failed to fetch node info from %s, status: %s",
-                                self.info_url,
-                                getattr(resp_info, "status", None),
-                            )
-                            info = {}
-                    except Exception as e:
-                        _LOGGER.warning(
-                            "Error fetching node info from %s: %s",
-                            self.info_url,
-                            e,
-                        )
-                        info = {}
-                except Exception as e:
-                    _LOGGER.warning(
-                        "Error fetching node info from %s: %s",
-                        self.info_url,
-                        e,
-                    )
-                    info = {}
+            async with async_timeout.timeout(self._endpoint_timeouts["info"]):
+                resp_info = await self._limiter.async_get(
+                    self._session, self.info_url, stats=self._endpoint_stats["info"]
+                )
+                if resp_info.status == 200:
+                    info = await resp_info.json()
+                    info = info if isinstance(info, dict) else {}
+                    self._last_raw_info = dict(info)
+                    self._last_success["info"] = datetime.utcnow()
+                    return True, info
+                if resp_info.status == 429 and self._last_raw_info is not None:
+                    self._info_throttled = True
+                    return True, dict(self._last_raw_info)
+            _LOGGER.warning(
+                "Failed to fetch node info from %s, status: %s",
+                self.info_url,
+                getattr(resp_info, "status", None),
+            )
+        except RateLimited as e:
+            if self._last_raw_info is not None:
+                self._info_throttled = True
+                return True, dict(self._last_raw_info)
+            _LOGGER.debug("Skipping node info fetch: %s", e)
+        except Exception as e:
+            _LOGGER.warning(
+                "Error fetching node info from %s: %s",
+                self.info_url,
+                e,
+            )
+        return False, {}
+
+    async def _async_fetch_metrics(self) -> Dict[str, Any]:
+        """Fetch the raw dashboard metrics payload.
+
+        On failure the last good payload is returned (or {} if there is none);
+        the merge stage tags the resulting `specs` section as stale.
+        """
+        try:
+            async with async_timeout.timeout(self._endpoint_timeouts["metrics"]):
+                status, raw_metrics = await self._conditional.async_get_json(
+                    self._session, self._limiter, self.metrics_url, stats=self._endpoint_stats["metrics"]
+                )
+                if status == 304 and self._last_raw_metrics is not None:
+                    # unchanged: hand back the same object so normalization is skipped
+                    self._last_success["metrics"] = datetime.utcnow()
+                    return self._last_raw_metrics
+                if status not in (200, 304):
+                    _LOGGER.warning("Failed to fetch metrics from %s, status: %s", self.metrics_url, status)
+                    return self._last_raw_metrics or {}
+                raw_metrics = raw_metrics if isinstance(raw_metrics, dict) else {}
+                self._last_raw_metrics = raw_metrics
+                self._last_success["metrics"] = datetime.utcnow()
+                return raw_metrics
+        except RateLimited as e:
+            _LOGGER.debug("Skipping metrics fetch: %s", e)
+            return self._last_raw_metrics or {}
+        except Exception:
+            _LOGGER.warning("Error fetching metrics from %s", self.metrics_url)
+            return self._last_raw_metrics or {}
+
+    def _track_queue_market(self, market_address: Optional[str]) -> bool:
+        """Register this node's market with the queue service; return True if it changed."""
+        if market_address == self._queue_market:
+            return False
+        if self._unsub_queue_market is not None:
+            self._unsub_queue_market()
+            self._unsub_queue_market = None
+        self._queue_market = market_address
+        if market_address and self._market_queues is not None:
+            self._unsub_queue_market = self._market_queues.register(market_address)
+        return True
+
+    def enable_queue_push(self) -> None:
+        """Receive market queue changes over the RPC websocket (polling stays as fallback)."""
+        if self._unsub_queue_push is None and self._market_queues is not None:
+            self._unsub_queue_push = self._market_queues.async_enable_push(self._async_handle_queue_push)
+
+    @callback
+    def _async_handle_queue_push(self, market_address: str) -> None:
+        """Publish a pushed queue change without a full refresh."""
+        if market_address != self._queue_market or self.data is None:
+            return
+        queue = self._queue_section(self._market_queues.get_slice(market_address))
+        previous = self.data
+        data = build_snapshot(
+            previous, previous.info, previous.specs, previous.market, queue, previous.earnings, previous.stale
+        )
+        if data is previous:
+            return
+        # update listeners directly: async_set_updated_data would also push back the next poll
+        self.data = data
+        self.changed_sections = changed_sections(previous, data)
+        self.async_update_listeners()
+
+    async def _async_fetch_queue_slice(self) -> Optional[bytes]:
+        """Return the queue slice of this node's market (None if unknown, disabled or failed)."""
+        if not self._queue_market or self._market_queues is None:
+            return None
+        try:
+            async with async_timeout.timeout(self._endpoint_timeouts["queue"]):
+                return await self._market_queues.async_get_slice(self._queue_market)
+        except Exception as e:
+            _LOGGER.debug("Error fetching market queue for %s: %s", self._queue_market, e)
+            return self._market_queues.get_slice(self._queue_market)
+
+    def _queue_section(self, queue_slice: Optional[bytes]) -> Dict[str, Any]:
+        """Build the `queue` section (market, position, length, type) from a queue slice."""
+        if not self._queue_market or queue_slice is None:
+            return {}
+        found = _get_queue_position_from_slice(queue_slice, self.node_key)
+        if found is None:
+            return {"market": self._queue_market}
+        position, queue = found
+        return {
+            "market": self._queue_market,
+            "position": position,
+            "length": queue.length,
+            "type": _QUEUE_TYPE_NAMES.get(queue.queue_type),
+        }
 
-                # Normalize status/state for automations
-                normalized_status = "Offline"
-                raw_state = None
-                if info_fetch_ok and isinstance(info, dict):
-                    raw_state = info.get("state") or info.get("status") or info.get("nodeStatus")
-                    if isinstance(raw_state, str):
-                        s = raw_state.upper()
-                        if s == "OTHER":
-                            normalized_status = "Running"
-                        elif s == "QUEUED":
-                            normalized_status = "Queued"
-                        elif s in ("RUNNING", "ONLINE"):
-                            normalized_status = "Running"
-                        elif s in ("OFFLINE", "STOPPED", "ERROR"):
-                            normalized_status = "Offline"
-                        else:
-                            # unknown state but endpoint responded; assume Running
-                            normalized_status = "Running"
-                    else:
-                        # info responded but no usable state string
-                        normalized_status = "Running"
-                else:
-                    # info endpoint failed → Offline
-                    normalized_status = "Offline"
-
-                # Ensure consistent keys are present; uptime/network removed (no longer provided)
-                info = info if isinstance(info, dict) else {}
-                info["status"] = normalized_status
-                info["nodeStatus"] = normalized_status
-                info["state"] = raw_state if isinstance(raw_state, str) else normalized_status
-
-                # detect status change
-                status_changed = self._last_status != normalized_status
-                self._last_status = normalized_status
-
-                # Fetch metrics (dashboard) and normalize into 'specs' shape expected by sensors
-                try:
-                    resp_metrics = await self._session.get(self.metrics_url)
-                    if resp_metrics.status != 200:
-                        _LOGGER.warning("Failed to fetch metrics from %s, status: %s", self.metrics_url, getattr(resp_metrics, "status", None))
-                        raw_metrics = {}
-                    else:
-                        raw_metrics = await resp_metrics.json()
-                except Exception:
-                    _LOGGER.warning("Error fetching metrics from %s", self.metrics_url)
-                    raw_metrics = {}
-
-                # normalization: produce a specs dict compatible with existing sensors
-                specs: Dict[str, Any] = {}
-                try:
-                    metrics = raw_metrics.get("metrics") if isinstance(raw_metrics, dict) else None
-                    # top-level package version and marketAddress
-                    if isinstance(raw_metrics, dict):
-                        # copy package version if present
-                        pkg = raw_metrics.get("package_version") or (metrics.get("package_version") if isinstance(metrics, dict) else None)
-                        if pkg:
-                            specs["packageVersion"] = pkg
-                        # marketAddress can be at top level
-                        if raw_metrics.get("marketAddress"):
-                            specs["marketAddress"] = raw_metrics.get("marketAddress")
-                    if isinstance(metrics, dict):
-                        # RAM: convert GB -> MB (use factor 1024)
-                        try:
-                            ram_gb = metrics.get("ram_gb")
-                            if isinstance(ram_gb, (int, float)):
-                                specs["ram"] = int(ram_gb * 1024)
-                        except Exception:
-                            pass
-                        # disk in GB
-                        if metrics.get("disk_gb") is not None:
-                            specs["diskSpace"] = metrics.get("disk_gb")
-                        # network
-                        network = metrics.get("network") or {}
-                        if isinstance(network, dict):
-                            specs["ping_ms"] = network.get("ping_ms")
-                            specs["download_mbps"] = network.get("download_mbps")
-                            specs["upload_mbps"] = network.get("upload_mbps")
-                            specs["network_country"] = network.get("country")
-                        # cpu
-                        cpu = metrics.get("cpu") or {}
-                        if isinstance(cpu, dict):
-                            specs["cpu"] = cpu.get("cpu_model")
-                            specs["logicalCores"] = cpu.get("logical_cores")
-                            specs["physicalCores"] = cpu.get("physical_cores")
-                        # gpus
-                        gpu = metrics.get("gpu") or {}
-                        if isinstance(gpu, dict):
-                            devs = gpu.get("devices") or []
-                            specs["gpus"] = []
-                            if isinstance(devs, list):
-                                for d in devs:
-                                    if isinstance(d, dict):
-                                        specs["gpus"].append({"gpu": d.get("name")})
-                                # memoryGPU from first device
-                                if devs:
-                                    first = devs[0]
-                                    if isinstance(first, dict):
-                                        specs["memoryGPU"] = first.get("vram_total_mb")
-                        # package_version/system_environment
-                        if metrics.get("package_version"):
-                            specs["packageVersion"] = metrics.get("package_version")
-                        if metrics.get("system_environment"):
-                            specs["system_environment"] = metrics.get("system_environment")
-                        # scan for model-specific tokens_per_second_mean keys
-                        bench_candidate = None
-                        best_val = None
-                        for k, v in metrics.items():
-                            if isinstance(k, str) and k.endswith("_tokens_per_second_mean") and isinstance(v, (int, float)):
-                                # model id is key without suffix
-                                model_id = k[: -len("_tokens_per_second_mean")]
-                                # choose highest value as best candidate
-                                if best_val is None or float(v) > float(best_val):
-                                    best_val = v
-                                    bench_candidate = {"model_id": model_id, "tokens_per_second_mean": float(v)}
-                        # If found, we will merge this as earnings benchmark later if jobs don't provide one
-                        metrics_benchmark = bench_candidate
-                    else:
-                        metrics_benchmark = None
-                except Exception:
-                    # Defensive: ensure specs present
-                    specs = specs or {}
-                    metrics_benchmark = None
-
-                # Fetch markets list (cached)
-                markets = []
-                now = datetime.utcnow()
-                should_refetch_markets = True
-                if self._markets_cache is not None and self._markets_last_fetch is not None:
-                    elapsed = (now - self._markets_last_fetch).total_seconds()
-                    if elapsed < self._markets_ttl_seconds:
-                        should_refetch_markets = False
-
-                if should_refetch_markets:
-                    try:
-                        resp_markets = await self._session.get(self.markets_url)
-                        if resp_markets.status == 200:
-                            markets = await resp_markets.json()
-                        else:
-                            _LOGGER.debug("Markets endpoint returned status %s", getattr(resp_markets, "status", None))
-                            markets = []
-                        # update cache
-                        self._markets_cache = markets
-                        self._markets_last_fetch = now
-                    except Exception:
-                        _LOGGER.warning("Failed to fetch markets from %s", self.markets_url)
-                        markets = self._markets_cache or []
+    async def async_get_ledger(self) -> JobsLedger:
+        """Return the resident jobs ledger, loading it from the HA Store once."""
+        if self._ledger is None:
+            try:
+                self._ledger = JobsLedger.from_store_data(await self._store.async_load())
+            except Exception:
+                self._ledger = JobsLedger()
+            if self._ledger.dirty:
+                # aggregates were just migrated from a pre-aggregates store
+                self.schedule_ledger_save()
+        return self._ledger
+
+    async def async_fetch_jobs_page(
+        self, limit: int, offset: int = 0, priority: int = PRIORITY_STATUS
+    ) -> Optional[List[Dict[str, Any]]]:
+        """Fetch one page of this node's jobs; None on failure."""
+        url = f"{self.jobs_url_base}?limit={limit}&offset={offset}&node={self.node_address}"
+        try:
+            status, body = await self._limiter.async_get_json(
+                self._session, url, self._endpoint_timeouts["jobs"], priority, stats=self._endpoint_stats["jobs"]
+            )
+        except Exception as e:
+            _LOGGER.debug("Error fetching jobs from %s: %s", url, e)
+            return None
+        if status != 200:
+            _LOGGER.debug("Jobs endpoint returned status %s", status)
+            return None
+        jobs = body.get("jobs") if isinstance(body, dict) else None
+        return jobs if isinstance(jobs, list) else []
+
+    def schedule_ledger_save(self) -> None:
+        """Write-behind persistence: coalesce ledger changes into one delayed save."""
+        ledger = self._ledger
+        if ledger is None:
+            return
+        start = time.monotonic()
+        self._store.async_delay_save(ledger.as_store_data, self._store_save_delay)
+        ledger.dirty = False
+        if self._trace is not None:
+            # the write itself happens later, off the refresh path
+            self._trace.add("store_save", time.monotonic() - start)
+
+    def enable_backfill(self) -> None:
+        """Enable the paginated job-history backfill and start a first pass."""
+        if self._backfill is None:
+            self._backfill = JobsBackfill(self)
+        self._backfill.async_start()
+
+    def enable_countdown(self, resolution: float) -> None:
+        """Count the running job down locally, ticking every `resolution` seconds."""
+        if self.countdown is None:
+            self.countdown = JobCountdown(self, resolution)
+        self.countdown.async_start()
+
+    async def async_flush_store(self) -> None:
+        """Stop the backfill and write any pending ledger changes now (used on unload)."""
+        if self._backfill is not None:
+            self._backfill.async_cancel()
+        if self.countdown is not None:
+            self.countdown.async_cancel()
+        if self._unsub_queue_push is not None:
+            self._unsub_queue_push()
+            self._unsub_queue_push = None
+        self._track_queue_market(None)
+        if self._ledger is None:
+            return
+        try:
+            await self._store.async_save(self._ledger.as_store_data())
+        except Exception as e:
+            _LOGGER.debug("Failed to save jobs store: %s", e)
+
+    async def _async_earnings_from_store(self) -> Dict[str, Any]:
+        """Return totals and latest_job from the resident ledger without hitting the jobs API."""
+        ledger = await self.async_get_ledger()
+        earnings = ledger.totals()
+        # Expose latest_job so sensors have access when jobs API not fetched
+        latest_job = ledger.latest_job()
+        if latest_job:
+            # copied into a LatestJob by the merge stage
+            earnings["latest_job"] = latest_job
+        return earnings
+
+    def endpoint_stats(self) -> Dict[str, EndpointStats]:
+        """Request counters per endpoint: this node's own plus the shared markets and RPC services."""
+        rpc = self._market_queues.stats if self._market_queues is not None else EndpointStats()
+        return {**self._endpoint_stats, "markets": self._markets.stats, "rpc": rpc}
+
+    def cache_stats(self) -> Dict[str, CacheStats]:
+        """TTL cache hit/miss counters (jobs per node, markets shared)."""
+        return {"jobs": self._jobs_cache, "markets": self._markets.cache}
+
+    def cache_state(self, now: Optional[datetime] = None) -> Dict[str, Any]:
+        """Current state of the caches this node reads from (for diagnostics)."""
+        now = now or datetime.utcnow()
+        jobs_age = (now - self._jobs_last_fetch).total_seconds() if self._jobs_last_fetch else None
+        queues = self._market_queues
+        return {
+            "jobs": {
+                "ttl_seconds": self._jobs_ttl_seconds,
+                "age_seconds": round(jobs_age, 1) if jobs_age is not None else None,
+                "expired": self._jobs_ttl_expired(now),
+            },
+            "markets": {
+                "ttl_seconds": self._markets.ttl_seconds,
+                "age_seconds": self._markets.age(now),
+                "expired": self._markets.expired(now),
+                "last_fetch_ok": self._markets.last_fetch_ok,
+                "records": len(self._markets),
+            },
+            "market_queue": {
+                "ttl_seconds": queues.ttl_seconds,
+                "age_seconds": queues.age(now),
+                "expired": queues.expired(now),
+                "last_fetch_ok": queues.last_fetch_ok,
+                "markets": len(queues.markets),
+                "push": self._unsub_queue_push is not None,
+            }
+            if queues is not None
+            else {"enabled": False},
+            "metrics": {
+                "payload_cached": self._last_raw_metrics is not None,
+                "normalized_cached": self._normalized_metrics is not None,
+            },
+            "info": {"payload_cached": self._last_raw_info is not None, "throttled": self._info_throttled},
+        }
+
+    def store_state(self) -> Dict[str, Any]:
+        """Record counts of the jobs ledger and the Store file path (for diagnostics)."""
+        ledger = self._ledger
+        state: Dict[str, Any] = {"path": self._store.path, "save_delay_seconds": self._store_save_delay}
+        if ledger is None:
+            return {**state, "loaded": False}
+        return {
+            **state,
+            "loaded": True,
+            "pending_save": ledger.dirty,
+            "jobs": len(ledger.jobs),
+            "jobs_finalized": ledger.aggregates.get("jobs_finalized", 0),
+            "days": len(ledger.aggregates.get("days") or {}),
+            "backfill": dict(ledger.backfill),
+        }
+
+    def _jobs_ttl_expired(self, now: datetime) -> bool:
+        """Return True when the jobs TTL has elapsed (or jobs were never fetched)."""
+        if self._jobs_last_fetch is None:
+            return True
+        return (now - self._jobs_last_fetch).total_seconds() >= self._jobs_ttl_seconds
+
+    def _stale_sections(self, now: datetime, attempted: Dict[str, str]) -> Dict[str, Optional[float]]:
+        """Return {section: age_seconds} for sections whose endpoint failed this tick.
+
+        `attempted` maps endpoint name -> output section. The age is measured from
+        the last successful fetch (None if the endpoint never succeeded).
+        """
+        stale: Dict[str, Optional[float]] = {}
+        for endpoint, section in attempted.items():
+            last = self._last_success.get(endpoint)
+            if last is not None and last >= now:
+                continue
+            stale[section] = round((now - last).total_seconds(), 1) if last is not None else None
+        return stale
+
+    async def _async_update_data(self) -> NodeSnapshot:
+        """Fetch data from Nosana API and related endpoints.
+
+        The independent endpoints (info, metrics, markets, the market queue and,
+        when its TTL has expired, jobs) are requested concurrently so a refresh costs roughly the
+        slowest round-trip instead of the sum of all of them. Each endpoint runs
+        under its own deadline; whatever finished is published and sections served
+        from older data are listed under `stale` with their age in seconds.
+
+        Returns a `NodeSnapshot` whose mapping view preserves the original
+        `/node/info` top-level keys for backward compatibility, and adds the
+        `specs`, `market`, `queue`, `earnings` and `stale` sections.
+        """
+        # nothing changed unless this update produces new data
+        self.changed_sections = frozenset()
+        started = time.monotonic()
+        trace = self._trace = RefreshTrace(datetime.utcnow())
+        ok = False
+        try:
+            now = datetime.utcnow()
+            # endpoint -> output section, for endpoints requested this tick
+            attempted: Dict[str, str] = {"metrics": "specs"}
+
+            # Jobs TTL is known up front, so an expired TTL fetch joins the fan-out.
+            # A status-change-triggered fetch can only be decided once info arrives.
+            fetch_jobs_early = self._jobs_ttl_expired(now)
+            fetches = [
+                trace.timed("info", self._async_fetch_info()),
+                trace.timed("metrics", self._async_fetch_metrics()),
+                trace.timed("markets", self._markets.async_get_markets()),
+            ]
+            if fetch_jobs_early:
+                fetches.append(trace.timed("jobs", self._async_update_jobs_and_earnings()))
+                attempted["jobs"] = "earnings"
+            # queue of the market seen last tick; a new/changed market is fetched after the merge
+            fetches.append(trace.timed("queue", self._async_fetch_queue_slice()))
+
+            with trace.stage("fetch"):
+                results = await asyncio.gather(*fetches)
+            (info_fetch_ok, info), raw_metrics = results[:2]
+            queue_slice = results[-1]
+
+            # Merge stage
+            info, normalized_status = _normalize_info(info_fetch_ok, info)
+
+            # detect status change
+            status_changed = self._last_status != normalized_status
+            self._last_status = normalized_status
+            if status_changed:
+                self._status_since = now
+
+            with trace.stage("metrics_normalize"):
+                cached = self._normalized_metrics
+                if cached is not None and cached[0] is raw_metrics:
+                    specs, metrics_benchmark = cached[1], cached[2]
                 else:
-                    markets = self._markets_cache or []
+                    specs_dict, metrics_benchmark = _normalize_metrics(raw_metrics)
+                    specs = Specs.from_dict(specs_dict)
+                    self._normalized_metrics = (raw_metrics, specs, metrics_benchmark)
 
+            with trace.stage("markets_lookup"):
                 # Determine market address from specs (fallback to info)
-                market_address = None
-                if isinstance(specs, dict):
-                    market_address = specs.get("marketAddress") or specs.get("market_address")
-                if not market_address and isinstance(info, dict):
+                market_address = specs.get("marketAddress") or specs.get("market_address")
+                if not market_address:
                     market_address = info.get("marketAddress") or info.get("market_address")
-
-                market: Dict[str, Any] = {
-                    "address": market_address,
-                    "name": None,
-                    "type": None,
-                    "nos_reward_per_second": None,
-                    "usd_reward_per_hour": None,
-                }
-
-                if market_address and isinstance(markets, list):
-                    for m in markets:
-                        if not isinstance(m, dict):
-                            continue
-                        # try a few common key names to match the market address
-                        for key in ("address", "marketAddress", "market_address", "id"):
-                            if m.get(key) == market_address:
-                                # extract a name from common keys
-                                market["name"] = m.get("name") or m.get("marketName") or m.get("title")
-                                # market type
-                                market["type"] = m.get("type") or m.get("marketType") or m.get("category")
-                                # slug
-                                market["slug"] = m.get("slug") or m.get("marketSlug")
-                                # try to extract reward fields using several possible keys
-                                market["nos_reward_per_second"] = (
-                                    m.get("nos_reward_per_second")
-                                    or m.get("nosRewardPerSecond")
-                                    or m.get("rewardPerSecond")
-                                    or m.get("reward_per_second")
-                                )
-                                market["usd_reward_per_hour"] = (
-                                    m.get("usd_reward_per_hour")
-                                    or m.get("usdRewardPerHour")
-                                    or m.get("rewardPerHourUsd")
-                                    or m.get("rewardPerHour")
-                                    or m.get("reward_per_hour_usd")
-                                )
-                                break
-                        if market.get("name"):
-                            break
-
-                # Jobs fetch: TTL (15 min) or immediate on status change
-                should_fetch_jobs = False
-                if status_changed:
-                    should_fetch_jobs = True
+                market_dict = self._markets.get_market(market_address)
+                cached_market = self._market_view
+                if cached_market is not None and cached_market[0] is market_dict:
+                    market = cached_market[1]
                 else:
-                    if self._jobs_last_fetch is None:
-                        should_fetch_jobs = True
-                    else:
-                        elapsed_jobs = (now - self._jobs_last_fetch).total_seconds()
-                        should_fetch_jobs = elapsed_jobs >= self._jobs_ttl_seconds
-
-                if should_fetch_jobs:
-                    earnings = await self._async_update_jobs_and_earnings()
-                    self._jobs_last_fetch = now
-                else:
-                    # Recompute totals from store without hitting jobs API
-                    try:
-                        store_data = await self._store.async_load() or {}
-                        jobs_store: Dict[str, Any] = store_data.get("jobs") or {}
-                    except Exception:
-                        jobs_store = {}
-                    total_seconds = 0
-                    total_usd = 0.0
-                    for rec in jobs_store.values():
-                        if int(rec.get("timeEnd", 0) or 0) > 0:
-                            total_seconds += int(rec.get("runtime_seconds", 0) or 0)
-                            total_usd += float(rec.get("earned_usd", 0.0) or 0.0)
-                    earnings = {
-                        "usd_total": round(total_usd, 6),
-                        "seconds_total": int(total_seconds),
-                        "jobs_tracked": len(jobs_store),
-                    }
-                    # Compute latest_job from store so sensors have access when jobs API not fetched
-                    try:
-                        running_candidate = None
-                        running_ts = 0
-                        recent_candidate = None
-                        recent_ts = 0
-                        for rec in jobs_store.values():
-                            ts = int(rec.get("timeStart", 0) or 0)
-                            te = int(rec.get("timeEnd", 0) or 0)
-                            if te == 0 and ts > running_ts:
-                                running_ts = ts
-                                running_candidate = rec
-                            if ts > recent_ts:
-                                recent_ts = ts
-                                recent_candidate = rec
-                        chosen = running_candidate or recent_candidate
-                        if isinstance(chosen, dict):
-                            earnings["latest_job"] = {
-                                "id": int(chosen.get("id", 0) or 0),
-                                "timeStart": int(chosen.get("timeStart", 0) or 0),
-                                "timeEnd": int(chosen.get("timeEnd", 0) or 0),
-                                "timeout": int(chosen.get("timeout", 0) or 0),
-                            }
-                    except Exception:
-                        # leave earnings as-is if anything goes wrong
-                        pass
+                    market = Market.from_dict(market_dict)
+                    self._market_view = (market_dict, market)
+            if self._track_queue_market(market_address):
+                queue_slice = await trace.timed("queue", self._async_fetch_queue_slice())
+            queue = self._queue_section(queue_slice)
+
+            # Jobs fetch: TTL (15 min) or immediate on status change
+            if fetch_jobs_early:
+                earnings = results[3]
+                self._jobs_last_fetch = now
+            elif status_changed:
+                earnings = await trace.timed("jobs", self._async_update_jobs_and_earnings())
+                self._jobs_last_fetch = now
+                attempted["jobs"] = "earnings"
+            else:
+                earnings = await trace.timed("jobs_merge", self._async_earnings_from_store())
+            self._jobs_cache.record("jobs" not in attempted)
 
+            with trace.stage("jobs_merge"):
                 # If jobs did not provide a benchmark, consider metrics-based candidate
-                if earnings and isinstance(earnings, dict) and not (earnings.get("benchmark") or {}).get("tokens_per_second_mean"):
-                    if metrics_benchmark:
-                        earnings_out = dict(earnings)
-                        earnings_out["benchmark"] = metrics_benchmark
-                        earnings = earnings_out
-
-                # Merge info with extra fields so existing sensors keep working. Note: uptime/network removed.
-                merged = {**(info or {}), "specs": specs or {}, "market": market, "earnings": earnings}
-                return merged
+                if metrics_benchmark and not (earnings.get("benchmark") or {}).get("tokens_per_second_mean"):
+                    earnings["benchmark"] = metrics_benchmark
+                earnings = Earnings.from_dict(earnings)
+
+            stale = self._stale_sections(now, attempted)
+            if self._info_throttled:
+                last = self._last_success.get("info")
+                stale["info"] = round((now - last).total_seconds(), 1) if last is not None else None
+            if not self._markets.last_fetch_ok:
+                stale["market"] = self._markets.age(now)
+            if self._queue_market and self._market_queues is not None and not self._market_queues.last_fetch_ok:
+                stale["queue"] = self._market_queues.age(now)
+            if stale:
+                _LOGGER.debug("Publishing partial update for %s; stale sections: %s", self.node_address, stale)
+
+            # Typed snapshot with a dict-compatible view so existing sensors keep working;
+            # sections equal to the previous tick's are shared. Note: uptime/network removed.
+            with trace.stage("snapshot"):
+                merged = build_snapshot(self.data, info, specs, market, queue, earnings, stale)
+                self.changed_sections = changed_sections(self.data, merged)
+            trace.changed_sections = sorted(self.changed_sections)
+            trace.stale = sorted(stale)
+            interval = self._pick_poll_interval(now, normalized_status, earnings)
+            info_ok = info_fetch_ok and not self._info_throttled
+            if not info_ok and all(section in stale for section in attempted.values()):
+                # every endpoint failed: the helpers swallow errors, so back off here
+                self._backoff(interval)
+            else:
+                self._consecutive_failures = 0
+                self._set_poll_interval(interval)
+            ok = True
+            return merged
         except UpdateFailed:
+            self._backoff()
             raise
         except Exception as err:
             _LOGGER.exception("Error fetching Nosana node data: %s", err)
+            self._backoff()
             raise UpdateFailed(err)
+        finally:
+            elapsed = time.monotonic() - started
+            self.refresh_latency.observe(elapsed)
+            trace.finish(elapsed, ok)
+            self.traces.append(trace)
+            self._trace = None
+
+    def _pick_poll_interval(self, now: datetime, status: str, earnings: Any) -> timedelta:
+        """Choose the next poll interval from node state and job timing.
+
+        - Offline: poll slowly.
+        - Running job whose timeout is about to expire: poll fast around the transition.
+        - Queued for a long time: poll slower than default.
+        """
+        if status == "Offline":
+            return self._poll_offline
+        latest_job = earnings.get("latest_job") if isinstance(earnings, Mapping) else None
+        expiry = _job_expiry_ts(latest_job)
+        if expiry is not None:
+            window = self._transition_window.total_seconds()
+            until = expiry - now.replace(tzinfo=timezone.utc).timestamp()
+            if -window <= until <= window:
+                return self._poll_fast
+            # wake up right as the transition window opens instead of overshooting it
+            lead = until - window
+            if 0 < lead < self._poll_default.total_seconds():
+                return max(self._poll_fast, timedelta(seconds=lead))
+        if status == "Queued" and self._status_since is not None:
+            if now - self._status_since >= self._queued_long_after:
+                return self._poll_queued_long
+        return self._poll_default
+
+    def _backoff(self, floor: Optional[timedelta] = None) -> None:
+        """Back off exponentially on consecutive update failures (never below floor)."""
+        self._consecutive_failures += 1
+        interval = self._poll_default * (2 ** min(self._consecutive_failures, 5))
+        if floor is not None:
+            interval = max(interval, floor)
+        self._set_poll_interval(min(interval, self._poll_max))
+
+    def _set_poll_interval(self, interval: timedelta) -> None:
+        """Apply the next poll interval (own timer, or the fleet scheduler's due time)."""
+        if interval != self.poll_interval:
+            _LOGGER.debug("Poll interval for %s set to %s", self.node_address, interval)
+        self.poll_interval = interval
+        self._next_refresh = datetime.utcnow() + interval
+        if not self.fleet_mode:
+            self.update_interval = interval
+
+    def refresh_due(self, now: Optional[datetime] = None) -> bool:
+        """Return True when a fleet-driven refresh is due for this node."""
+        if self._next_refresh is None:
+            return True
+        return (now or datetime.utcnow()) >= self._next_refresh
+
+    def defer_refresh(self, delay: timedelta) -> None:
+        """Push the next fleet-driven refresh back by delay (used to stagger nodes)."""
+        self._next_refresh = datetime.utcnow() + delay
 
     async def _async_update_jobs_and_earnings(self) -> Dict[str, Any]:
         """Fetch recent jobs, update HA Store for this node, and compute totals.
@@ -456,217 +748,41 @@ class NosanaNodeCoordinator(DataUpdateCoordinator):
         - Maintain a per-node store of jobs that we've seen/accounted.
         - Only count finalized jobs (timeEnd > 0) toward totals.
         - Save the store when new jobs are discovered, jobs finalize, or benchmark data is backfilled.
+        - Totals come from the ledger's incrementally maintained aggregates.
         - Parse llm-benchmark results and store under each job record as job['benchmark'].
         """
-        try:
-            # Load store (structure: {"jobs": {id: {record}}})
-            store_data = await self._store.async_load() or {}
-            jobs_store: Dict[str, Any] = store_data.get("jobs") or {}
-        except Exception:
-            jobs_store = {}
-            store_data = {"jobs": jobs_store}
+        ledger = await self.async_get_ledger()
 
         # Fetch jobs list (limit=10)
-        params = f"?limit=10&offset=0&node={self.node_address}"
-        jobs_url = f"{self.jobs_url_base}{params}"
         jobs: List[Dict[str, Any]] = []
-        try:
-            resp = await self._session.get(jobs_url)
-            if resp.status == 200:
-                body = await resp.json()
-                j = body.get("jobs") if isinstance(body, dict) else None
-                if isinstance(j, list):
-                    jobs = j
-            else:
-                _LOGGER.debug("Jobs endpoint returned status %s", resp.status)
-        except Exception as e:
-            _LOGGER.debug("Error fetching jobs from %s: %s", jobs_url, e)
-
-        changed = False
-
-        def _compute(job: Dict[str, Any]) -> Tuple[int, float]:
-            start = int(job.get("timeStart", 0) or 0)
-            end = int(job.get("timeEnd", 0) or 0)
-            timeout = int(job.get("timeout", 0) or 0)
-
-            # Only count earnings/runtime if the job is finalized
-            if start <= 0 or end <= 0 or end < start:
-                return 0, 0.0
-
-            # Calculate actual duration
-            duration = max(0, end - start)
-
-            # Cap runtime at timeout if timeout is set and exceeded
-            runtime = duration
-            if timeout > 0 and duration > timeout:
-                runtime = timeout
-
-            usdph = float(job.get("usdRewardPerHour", 0.0) or 0.0)
-            earned = (runtime / 3600.0) * usdph
-            return runtime, earned
-
-        def _extract_llm_benchmark(job: Dict[str, Any]) -> Optional[Dict[str, Any]]:
-            jr = job.get("jobResult")
-            if not isinstance(jr, dict):
-                return None
-            op_states = jr.get("opStates")
-            if not isinstance(op_states, list):
-                return None
-            for op in op_states:
-                if not isinstance(op, dict):
-                    continue
-                if op.get("operationId") == "llm-benchmark" and op.get("status") == "success":
-                    results = op.get("results", {})
-                    arr = results.get("results_llm_benchmark")
-                    if isinstance(arr, list) and arr:
-                        raw = arr[0]
-                        try:
-                            import json as _json
-                            parsed = _json.loads(raw)
-                            model_id = parsed.get("model_id") or parsed.get("results", {}).get("users_1", {}).get("model_id")
-                            tps = parsed.get("results", {}).get("users_1", {}).get("tokens_per_second", {})
-                            mean = tps.get("mean")
-                            if model_id and isinstance(mean, (int, float)):
-                                return {"model_id": model_id, "tokens_per_second_mean": float(mean)}
-                        except Exception:
-                            return None
-            return None
+        page = await self.async_fetch_jobs_page(10)
+        if page is not None:
+            jobs = page
+            self._last_success["jobs"] = datetime.utcnow()
 
         latest_bench: Optional[Dict[str, Any]] = None
         latest_bench_time: int = 0
 
         for job in jobs:
-            jid = str(job.get("id")) if job is not None else None
-            if not jid or jid == "None":
-                continue
-
-            # Skip jobs with no start time
-            if int(job.get("timeStart", 0) or 0) <= 0:
-                continue
-
-            runtime, earned = _compute(job)
-            finalized = int(job.get("timeEnd", 0) or 0) > 0
-
-            prev = jobs_store.get(jid)
-            # Backfill benchmark if present and missing
-            bench = _extract_llm_benchmark(job) if finalized else None
-
-            if prev is None:
-                # Determine initial timeout, but prefer an existing stored non-zero timeout if present
-                initial_timeout = int(job.get("timeout", 0) or 0)
-                if jid in jobs_store:
-                    try:
-                        stored_try = int(jobs_store[jid].get("timeout", 0) or 0)
-                        if stored_try > 0 and initial_timeout == 0:
-                            _LOGGER.debug("Using existing stored timeout %s for new job %s", stored_try, jid)
-                            initial_timeout = stored_try
-                    except Exception:
-                        pass
-
-                new_record = {
-                    "id": int(job.get("id", 0) or 0),
-                    "timeStart": int(job.get("timeStart", 0) or 0),
-                    "timeEnd": int(job.get("timeEnd", 0) or 0),
-                    "timeout": int(initial_timeout or 0),
-                    "usdRewardPerHour": float(job.get("usdRewardPerHour", 0.0) or 0.0),
-                    "runtime_seconds": int(runtime),
-                    "earned_usd": float(earned),
-                    "state": job.get("state"),
-                    "finalized": bool(finalized),
-                    "last_seen": datetime.now(timezone.utc).isoformat(),
-                }
-                _LOGGER.debug("Storing new job %s timeout=%s", jid, new_record.get("timeout"))
-                if bench:
-                    new_record["benchmark"] = bench
-                jobs_store[jid] = new_record
-                changed = True
-            else:
-                prev_end = int(prev.get("timeEnd", 0) or 0)
-                if finalized and (not prev.get("finalized") or prev_end != int(job.get("timeEnd", 0) or 0)):
-                    # update finalized info
-                    incoming_timeout = int(job.get("timeout", 0) or 0)
-                    stored_timeout = int(prev.get("timeout", 0) or 0)
-                    # Only overwrite a previously-known non-zero timeout with a new non-zero timeout.
-                    # Ignore incoming zero timeout to avoid clobbering known values from transient API responses.
-                    if incoming_timeout > 0:
-                        new_timeout = incoming_timeout
-                    else:
-                        new_timeout = stored_timeout
-                        if incoming_timeout == 0 and stored_timeout > 0:
-                            _LOGGER.debug(
-                                "Ignoring incoming zero timeout for job %s (keeping stored %s)", jid, stored_timeout
-                            )
-
-                    _LOGGER.debug("Updating job %s timeout from %s to %s", jid, prev.get("timeout"), new_timeout)
-                    prev.update({
-                        "timeEnd": int(job.get("timeEnd", 0) or 0),
-                        "timeout": int(new_timeout or 0),
-                        "runtime_seconds": int(runtime),
-                        "earned_usd": float(earned),
-                        "finalized": True,
-                        "usdRewardPerHour": float(job.get("usdRewardPerHour", 0.0) or 0.0),
-                        "last_seen": datetime.now(timezone.utc).isoformat(),
-                    })
-                    if bench:
-                        prev["benchmark"] = bench
-                    changed = True
-                else:
-                    # If benchmark exists and not stored yet, backfill
-                    if bench and not prev.get("benchmark"):
-                        prev["benchmark"] = bench
-                        prev["last_seen"] = datetime.now(timezone.utc).isoformat()
-                        changed = True
-
-                    # If the fresh job reports a longer timeout than stored (e.g., timeout extended),
-                    # persist the extension immediately so sensors reflect the latest timeout.
-                    try:
-                        incoming_timeout = int(job.get("timeout", 0) or 0)
-                        stored_timeout = int(prev.get("timeout", 0) or 0)
-                        if incoming_timeout > stored_timeout:
-                            prev["timeout"] = int(incoming_timeout)
-                            prev["last_seen"] = datetime.now(timezone.utc).isoformat()
-                            changed = True
-                            _LOGGER.debug(
-                                "Extended timeout for job %s from %s to %s (persisted)",
-                                jid,
-                                stored_timeout,
-                                incoming_timeout,
-                            )
-                    except Exception:
-                        pass
+            _, bench = ledger.ingest(job)
 
             # Track latest benchmark by timeEnd
-            if finalized and bench:
+            if bench:
                 time_end = int(job.get("timeEnd", 0) or 0)
                 if time_end > latest_bench_time:
                     latest_bench_time = time_end
                     latest_bench = bench
 
-        if changed:
-            try:
-                await self._store.async_save({"jobs": jobs_store})
-            except Exception as e:
-                _LOGGER.debug("Failed to save jobs store: %s", e)
-
-        # Compute totals only from finalized jobs
-        total_seconds = 0
-        total_usd = 0.0
-        for rec in jobs_store.values():
-            if int(rec.get("timeEnd", 0) or 0) > 0:
-                total_seconds += int(rec.get("runtime_seconds", 0) or 0)
-                total_usd += float(rec.get("earned_usd", 0.0) or 0.0)
+        if ledger.dirty:
+            self.schedule_ledger_save()
+
+        # Catch up on jobs that dropped out of the 10-job window since the last fetch
+        if self._backfill is not None:
+            self._backfill.async_start()
 
+        jobs_store = ledger.jobs
         # Expose latest benchmark (from latest 10 or store fallback)
-        latest_bench_out: Dict[str, Any] = {}
-        if latest_bench:
-            latest_bench_out = latest_bench
-        else:
-            # fallback: scan store for any benchmark
-            for rec in jobs_store.values():
-                b = rec.get("benchmark")
-                if isinstance(b, dict):
-                    latest_bench_out = b
-                    break
+        latest_bench_out: Dict[str, Any] = latest_bench or ledger.latest_benchmark() or {}
 
         # Determine latest job (prefer fresh fetched jobs when available)
         latest_job_out: Dict[str, Any] = {}
@@ -716,38 +832,17 @@ class NosanaNodeCoordinator(DataUpdateCoordinator):
 
             # Fallback to persisted store if no fresh jobs present or chosen is empty
             if not latest_job_out:
-                running_candidate = None
-                running_ts = 0
-                recent_candidate = None
-                recent_ts = 0
-                for rec in jobs_store.values():
-                    ts = int(rec.get("timeStart", 0) or 0)
-                    te = int(rec.get("timeEnd", 0) or 0)
-                    if te == 0 and ts > running_ts:
-                        running_ts = ts
-                        running_candidate = rec
-                    if ts > recent_ts:
-                        recent_ts = ts
-                        recent_candidate = rec
-                chosen = running_candidate or recent_candidate
-                if isinstance(chosen, dict):
+                chosen = ledger.latest_job()
+                if chosen:
                     _LOGGER.debug(
                         "Selected latest job from store id=%s timeStart=%s timeEnd=%s timeout=%s",
                         chosen.get("id"), chosen.get("timeStart"), chosen.get("timeEnd"), chosen.get("timeout"),
                     )
-                    latest_job_out = {
-                        "id": int(chosen.get("id", 0) or 0),
-                        "timeStart": int(chosen.get("timeStart", 0) or 0),
-                        "timeEnd": int(chosen.get("timeEnd", 0) or 0),
-                        "timeout": int(chosen.get("timeout", 0) or 0),
-                    }
+                    latest_job_out = chosen
         except Exception:
             latest_job_out = {}
 
-        return {
-            "usd_total": round(total_usd, 6),
-            "seconds_total": int(total_seconds),
-            "jobs_tracked": len(jobs_store),
-            "benchmark": latest_bench_out,
-            "latest_job": latest_job_out,
-        }
+        earnings = ledger.totals()
+        earnings["benchmark"] = latest_bench_out
+        earnings["latest_job"] = latest_job_out
+        return earnings
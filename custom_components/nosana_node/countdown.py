@@ -0,0 +1,149 @@
+# custom_components/nosana_node/countdown.py
+"""Local job countdown for Nosana Node integration.
+
+Once `latest_job` is known, the time left of a running job only depends on the
+clock, so it does not need polling. `JobCountdown` arms an
+`async_track_point_in_time` timer from the coordinator's `latest_job` and
+ticks every `resolution` seconds, aligned so the last tick lands on the expiry.
+When the job times out it fires `nosana_node_job_expired` on the event bus. No
+network calls are made; the timer is re-armed whenever a coordinator update
+changes the `earnings` section.
+"""
+import logging
+import time
+from datetime import datetime
+from typing import TYPE_CHECKING, Any, Callable, List, Mapping, Optional
+
+from homeassistant.core import CALLBACK_TYPE, callback
+from homeassistant.helpers.event import async_track_point_in_time
+from homeassistant.util import dt as dt_util
+
+from .const import EVENT_JOB_EXPIRED
+
+if TYPE_CHECKING:
+    from .coordinator import NosanaNodeCoordinator
+
+_LOGGER = logging.getLogger(__name__)
+
+
+def _job_expiry_ts(latest_job: Any) -> Optional[float]:
+    """Return the epoch seconds at which a running job times out (None if not running)."""
+    if not isinstance(latest_job, Mapping):
+        return None
+    try:
+        if int(latest_job.get("timeEnd", 0) or 0) > 0:
+            return None
+        time_start = int(latest_job.get("timeStart", 0) or 0)
+        timeout = int(latest_job.get("timeout", 0) or 0)
+        if time_start <= 0 or timeout <= 0:
+            return None
+        # Heuristic: timeStart/timeout may be in milliseconds on some APIs
+        if time_start > 1_000_000_000_000:
+            time_start = time_start / 1000.0
+        if timeout > 1_000_000_000:
+            timeout = timeout / 1000.0
+        return float(time_start) + float(timeout)
+    except Exception:
+        return None
+
+
+class JobCountdown:
+    """Clock-driven countdown of a node's running job."""
+
+    def __init__(self, coordinator: "NosanaNodeCoordinator", resolution: float = 60.0):
+        """Initialize the countdown."""
+        self._coordinator = coordinator
+        self.resolution = max(1.0, float(resolution))
+        self.expires_at: Optional[float] = None
+        self._job_id: Optional[int] = None
+        self._unsub_timer: Optional[CALLBACK_TYPE] = None
+        self._unsub_coordinator: Optional[CALLBACK_TYPE] = None
+        self._listeners: List[Callable[[], None]] = []
+
+    @property
+    def running(self) -> bool:
+        """Return True while the countdown follows coordinator updates."""
+        return self._unsub_coordinator is not None
+
+    @callback
+    def async_start(self) -> None:
+        """Follow coordinator updates and arm the timer for the current job."""
+        if self._unsub_coordinator is None:
+            self._unsub_coordinator = self._coordinator.async_add_listener(self._async_coordinator_updated)
+        self._async_arm()
+
+    @callback
+    def async_cancel(self) -> None:
+        """Stop following coordinator updates and cancel the timer."""
+        if self._unsub_coordinator is not None:
+            self._unsub_coordinator()
+            self._unsub_coordinator = None
+        self._cancel_timer()
+        self.expires_at = None
+
+    @callback
+    def async_add_listener(self, update_callback: Callable[[], None]) -> Callable[[], None]:
+        """Call update_callback on every tick; returns a callable that removes it."""
+        self._listeners.append(update_callback)
+
+        @callback
+        def _remove() -> None:
+            if update_callback in self._listeners:
+                self._listeners.remove(update_callback)
+
+        return _remove
+
+    def time_left(self, now: Optional[float] = None) -> Optional[float]:
+        """Seconds until the running job times out (None if no job is running)."""
+        if self.expires_at is None:
+            return None
+        return max(0.0, self.expires_at - (now if now is not None else time.time()))
+
+    def _cancel_timer(self) -> None:
+        if self._unsub_timer is not None:
+            self._unsub_timer()
+            self._unsub_timer = None
+
+    @callback
+    def _async_coordinator_updated(self) -> None:
+        if "earnings" in self._coordinator.changed_sections:
+            self._async_arm()
+
+    @callback
+    def _async_arm(self) -> None:
+        """(Re)schedule the next tick from the coordinator's latest_job."""
+        self._cancel_timer()
+        data = self._coordinator.data
+        latest = (data.get("earnings") or {}).get("latest_job") if data else None
+        self.expires_at = _job_expiry_ts(latest)
+        self._job_id = latest.get("id") if isinstance(latest, Mapping) else None
+        if self.expires_at is None:
+            return
+        now = time.time()
+        left = self.expires_at - now
+        if left <= 0:
+            # expired before we saw it running: nothing left to count down
+            return
+        # align ticks on the expiry so the last one lands exactly on it
+        step = left % self.resolution or self.resolution
+        self._unsub_timer = async_track_point_in_time(
+            self._coordinator.hass, self._async_tick, dt_util.utc_from_timestamp(now + step)
+        )
+
+    @callback
+    def _async_tick(self, now: datetime) -> None:
+        self._unsub_timer = None
+        for listener in list(self._listeners):
+            listener()
+        if self.expires_at is not None and now.timestamp() >= self.expires_at:
+            _LOGGER.debug("Job %s of %s timed out", self._job_id, self._coordinator.node_address)
+            self._coordinator.hass.bus.async_fire(
+                EVENT_JOB_EXPIRED,
+                {
+                    "node_address": self._coordinator.node_address,
+                    "job_id": self._job_id,
+                    "expired_at": dt_util.utc_from_timestamp(self.expires_at).isoformat(),
+                },
+            )
+            return
+        self._async_arm()
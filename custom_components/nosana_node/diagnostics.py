@@ -0,0 +1,82 @@
+# custom_components/nosana_node/diagnostics.py
+"""Diagnostics support for Nosana Node integration.
+
+The download holds the node's request instrumentation: per-endpoint latency
+histograms and status counts, bytes received, cache hit ratios and refresh
+durations. Use it to tune TTLs and poll intervals.
+
+It also holds the last refresh traces with per-stage timings (ms):
+
+- `fetch`: the concurrent fetch as a whole; `info`, `metrics`, `markets`,
+  `queue` and `jobs` are the requests inside it (`jobs` includes merging the
+  fetched jobs into the ledger)
+- `metrics_normalize`, `markets_lookup`, `jobs_merge` (earnings from the
+  ledger) and `snapshot`
+- `store_save`: scheduling the ledger save; the write itself is delayed and
+  happens off the refresh path
+
+plus the cache states, the Store size and record counts, and the shared rate
+limiter state. Node addresses, market addresses and the RPC URL are redacted.
+"""
+import os
+from typing import Any, Dict, Iterable, Optional
+
+from homeassistant.components.diagnostics import async_redact_data
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+
+from .conditional import get_conditional_cache
+from .const import CONF_NODE_ADDRESS, CONF_RPC_URL, DOMAIN
+from .coordinator import NosanaNodeCoordinator
+from .ratelimit import get_rate_limiter
+
+REDACTED = "**REDACTED**"
+
+TO_REDACT = {CONF_NODE_ADDRESS, CONF_RPC_URL, "address", "marketAddress", "market_address", "path"}
+
+
+def _file_size(path: str) -> Optional[int]:
+    try:
+        return os.path.getsize(path)
+    except OSError:
+        return None
+
+
+def _redact_hosts(state: Dict[str, Any], addresses: Iterable[str]) -> Dict[str, Any]:
+    """Redact node addresses from the limiter's host keys (`{address}.node.k8s.prd.nos.ci`)."""
+    out: Dict[str, Any] = {}
+    for host, value in state.items():
+        for address in addresses:
+            host = host.replace(address, REDACTED)
+        out[host] = value
+    return out
+
+
+async def async_get_config_entry_diagnostics(hass: HomeAssistant, entry: ConfigEntry) -> Dict[str, Any]:
+    """Return diagnostics for a config entry."""
+    coordinator: NosanaNodeCoordinator = hass.data[DOMAIN][entry.entry_id]
+    conditional = get_conditional_cache(hass)
+    store = coordinator.store_state()
+    store["size_bytes"] = await hass.async_add_executor_job(_file_size, store["path"])
+    # the limiter is shared, so its hosts include every configured node
+    addresses = [
+        c.node_address for c in hass.data[DOMAIN].values() if isinstance(c, NosanaNodeCoordinator)
+    ]
+    return async_redact_data(
+        {
+            "entry": {"data": dict(entry.data), "options": dict(entry.options)},
+            "refresh": coordinator.refresh_latency.as_dict(),
+            "poll_interval_seconds": coordinator.poll_interval.total_seconds(),
+            "traces": [trace.as_dict() for trace in coordinator.traces],
+            "endpoints": {name: stats.as_dict() for name, stats in coordinator.endpoint_stats().items()},
+            "caches": {
+                **{name: stats.as_dict() for name, stats in coordinator.cache_stats().items()},
+                # ETag/Last-Modified revalidations shared by all nodes (markets and metrics)
+                "conditional": {"hits": conditional.hits, "misses": conditional.misses, "entries": len(conditional)},
+            },
+            "cache_state": coordinator.cache_state(),
+            "store": store,
+            "rate_limiter": _redact_hosts(get_rate_limiter(hass).state(), addresses),
+        },
+        TO_REDACT,
+    )
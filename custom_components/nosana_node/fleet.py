@@ -0,0 +1,165 @@
+# custom_components/nosana_node/fleet.py
+"""Fleet scheduler for Nosana Node integration.
+
+In fleet mode coordinators have no timer of their own. A single scheduler,
+stored in `hass.data[DOMAIN][DATA_FLEET]`, drives every enrolled node: the
+update interval is split into a small number of slots and each tick refreshes
+only the nodes whose (adaptive) poll interval has elapsed. Nodes are staggered
+across the interval when they enroll, which bounds timer wakeups per interval
+regardless of fleet size and spreads per-node requests evenly instead of
+bursting them at the same instant. Shared endpoints (markets) are fetched once
+per tick through the fleet-wide markets service before the per-node refreshes,
+and the market queues of all nodes in one batched RPC call.
+"""
+import asyncio
+import logging
+from datetime import datetime, timedelta
+from typing import TYPE_CHECKING, Callable, Dict, List, Optional
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.event import async_track_time_interval
+
+from .const import DOMAIN, DATA_FLEET, DATA_MARKET_QUEUES
+from .markets import get_markets_service
+
+if TYPE_CHECKING:
+    from .coordinator import NosanaNodeCoordinator
+
+_LOGGER = logging.getLogger(__name__)
+
+# maximum number of slots (timer wakeups) per update interval
+FLEET_MAX_SLOTS = 6
+
+
+class NosanaFleetScheduler:
+    """Drive many NosanaNodeCoordinator instances from one timer."""
+
+    def __init__(self, hass: HomeAssistant, interval: timedelta = timedelta(seconds=30)):
+        """Initialize the scheduler."""
+        self._hass = hass
+        self.interval = interval
+        self._coordinators: List["NosanaNodeCoordinator"] = []
+        self._slots = 1
+        # nodes staggered into each slot, and the slot of each node (by id)
+        self._slot_load: List[int] = [0]
+        self._slot_of: Dict[int, int] = {}
+        # start of slot 0 in the current stagger (set on every full rebalance)
+        self._epoch = datetime.utcnow()
+        # nodes whose refresh is still running (a slow node must not be refreshed twice)
+        self._refreshing: set = set()
+        self._unsub_timer: Optional[Callable[[], None]] = None
+
+    @property
+    def coordinators(self) -> List["NosanaNodeCoordinator"]:
+        """Return the enrolled coordinators."""
+        return list(self._coordinators)
+
+    @callback
+    def async_add(self, coordinator: "NosanaNodeCoordinator") -> None:
+        """Enroll a coordinator into the least loaded slot.
+
+        Enrolled nodes keep their slot; the whole fleet is only re-staggered
+        when the number of slots changes.
+        """
+        if coordinator in self._coordinators:
+            return
+        self._coordinators.append(coordinator)
+        if self._unsub_timer is None or self._slot_count() != self._slots:
+            self._async_rebalance()
+            return
+        slot = self._slot_load.index(min(self._slot_load))
+        self._slot_load[slot] += 1
+        self._slot_of[id(coordinator)] = slot
+        coordinator.defer_refresh(self._slot_delay(slot))
+
+    @callback
+    def async_remove(self, coordinator: "NosanaNodeCoordinator") -> None:
+        """Remove a coordinator; stop the timer when the fleet is empty."""
+        if coordinator not in self._coordinators:
+            return
+        self._coordinators.remove(coordinator)
+        slot = self._slot_of.pop(id(coordinator), None)
+        if not self._coordinators or self._slot_count() != self._slots:
+            self._async_rebalance()
+        elif slot is not None:
+            self._slot_load[slot] -= 1
+
+    def _slot_count(self) -> int:
+        return max(1, min(FLEET_MAX_SLOTS, len(self._coordinators)))
+
+    def _slot_delay(self, slot: int) -> timedelta:
+        """Time until the next start of slot in the current stagger."""
+        interval = self.interval.total_seconds()
+        phase = (self._epoch - datetime.utcnow()).total_seconds() + interval * slot / self._slots
+        return timedelta(seconds=phase % interval)
+
+    @callback
+    def _async_rebalance(self) -> None:
+        """Re-stagger every node and re-arm the timer so each slot covers ~len(fleet)/slots nodes."""
+        if self._unsub_timer is not None:
+            self._unsub_timer()
+            self._unsub_timer = None
+        self._slot_of.clear()
+        if not self._coordinators:
+            self._slots = 1
+            self._slot_load = [0]
+            return
+        self._slots = self._slot_count()
+        self._slot_load = [0] * self._slots
+        self._epoch = datetime.utcnow()
+        # stagger the nodes evenly across one interval
+        count = len(self._coordinators)
+        step = self.interval / count
+        for i, coordinator in enumerate(self._coordinators):
+            slot = i * self._slots // count
+            self._slot_load[slot] += 1
+            self._slot_of[id(coordinator)] = slot
+            coordinator.defer_refresh(step * i)
+        self._unsub_timer = async_track_time_interval(
+            self._hass, self._async_handle_tick, self.interval / self._slots
+        )
+
+    def _due(self) -> List["NosanaNodeCoordinator"]:
+        """Return the coordinators whose next refresh is due."""
+        now = datetime.utcnow()
+        return [
+            c for c in self._coordinators
+            if c.refresh_due(now) and id(c) not in self._refreshing
+        ]
+
+    async def _async_handle_tick(self, _now=None) -> None:
+        """Refresh the nodes that are due in this slot."""
+        due = self._due()
+        if not due:
+            return
+        # Batch the shared endpoint once for the whole slot (single-flight, TTL-cached)
+        try:
+            await get_markets_service(self._hass).async_get_markets()
+        except Exception as e:
+            _LOGGER.debug("Fleet markets prefetch failed: %s", e)
+        # One getMultipleAccounts call per RPC URL covers the queues of every enrolled market
+        for queues in list(self._hass.data.get(DOMAIN, {}).get(DATA_MARKET_QUEUES, {}).values()):
+            try:
+                await queues.async_refresh()
+            except Exception as e:
+                _LOGGER.debug("Fleet market queue prefetch failed: %s", e)
+        self._refreshing.update(id(c) for c in due)
+        try:
+            results = await asyncio.gather(
+                *(c.async_refresh() for c in due), return_exceptions=True
+            )
+        finally:
+            self._refreshing.difference_update(id(c) for c in due)
+        for coordinator, result in zip(due, results):
+            if isinstance(result, Exception):
+                _LOGGER.debug("Fleet refresh failed for %s: %s", coordinator.node_address, result)
+
+
+def get_fleet_scheduler(hass: HomeAssistant) -> NosanaFleetScheduler:
+    """Return the shared fleet scheduler, creating it on first use."""
+    domain_data = hass.data.setdefault(DOMAIN, {})
+    scheduler = domain_data.get(DATA_FLEET)
+    if scheduler is None:
+        scheduler = NosanaFleetScheduler(hass)
+        domain_data[DATA_FLEET] = scheduler
+    return scheduler
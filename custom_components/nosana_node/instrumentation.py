@@ -0,0 +1,183 @@
+# custom_components/nosana_node/instrumentation.py
+"""Request and cache instrumentation for Nosana Node integration.
+
+`EndpointStats` holds the counters of one upstream endpoint. The rate
+limiter fills it for every request it sends: a latency histogram (time to
+response headers), counts per status code (plus `throttled`, `timeout` and
+`error` for requests that got no response) and bytes received according to
+Content-Length. `CacheStats` counts hits and misses of a TTL cache. Each
+coordinator keeps its own info/metrics/jobs stats and refresh durations. The
+shared markets and market queue services keep theirs. All of it is exposed
+through diagnostic sensors and the diagnostics download.
+
+`RefreshTrace` records the per-stage timings of one refresh. Coordinators keep
+the last few for the diagnostics download.
+
+Plain counters with no Home Assistant dependency.
+"""
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Any, Awaitable, Dict, Iterator, List, Optional, TypeVar, Union
+
+_T = TypeVar("_T")
+
+# upper bounds (ms) of the latency histogram buckets; the last bucket is open-ended
+LATENCY_BUCKETS_MS = (50, 100, 250, 500, 1000, 2500, 5000, 10000)
+
+# pseudo status codes for requests that got no HTTP response
+STATUS_THROTTLED = "throttled"
+STATUS_TIMEOUT = "timeout"
+STATUS_ERROR = "error"
+
+
+class LatencyHistogram:
+    """Fixed-bucket latency histogram."""
+
+    __slots__ = ("counts", "count", "total_ms", "last_ms", "max_ms")
+
+    def __init__(self):
+        self.counts: List[int] = [0] * (len(LATENCY_BUCKETS_MS) + 1)
+        self.count = 0
+        self.total_ms = 0.0
+        self.last_ms: Optional[float] = None
+        self.max_ms = 0.0
+
+    def observe(self, seconds: float) -> None:
+        """Add one sample."""
+        ms = seconds * 1000.0
+        self.counts[bisect_left(LATENCY_BUCKETS_MS, ms)] += 1
+        self.count += 1
+        self.total_ms += ms
+        self.last_ms = round(ms, 1)
+        self.max_ms = max(self.max_ms, ms)
+
+    @property
+    def mean_ms(self) -> Optional[float]:
+        """Mean latency (None without samples)."""
+        return round(self.total_ms / self.count, 1) if self.count else None
+
+    def as_dict(self) -> Dict[str, Any]:
+        buckets = {f"le_{bound}": n for bound, n in zip(LATENCY_BUCKETS_MS, self.counts)}
+        buckets[f"gt_{LATENCY_BUCKETS_MS[-1]}"] = self.counts[-1]
+        return {
+            "count": self.count,
+            "last_ms": self.last_ms,
+            "mean_ms": self.mean_ms,
+            "max_ms": round(self.max_ms, 1),
+            "buckets": buckets,
+        }
+
+
+class EndpointStats:
+    """Latency, status and volume counters of one upstream endpoint."""
+
+    __slots__ = ("latency", "statuses", "bytes_received")
+
+    def __init__(self):
+        self.latency = LatencyHistogram()
+        self.statuses: Dict[Union[int, str], int] = {}
+        self.bytes_received = 0
+
+    def record(self, seconds: Optional[float], status: Union[int, str], nbytes: Optional[int] = None) -> None:
+        """Record one request; seconds is None for requests that were never sent (throttled)."""
+        if seconds is not None:
+            self.latency.observe(seconds)
+        self.statuses[status] = self.statuses.get(status, 0) + 1
+        if nbytes:
+            self.bytes_received += nbytes
+
+    @property
+    def requests(self) -> int:
+        return sum(self.statuses.values())
+
+    @property
+    def errors(self) -> int:
+        """Requests that did not return 2xx or 304."""
+        return sum(
+            n for status, n in self.statuses.items() if not (isinstance(status, int) and (200 <= status < 300 or status == 304))
+        )
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "requests": self.requests,
+            "errors": self.errors,
+            "statuses": {str(status): n for status, n in self.statuses.items()},
+            "bytes_received": self.bytes_received,
+            "latency": self.latency.as_dict(),
+        }
+
+
+class CacheStats:
+    """Hit/miss counters of one cache."""
+
+    __slots__ = ("hits", "misses")
+
+    def __init__(self):
+        self.hits = 0
+        self.misses = 0
+
+    def record(self, hit: bool) -> None:
+        if hit:
+            self.hits += 1
+        else:
+            self.misses += 1
+
+    @property
+    def hit_ratio(self) -> Optional[float]:
+        """Hits in percent of all lookups (None before the first lookup)."""
+        total = self.hits + self.misses
+        return round(100.0 * self.hits / total, 1) if total else None
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {"hits": self.hits, "misses": self.misses, "hit_ratio": self.hit_ratio}
+
+
+class RefreshTrace:
+    """Per-stage timings (ms) of one coordinator refresh."""
+
+    __slots__ = ("started_at", "stages", "duration_ms", "ok", "changed_sections", "stale")
+
+    def __init__(self, started_at: datetime):
+        self.started_at = started_at
+        self.stages: Dict[str, float] = {}
+        self.duration_ms: Optional[float] = None
+        self.ok: Optional[bool] = None
+        self.changed_sections: List[str] = []
+        self.stale: List[str] = []
+
+    def add(self, stage: str, seconds: float) -> None:
+        """Add time to a stage (stages entered more than once accumulate)."""
+        self.stages[stage] = round(self.stages.get(stage, 0.0) + seconds * 1000.0, 2)
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        """Time the enclosed block as stage name."""
+        start = time.monotonic()
+        try:
+            yield
+        finally:
+            self.add(name, time.monotonic() - start)
+
+    async def timed(self, name: str, awaitable: Awaitable[_T]) -> _T:
+        """Await awaitable, timing it as stage name (usable inside asyncio.gather)."""
+        start = time.monotonic()
+        try:
+            return await awaitable
+        finally:
+            self.add(name, time.monotonic() - start)
+
+    def finish(self, seconds: float, ok: bool) -> None:
+        self.duration_ms = round(seconds * 1000.0, 2)
+        self.ok = ok
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "started_at": self.started_at.isoformat(),
+            "duration_ms": self.duration_ms,
+            "ok": self.ok,
+            "stages_ms": dict(self.stages),
+            "changed_sections": self.changed_sections,
+            "stale": self.stale,
+        }
@@ -0,0 +1,305 @@
+# custom_components/nosana_node/ledger.py
+"""Per-node jobs ledger for Nosana Node integration.
+
+Holds the job records persisted in the node's HA Store together with running
+earnings aggregates (totals, counts and per-day buckets). The aggregates are
+updated incrementally whenever a record is inserted or finalizes, so reading
+totals never iterates the job history.
+
+Store layout::
+
+    {"jobs": {id: {record}}, "aggregates": {"usd_total", "seconds_total",
+     "jobs_finalized", "days": {"YYYY-MM-DD": {"usd", "seconds", "jobs"}}},
+     "backfill": {"offset", "complete", "last_run"}}
+"""
+import json
+import logging
+from datetime import datetime, timezone
+from typing import Any, Dict, Optional, Tuple
+
+_LOGGER = logging.getLogger(__name__)
+
+
+def _compute(job: Dict[str, Any]) -> Tuple[int, float]:
+    """Return (runtime_seconds, earned_usd) for a finalized job, (0, 0.0) otherwise."""
+    start = int(job.get("timeStart", 0) or 0)
+    end = int(job.get("timeEnd", 0) or 0)
+    timeout = int(job.get("timeout", 0) or 0)
+
+    # Only count earnings/runtime if the job is finalized
+    if start <= 0 or end <= 0 or end < start:
+        return 0, 0.0
+
+    # Calculate actual duration
+    duration = max(0, end - start)
+
+    # Cap runtime at timeout if timeout is set and exceeded
+    runtime = duration
+    if timeout > 0 and duration > timeout:
+        runtime = timeout
+
+    usdph = float(job.get("usdRewardPerHour", 0.0) or 0.0)
+    earned = (runtime / 3600.0) * usdph
+    return runtime, earned
+
+
+def _extract_llm_benchmark(job: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """Parse the llm-benchmark op result of a job into {model_id, tokens_per_second_mean}."""
+    jr = job.get("jobResult")
+    if not isinstance(jr, dict):
+        return None
+    op_states = jr.get("opStates")
+    if not isinstance(op_states, list):
+        return None
+    for op in op_states:
+        if not isinstance(op, dict):
+            continue
+        if op.get("operationId") == "llm-benchmark" and op.get("status") == "success":
+            results = op.get("results", {})
+            arr = results.get("results_llm_benchmark")
+            if isinstance(arr, list) and arr:
+                raw = arr[0]
+                try:
+                    parsed = json.loads(raw)
+                    model_id = parsed.get("model_id") or parsed.get("results", {}).get("users_1", {}).get("model_id")
+                    tps = parsed.get("results", {}).get("users_1", {}).get("tokens_per_second", {})
+                    mean = tps.get("mean")
+                    if model_id and isinstance(mean, (int, float)):
+                        return {"model_id": model_id, "tokens_per_second_mean": float(mean)}
+                except Exception:
+                    return None
+    return None
+
+
+def _empty_aggregates() -> Dict[str, Any]:
+    return {"usd_total": 0.0, "seconds_total": 0, "jobs_finalized": 0, "days": {}}
+
+
+def _day_key(time_end: int) -> str:
+    """UTC date bucket for a job end timestamp (seconds or milliseconds)."""
+    ts = time_end / 1000.0 if time_end > 1_000_000_000_000 else float(time_end)
+    try:
+        return datetime.fromtimestamp(ts, timezone.utc).strftime("%Y-%m-%d")
+    except (OverflowError, OSError, ValueError):
+        return "unknown"
+
+
+class JobsLedger:
+    """Job records plus incrementally maintained earnings aggregates."""
+
+    def __init__(self, jobs: Optional[Dict[str, Any]] = None, aggregates: Optional[Dict[str, Any]] = None):
+        """Initialize the ledger; aggregates are rebuilt once when missing."""
+        self.jobs: Dict[str, Any] = jobs if isinstance(jobs, dict) else {}
+        # True when the in-memory state differs from what was loaded (needs a save)
+        self.dirty = False
+        # derived views, recomputed only after a record changes
+        self._latest_job: Optional[Dict[str, Any]] = None
+        self._latest_benchmark: Optional[Dict[str, Any]] = None
+        self._views_valid = False
+        if isinstance(aggregates, dict) and isinstance(aggregates.get("days"), dict):
+            self.aggregates = aggregates
+        else:
+            self.aggregates = _empty_aggregates()
+            for rec in self.jobs.values():
+                self._add(rec)
+            # persist the migrated aggregates alongside the records
+            self.dirty = bool(self.jobs)
+
+        # job-history backfill cursor: {"offset", "complete", "last_run"}
+        self.backfill: Dict[str, Any] = {"offset": 0, "complete": False}
+
+    @classmethod
+    def from_store_data(cls, data: Any) -> "JobsLedger":
+        """Build a ledger from the raw Store payload (None/invalid -> empty)."""
+        if not isinstance(data, dict):
+            return cls()
+        ledger = cls(data.get("jobs") or {}, data.get("aggregates"))
+        if isinstance(data.get("backfill"), dict):
+            ledger.backfill = data["backfill"]
+        return ledger
+
+    def as_store_data(self) -> Dict[str, Any]:
+        """Return the payload to persist in the Store."""
+        return {"jobs": self.jobs, "aggregates": self.aggregates, "backfill": self.backfill}
+
+    def _apply(self, rec: Dict[str, Any], sign: int) -> None:
+        """Add (sign=1) or remove (sign=-1) a record's contribution to the aggregates."""
+        time_end = int(rec.get("timeEnd", 0) or 0)
+        if time_end <= 0:
+            return
+        seconds = int(rec.get("runtime_seconds", 0) or 0)
+        usd = float(rec.get("earned_usd", 0.0) or 0.0)
+        aggs = self.aggregates
+        aggs["usd_total"] = float(aggs.get("usd_total", 0.0)) + sign * usd
+        aggs["seconds_total"] = int(aggs.get("seconds_total", 0)) + sign * seconds
+        aggs["jobs_finalized"] = int(aggs.get("jobs_finalized", 0)) + sign
+        day = _day_key(time_end)
+        bucket = aggs["days"].setdefault(day, {"usd": 0.0, "seconds": 0, "jobs": 0})
+        bucket["usd"] = float(bucket["usd"]) + sign * usd
+        bucket["seconds"] = int(bucket["seconds"]) + sign * seconds
+        bucket["jobs"] = int(bucket["jobs"]) + sign
+        if bucket["jobs"] <= 0:
+            aggs["days"].pop(day, None)
+
+    def _add(self, rec: Dict[str, Any]) -> None:
+        self._apply(rec, 1)
+
+    def _remove(self, rec: Dict[str, Any]) -> None:
+        self._apply(rec, -1)
+
+    def totals(self) -> Dict[str, Any]:
+        """Return the earnings totals (O(1))."""
+        return {
+            "usd_total": round(float(self.aggregates.get("usd_total", 0.0)), 6),
+            "seconds_total": int(self.aggregates.get("seconds_total", 0)),
+            "jobs_tracked": len(self.jobs),
+        }
+
+    def _refresh_views(self) -> None:
+        """Recompute latest_job/benchmark from the records (only after changes)."""
+        running_candidate = None
+        running_ts = 0
+        recent_candidate = None
+        recent_ts = 0
+        benchmark = None
+        for rec in self.jobs.values():
+            ts = int(rec.get("timeStart", 0) or 0)
+            te = int(rec.get("timeEnd", 0) or 0)
+            if te == 0 and ts > running_ts:
+                running_ts = ts
+                running_candidate = rec
+            if ts > recent_ts:
+                recent_ts = ts
+                recent_candidate = rec
+            if benchmark is None and isinstance(rec.get("benchmark"), dict):
+                benchmark = rec["benchmark"]
+        chosen = running_candidate or recent_candidate
+        self._latest_job = None
+        if isinstance(chosen, dict):
+            self._latest_job = {
+                "id": int(chosen.get("id", 0) or 0),
+                "timeStart": int(chosen.get("timeStart", 0) or 0),
+                "timeEnd": int(chosen.get("timeEnd", 0) or 0),
+                "timeout": int(chosen.get("timeout", 0) or 0),
+            }
+        self._latest_benchmark = benchmark
+        self._views_valid = True
+
+    def latest_job(self) -> Optional[Dict[str, Any]]:
+        """Return the running job (or most recent one) from the records."""
+        if not self._views_valid:
+            self._refresh_views()
+        return self._latest_job
+
+    def latest_benchmark(self) -> Optional[Dict[str, Any]]:
+        """Return the first stored benchmark, used when fresh jobs carry none."""
+        if not self._views_valid:
+            self._refresh_views()
+        return self._latest_benchmark
+
+    def ingest(self, job: Dict[str, Any]) -> Tuple[bool, Optional[Dict[str, Any]]]:
+        """Merge one job from the jobs API into the ledger.
+
+        Returns (changed, benchmark) where benchmark is the parsed llm-benchmark
+        of a finalized job (or None).
+        """
+        if not isinstance(job, dict):
+            return False, None
+        jid = str(job.get("id"))
+        if not jid or jid == "None":
+            return False, None
+
+        # Skip jobs with no start time
+        if int(job.get("timeStart", 0) or 0) <= 0:
+            return False, None
+
+        jobs_store = self.jobs
+        changed = False
+        runtime, earned = _compute(job)
+        finalized = int(job.get("timeEnd", 0) or 0) > 0
+
+        prev = jobs_store.get(jid)
+        # Backfill benchmark if present and missing
+        bench = _extract_llm_benchmark(job) if finalized else None
+
+        if prev is None:
+            initial_timeout = int(job.get("timeout", 0) or 0)
+            new_record = {
+                "id": int(job.get("id", 0) or 0),
+                "timeStart": int(job.get("timeStart", 0) or 0),
+                "timeEnd": int(job.get("timeEnd", 0) or 0),
+                "timeout": int(initial_timeout or 0),
+                "usdRewardPerHour": float(job.get("usdRewardPerHour", 0.0) or 0.0),
+                "runtime_seconds": int(runtime),
+                "earned_usd": float(earned),
+                "state": job.get("state"),
+                "finalized": bool(finalized),
+                "last_seen": datetime.now(timezone.utc).isoformat(),
+            }
+            _LOGGER.debug("Storing new job %s timeout=%s", jid, new_record.get("timeout"))
+            if bench:
+                new_record["benchmark"] = bench
+            jobs_store[jid] = new_record
+            self._add(new_record)
+            changed = True
+        else:
+            prev_end = int(prev.get("timeEnd", 0) or 0)
+            if finalized and (not prev.get("finalized") or prev_end != int(job.get("timeEnd", 0) or 0)):
+                # update finalized info
+                incoming_timeout = int(job.get("timeout", 0) or 0)
+                stored_timeout = int(prev.get("timeout", 0) or 0)
+                # Only overwrite a previously-known non-zero timeout with a new non-zero timeout.
+                # Ignore incoming zero timeout to avoid clobbering known values from transient API responses.
+                if incoming_timeout > 0:
+                    new_timeout = incoming_timeout
+                else:
+                    new_timeout = stored_timeout
+                    if incoming_timeout == 0 and stored_timeout > 0:
+                        _LOGGER.debug(
+                            "Ignoring incoming zero timeout for job %s (keeping stored %s)", jid, stored_timeout
+                        )
+
+                _LOGGER.debug("Updating job %s timeout from %s to %s", jid, prev.get("timeout"), new_timeout)
+                self._remove(prev)
+                prev.update({
+                    "timeEnd": int(job.get("timeEnd", 0) or 0),
+                    "timeout": int(new_timeout or 0),
+                    "runtime_seconds": int(runtime),
+                    "earned_usd": float(earned),
+                    "finalized": True,
+                    "usdRewardPerHour": float(job.get("usdRewardPerHour", 0.0) or 0.0),
+                    "last_seen": datetime.now(timezone.utc).isoformat(),
+                })
+                self._add(prev)
+                if bench:
+                    prev["benchmark"] = bench
+                changed = True
+            else:
+                # If benchmark exists and not stored yet, backfill
+                if bench and not prev.get("benchmark"):
+                    prev["benchmark"] = bench
+                    prev["last_seen"] = datetime.now(timezone.utc).isoformat()
+                    changed = True
+
+                # If the fresh job reports a longer timeout than stored (e.g., timeout extended),
+                # persist the extension immediately so sensors reflect the latest timeout.
+                try:
+                    incoming_timeout = int(job.get("timeout", 0) or 0)
+                    stored_timeout = int(prev.get("timeout", 0) or 0)
+                    if incoming_timeout > stored_timeout:
+                        prev["timeout"] = int(incoming_timeout)
+                        prev["last_seen"] = datetime.now(timezone.utc).isoformat()
+                        changed = True
+                        _LOGGER.debug(
+                            "Extended timeout for job %s from %s to %s (persisted)",
+                            jid,
+                            stored_timeout,
+                            incoming_timeout,
+                        )
+                except Exception:
+                    pass
+
+        if changed:
+            self.dirty = True
+            self._views_valid = False
+        return changed, bench
@@ -0,0 +1,263 @@
+# custom_components/nosana_node/market_account.py
+"""Nosana market account helpers (base58, account data, queue lookup).
+
+Market accounts with the known Anchor layout are decoded directly; a
+heuristic `Vec<Pubkey>` scan remains as fallback for unknown layout versions.
+
+Pure functions with no Home Assistant dependency so they can be imported and
+benchmarked on their own. NumPy is optional (it is not a requirement of the
+integration): when it is importable the queue scan is vectorized, otherwise a
+pure-Python path over the same algorithm is used.
+"""
+import functools
+import hashlib
+import struct
+from typing import NamedTuple, Optional, Tuple
+
+try:
+    import numpy as np
+except ImportError:  # optional; the pure-Python scan is the fallback
+    np = None
+
+
+# --- minimal base58 encoding (pure python) ---
+_B58_ALPHABET = "123456789ABCDEFGHJKLMNPQRSTUVWXYZabcdefghijkmnopqrstuvwxyz"
+_B58_INDEX = {c: i for i, c in enumerate(_B58_ALPHABET)}
+
+
+def _b58encode(data: bytes) -> str:
+    """Encode bytes to base58 (pure Python)."""
+    num = int.from_bytes(data, "big")
+    if num == 0:
+        # preserve leading zeros count
+        n_pad = len(data) - len(data.lstrip(b"\0"))
+        return _B58_ALPHABET[0] * n_pad
+    enc = []
+    while num > 0:
+        num, rem = divmod(num, 58)
+        enc.append(_B58_ALPHABET[rem])
+    # leading zero bytes -> '1'
+    n_pad = len(data) - len(data.lstrip(b"\0"))
+    return _B58_ALPHABET[0] * n_pad + "".join(reversed(enc))
+
+
+def _b58decode(data: str) -> bytes:
+    """Decode a base58 string to bytes (pure Python). Raises ValueError on bad input."""
+    num = 0
+    for ch in data:
+        try:
+            num = num * 58 + _B58_INDEX[ch]
+        except KeyError:
+            raise ValueError(f"invalid base58 character {ch!r}") from None
+    # leading '1' -> zero bytes
+    n_pad = len(data) - len(data.lstrip(_B58_ALPHABET[0]))
+    body = num.to_bytes((num.bit_length() + 7) // 8, "big") if num else b""
+    return b"\0" * n_pad + body
+
+
+def _decode_account_data(raw) -> Optional[bytes]:
+    """Decode account data shapes returned by Solana RPC into raw bytes."""
+    if raw is None:
+        return None
+    # common RPC shape: [base64_string, "base64"]
+    if isinstance(raw, (list, tuple)) and len(raw) >= 1 and isinstance(raw[0], str):
+        import base64
+
+        return base64.b64decode(raw[0])
+    if isinstance(raw, (bytes, bytearray)):
+        return bytes(raw)
+    return None
+
+
+def _find_pubkey_in_vecs(raw: bytes, key: bytes) -> Optional[Tuple[int, int]]:
+    """Return (position, total) of key in the longest plausible Vec<Pubkey> holding it.
+
+    A borsh vec is a u32 little-endian length followed by its items. Instead of
+    trying every byte offset as a length prefix, the scan is anchored on the
+    occurrences of the 32-byte key: a vec that contains the key at byte p must start at s = p - 4 - 32*k for
+    some item index k, with a u32 length > k whose items fit in the blob. Those
+    length prefixes are read in one strided (NumPy) pass per occurrence and no
+    per-item objects are created.
+    """
+    if len(key) != 32 or not raw:
+        return None
+    if not isinstance(raw, bytes):
+        raw = bytes(raw)
+    n = len(raw)
+    lmax = (n // 32) + 1
+    # best = (length, start, position); larger length wins, then smaller start
+    best: Optional[Tuple[int, int, int]] = None
+    p = raw.find(key)
+    while p != -1:
+        if p >= 4:
+            k_max = (p - 4) // 32
+            r = (p - 4) - 32 * k_max
+            if np is not None:
+                lengths = np.ndarray((k_max + 1,), dtype="<u4", buffer=raw, offset=r, strides=(32,)).astype(np.int64)
+                starts = r + 32 * np.arange(k_max + 1, dtype=np.int64)
+                ks = k_max - np.arange(k_max + 1, dtype=np.int64)
+                valid = (
+                    (lengths > ks)
+                    & (lengths <= lmax)
+                    & (starts + 4 + lengths * 32 <= n)
+                    & (starts < n - 4)
+                )
+                if valid.any():
+                    idx = np.flatnonzero(valid)
+                    vl = lengths[idx]
+                    # longest vec; ties go to the smallest start (first in scan order)
+                    j = idx[np.flatnonzero(vl == vl.max())[0]]
+                    cand = (int(lengths[j]), int(starts[j]), int(ks[j]) + 1)
+                    if best is None or cand[0] > best[0] or (cand[0] == best[0] and cand[1] < best[1]):
+                        best = cand
+            else:
+                for k in range(k_max + 1):
+                    s = p - 4 - 32 * k
+                    length = struct.unpack_from("<I", raw, s)[0]
+                    if length <= k or length > lmax or s + 4 + length * 32 > n or s >= n - 4:
+                        continue
+                    if best is None or length > best[0] or (length == best[0] and s < best[1]):
+                        best = (length, s, k + 1)
+        p = raw.find(key, p + 1)
+    if best is None:
+        return None
+    return best[2], best[0]
+
+
+# --- Nosana market account layout (nosana-jobs program, Anchor) ---
+# Anchor account discriminator: first 8 bytes of sha256("account:MarketAccount")
+MARKET_ACCOUNT_DISCRIMINATOR = hashlib.sha256(b"account:MarketAccount").digest()[:8]
+# MarketAccount fields after the discriminator:
+#   authority Pubkey, job_expiration i64, job_price u64, job_timeout i64, job_type u8,
+#   vault Pubkey, vault_bump u8, node_access_key Pubkey, node_xnos_minimum u128,
+#   queue_type u8, queue Vec<Pubkey>
+MARKET_QUEUE_TYPE_OFFSET = 8 + 32 + 8 + 8 + 8 + 1 + 32 + 1 + 32 + 16
+MARKET_QUEUE_OFFSET = MARKET_QUEUE_TYPE_OFFSET + 1
+# capacity the program allocates for the queue vec
+MARKET_QUEUE_CAPACITY = 314
+
+QUEUE_TYPE_JOB = 0
+QUEUE_TYPE_NODE = 1
+# QueueType::Unknown: set by the program once the queue has been emptied
+QUEUE_TYPE_EMPTY = 255
+_QUEUE_TYPES = (QUEUE_TYPE_JOB, QUEUE_TYPE_NODE, QUEUE_TYPE_EMPTY)
+
+
+class MarketQueue(NamedTuple):
+    """Location of the queue vec inside a decoded market account."""
+
+    queue_type: int
+    length: int
+    # byte offset of the first queued pubkey
+    items_offset: int
+
+
+def _decode_market_queue(raw: bytes) -> Optional[MarketQueue]:
+    """Decode the queue header of a MarketAccount; None if the layout is unknown."""
+    if not raw or len(raw) < MARKET_QUEUE_OFFSET + 4:
+        return None
+    if raw[:8] != MARKET_ACCOUNT_DISCRIMINATOR:
+        return None
+    queue_type = raw[MARKET_QUEUE_TYPE_OFFSET]
+    if queue_type not in _QUEUE_TYPES:
+        return None
+    items_offset = MARKET_QUEUE_OFFSET + 4
+    if queue_type == QUEUE_TYPE_EMPTY:
+        return MarketQueue(queue_type, 0, items_offset)
+    length = struct.unpack_from("<I", raw, MARKET_QUEUE_OFFSET)[0]
+    if items_offset + length * 32 > len(raw):
+        return None
+    return MarketQueue(queue_type, length, items_offset)
+
+
+def _find_pubkey_aligned(raw: bytes, key: bytes, start: int, count: int) -> Optional[int]:
+    """Return the 0-based index of key among count 32-byte items at start, else None.
+
+    Uses `bytes.find` over the region and only accepts 32-byte-aligned hits.
+    """
+    end = start + count * 32
+    p = raw.find(key, start, end)
+    while p != -1:
+        offset = p - start
+        if offset % 32 == 0:
+            return offset // 32
+        # next aligned slot after this unaligned hit
+        p = raw.find(key, start + (offset // 32 + 1) * 32, end)
+    return None
+
+
+@functools.lru_cache(maxsize=256)
+def _node_key(node_addr_b58: str) -> Optional[bytes]:
+    """Decode a node address to its 32 raw pubkey bytes once (None if invalid)."""
+    try:
+        key = _b58decode(node_addr_b58)
+    except ValueError:
+        return None
+    return key if len(key) == 32 else None
+
+
+def _get_queue_position(market_raw: bytes, node_key: bytes) -> Optional[Tuple[int, int]]:
+    """Return (position, total) if node_key (32 raw bytes) is in the market queue, else None.
+
+    Known MarketAccount layouts are decoded directly: the queue vec is read at
+    its fixed offset and only that region is searched with `bytes.find` at
+    32-byte-aligned slots, in O(queue). Unknown layouts fall back to the
+    heuristic scan, preferring the longest plausible vec. No base58 work
+    happens here.
+    """
+    if not node_key or len(node_key) != 32 or not market_raw:
+        return None
+    if not isinstance(market_raw, bytes):
+        market_raw = bytes(market_raw)
+    queue = _decode_market_queue(market_raw)
+    if queue is None:
+        return _find_pubkey_in_vecs(market_raw, node_key)
+    if queue.queue_type != QUEUE_TYPE_NODE:
+        # the market is queueing jobs, so no node is waiting
+        return None
+    idx = _find_pubkey_aligned(market_raw, node_key, queue.items_offset, queue.length)
+    if idx is None:
+        return None
+    return idx + 1, queue.length
+
+
+def _get_queue_position_from_market_raw(market_raw: bytes, node_addr_b58: str) -> Optional[Tuple[int, int]]:
+    """Return (position, total) if node found in the market queue, else None.
+
+    Convenience wrapper over `_get_queue_position`; the address decode is cached.
+    """
+    key = _node_key(node_addr_b58)
+    if key is None:
+        return None
+    return _get_queue_position(market_raw, key)
+
+
+# RPC dataSlice covering only the queue region: queue_type u8 + vec len u32 + items
+MARKET_QUEUE_SLICE_OFFSET = MARKET_QUEUE_TYPE_OFFSET
+MARKET_QUEUE_SLICE_LENGTH = 1 + 4 + 32 * MARKET_QUEUE_CAPACITY
+
+
+def _decode_queue_slice(data: bytes) -> Optional[MarketQueue]:
+    """Decode the queue header of a `dataSlice` starting at MARKET_QUEUE_SLICE_OFFSET."""
+    if not data or len(data) < 5:
+        return None
+    queue_type = data[0]
+    if queue_type not in _QUEUE_TYPES:
+        return None
+    if queue_type == QUEUE_TYPE_EMPTY:
+        return MarketQueue(queue_type, 0, 5)
+    length = struct.unpack_from("<I", data, 1)[0]
+    if length > MARKET_QUEUE_CAPACITY or 5 + length * 32 > len(data):
+        return None
+    return MarketQueue(queue_type, length, 5)
+
+
+def _get_queue_position_from_slice(data: bytes, node_key: bytes) -> Optional[Tuple[Optional[int], MarketQueue]]:
+    """Return (position or None, queue) for node_key in a queue slice; None if undecodable."""
+    queue = _decode_queue_slice(data)
+    if queue is None:
+        return None
+    if queue.queue_type != QUEUE_TYPE_NODE or not node_key or len(node_key) != 32:
+        return None, queue
+    idx = _find_pubkey_aligned(data, node_key, queue.items_offset, queue.length)
+    return (idx + 1 if idx is not None else None), queue
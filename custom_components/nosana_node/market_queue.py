@@ -0,0 +1,230 @@
+# custom_components/nosana_node/market_queue.py
+"""Market queue data over Solana RPC for Nosana Node integration.
+
+One service per RPC endpoint is stored in `hass.data[DOMAIN][DATA_MARKET_QUEUES]`.
+Coordinators register the market their node belongs to; on expiry the service
+fetches every registered market in a single `getMultipleAccounts` call with a
+`dataSlice` covering only the queue region (queue type + queue vec), so the
+cost is one RPC call per market per TTL no matter how many nodes share it.
+In push mode (see market_stream.py) markets with a live websocket subscription
+are left out of the poll and updated when their account changes.
+"""
+import asyncio
+import logging
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import async_timeout
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.aiohttp_client import async_get_clientsession
+
+from .const import DOMAIN, DATA_MARKET_QUEUES
+from .instrumentation import EndpointStats
+from .market_account import MARKET_QUEUE_SLICE_LENGTH, MARKET_QUEUE_SLICE_OFFSET, _decode_account_data
+from .market_stream import NosanaMarketStream, ws_url_for
+from .ratelimit import get_rate_limiter
+
+_LOGGER = logging.getLogger(__name__)
+
+# getMultipleAccounts accepts at most 100 keys per call
+_RPC_MAX_ACCOUNTS = 100
+
+
+class NosanaMarketQueueService:
+    """Shared, batched cache of market queue slices fetched over Solana RPC."""
+
+    def __init__(self, hass: HomeAssistant, rpc_url: str, ttl_seconds: int = 30, timeout: float = 10):
+        """Initialize the service."""
+        self._hass = hass
+        self.session = async_get_clientsession(hass)
+        self._limiter = get_rate_limiter(hass)
+        self.rpc_url = rpc_url
+        self.ttl_seconds = ttl_seconds
+        self.timeout = timeout
+
+        # market address -> number of registered coordinators
+        self._markets: Dict[str, int] = {}
+        # market address -> queue slice bytes (None if the account was missing)
+        self._slices: Dict[str, Optional[bytes]] = {}
+        self._last_fetch: Optional[datetime] = None
+        self.last_success: Optional[datetime] = None
+        self.last_fetch_ok = True
+        self._inflight: Optional[asyncio.Task] = None
+        # push mode: websocket feed shared by all coordinators that enabled it
+        self._stream: Optional[NosanaMarketStream] = None
+        self._push_listeners: List[Callable[[str], None]] = []
+        # request counters of the getMultipleAccounts calls
+        self.stats = EndpointStats()
+
+    @property
+    def markets(self) -> List[str]:
+        """Return the registered market addresses."""
+        return list(self._markets)
+
+    @callback
+    def register(self, market_address: str) -> Callable[[], None]:
+        """Register interest in a market; returns a callable that unregisters it."""
+        self._markets[market_address] = self._markets.get(market_address, 0) + 1
+        # a new market is fetched on the next request instead of waiting out the TTL
+        if market_address not in self._slices:
+            self._last_fetch = None
+        if self._stream is not None:
+            self._stream.async_markets_changed()
+
+        @callback
+        def _unregister() -> None:
+            count = self._markets.get(market_address, 0) - 1
+            if count > 0:
+                self._markets[market_address] = count
+            else:
+                self._markets.pop(market_address, None)
+                self._slices.pop(market_address, None)
+                if self._stream is not None:
+                    self._stream.async_markets_changed()
+
+        return _unregister
+
+    @callback
+    def async_enable_push(self, listener: Callable[[str], None]) -> Callable[[], None]:
+        """Start (or join) the websocket feed; listener(market) runs when a queue changes.
+
+        Returns a callable that leaves the feed; the socket closes with its last listener.
+        """
+        self._push_listeners.append(listener)
+        if self._stream is None:
+            self._stream = NosanaMarketStream(self._hass, self, ws_url_for(self.rpc_url))
+        self._stream.async_start()
+
+        @callback
+        def _disable() -> None:
+            if listener in self._push_listeners:
+                self._push_listeners.remove(listener)
+            if not self._push_listeners and self._stream is not None:
+                self._stream.async_stop()
+                self._stream = None
+
+        return _disable
+
+    @callback
+    def async_push_slice(self, market_address: str, data: Optional[bytes]) -> None:
+        """Store a pushed queue slice; notify listeners only if the queue bytes changed."""
+        if market_address not in self._markets:
+            return
+        if market_address in self._slices and self._slices[market_address] == data:
+            return
+        self._slices[market_address] = data
+        self.last_success = datetime.utcnow()
+        for listener in list(self._push_listeners):
+            listener(market_address)
+
+    @callback
+    def async_expire(self) -> None:
+        """Poll on the next request (e.g. after the websocket dropped)."""
+        self._last_fetch = None
+
+    def _poll_markets(self) -> List[str]:
+        """Registered markets not kept fresh by the push feed (polled with getMultipleAccounts)."""
+        stream = self._stream
+        if stream is None or not stream.connected:
+            return list(self._markets)
+        return [m for m in self._markets if not stream.covers(m)]
+
+    def expired(self, now: Optional[datetime] = None) -> bool:
+        """Return True when the queue slices must be refetched."""
+        if self._last_fetch is None:
+            return True
+        now = now or datetime.utcnow()
+        return (now - self._last_fetch).total_seconds() >= self.ttl_seconds
+
+    def age(self, now: Optional[datetime] = None) -> Optional[float]:
+        """Seconds since the last successful fetch (None if never fetched)."""
+        if self.last_success is None:
+            return None
+        now = now or datetime.utcnow()
+        return round((now - self.last_success).total_seconds(), 1)
+
+    def get_slice(self, market_address: str) -> Optional[bytes]:
+        """Return the cached queue slice of a market (None if unknown)."""
+        return self._slices.get(market_address)
+
+    async def async_refresh(self) -> None:
+        """Refetch all registered markets in one batch when expired (single-flight)."""
+        # loops again when a market was registered while a batch was already in flight
+        while self.expired() and self._poll_markets():
+            if self._inflight is None:
+                self._inflight = self._hass.async_create_task(self._async_fetch())
+            # Shield the shared fetch so one caller's timeout doesn't cancel it for the others
+            await asyncio.shield(self._inflight)
+
+    async def async_get_slice(self, market_address: str) -> Optional[bytes]:
+        """Return the queue slice of a registered market, refetching all markets once when expired."""
+        await self.async_refresh()
+        return self._slices.get(market_address)
+
+    def _request_body(self, addresses: List[str]) -> Dict[str, Any]:
+        return {
+            "jsonrpc": "2.0",
+            "id": 1,
+            "method": "getMultipleAccounts",
+            "params": [
+                addresses,
+                {
+                    "encoding": "base64",
+                    "commitment": "confirmed",
+                    "dataSlice": {"offset": MARKET_QUEUE_SLICE_OFFSET, "length": MARKET_QUEUE_SLICE_LENGTH},
+                },
+            ],
+        }
+
+    async def _async_fetch_batch(self, addresses: List[str]) -> List[Tuple[str, Optional[bytes]]]:
+        """Fetch one getMultipleAccounts batch; raises on transport/RPC errors."""
+        resp = await self._limiter.async_request(
+            self.session, "post", self.rpc_url, stats=self.stats, json=self._request_body(addresses)
+        )
+        if resp.status != 200:
+            raise RuntimeError(f"RPC returned status {resp.status}")
+        body = await resp.json()
+        if not isinstance(body, dict) or "error" in body:
+            raise RuntimeError(f"RPC error: {body.get('error') if isinstance(body, dict) else body}")
+        value = (body.get("result") or {}).get("value")
+        if not isinstance(value, list) or len(value) != len(addresses):
+            raise RuntimeError("Unexpected getMultipleAccounts response shape")
+        out: List[Tuple[str, Optional[bytes]]] = []
+        for addr, account in zip(addresses, value):
+            data = _decode_account_data(account.get("data")) if isinstance(account, dict) else None
+            out.append((addr, data))
+        return out
+
+    async def _async_fetch(self) -> None:
+        """Fetch the queue slices of all registered markets."""
+        now = datetime.utcnow()
+        addresses = self._poll_markets()
+        try:
+            async with async_timeout.timeout(self.timeout):
+                for i in range(0, len(addresses), _RPC_MAX_ACCOUNTS):
+                    for addr, data in await self._async_fetch_batch(addresses[i : i + _RPC_MAX_ACCOUNTS]):
+                        self._slices[addr] = data
+            self.last_success = datetime.utcnow()
+            self.last_fetch_ok = True
+            if self._stream is not None:
+                self._stream.async_mark_polled(addresses)
+        except Exception as e:
+            _LOGGER.warning("Failed to fetch market queues from %s: %s", self.rpc_url, e)
+            self.last_fetch_ok = False
+        finally:
+            # markets registered during the fetch keep the cache expired
+            if set(self._poll_markets()) <= set(addresses):
+                self._last_fetch = now
+            else:
+                self._last_fetch = None
+            self._inflight = None
+
+
+def get_market_queue_service(hass: HomeAssistant, rpc_url: str) -> NosanaMarketQueueService:
+    """Return the shared market queue service for rpc_url, creating it on first use."""
+    services = hass.data.setdefault(DOMAIN, {}).setdefault(DATA_MARKET_QUEUES, {})
+    service = services.get(rpc_url)
+    if service is None:
+        service = NosanaMarketQueueService(hass, rpc_url)
+        services[rpc_url] = service
+    return service
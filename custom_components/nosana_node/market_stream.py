@@ -0,0 +1,208 @@
+# custom_components/nosana_node/market_stream.py
+"""Websocket push feed for market queues of Nosana Node integration.
+
+Optional push mode: one websocket per RPC endpoint subscribes to every market
+registered with the queue service via Solana's `accountSubscribe`. Updates are
+decoded with `_decode_account_data`, cut down to the queue region and handed to
+the service, which notifies coordinators only when the queue bytes changed.
+While the socket is down (or a market has no subscription yet) the service
+keeps polling those markets with `getMultipleAccounts`, so push mode never
+leaves a node without queue data.
+"""
+import asyncio
+import logging
+from typing import TYPE_CHECKING, Any, Dict, Iterable, Optional, Set
+
+from aiohttp import WSMsgType
+from homeassistant.core import HomeAssistant, callback
+
+from .market_account import (
+    MARKET_ACCOUNT_DISCRIMINATOR,
+    MARKET_QUEUE_SLICE_LENGTH,
+    MARKET_QUEUE_SLICE_OFFSET,
+    _decode_account_data,
+)
+
+if TYPE_CHECKING:
+    from .market_queue import NosanaMarketQueueService
+
+_LOGGER = logging.getLogger(__name__)
+
+
+def ws_url_for(rpc_url: str) -> str:
+    """Return the websocket URL of an HTTP(S) JSON-RPC endpoint."""
+    if rpc_url.startswith("https://"):
+        return "wss://" + rpc_url[len("https://"):]
+    if rpc_url.startswith("http://"):
+        return "ws://" + rpc_url[len("http://"):]
+    return rpc_url
+
+
+def _queue_slice_from_account(data: Optional[bytes]) -> Optional[bytes]:
+    """Cut a full MarketAccount down to the bytes `getMultipleAccounts` would return."""
+    if not data or data[:8] != MARKET_ACCOUNT_DISCRIMINATOR or len(data) <= MARKET_QUEUE_SLICE_OFFSET:
+        return None
+    return data[MARKET_QUEUE_SLICE_OFFSET : MARKET_QUEUE_SLICE_OFFSET + MARKET_QUEUE_SLICE_LENGTH]
+
+
+class NosanaMarketStream:
+    """accountSubscribe feed for the markets of one queue service."""
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        service: "NosanaMarketQueueService",
+        ws_url: str,
+        reconnect_min: float = 5.0,
+        reconnect_max: float = 300.0,
+    ):
+        """Initialize the stream."""
+        self._hass = hass
+        self._service = service
+        self.ws_url = ws_url
+        self.reconnect_min = reconnect_min
+        self.reconnect_max = reconnect_max
+        self._task: Optional[asyncio.Task] = None
+        self._ws = None
+        self._next_id = 1
+        # request id -> market address of subscriptions awaiting confirmation
+        self._pending: Dict[int, str] = {}
+        # market address -> subscription id, and the reverse
+        self._subs: Dict[str, int] = {}
+        self._markets_by_sub: Dict[int, str] = {}
+        # subscribed markets polled at least once since their subscription was confirmed
+        self._synced: Set[str] = set()
+        self.notifications = 0
+        self.reconnects = 0
+
+    @property
+    def connected(self) -> bool:
+        """Return True while the websocket is open."""
+        return self._ws is not None and not self._ws.closed
+
+    def covers(self, market_address: str) -> bool:
+        """Return True when market updates arrive by push.
+
+        A subscription only reports later changes, so a market counts once it
+        has been polled after its subscription was confirmed.
+        """
+        return self.connected and market_address in self._synced
+
+    @callback
+    def async_mark_polled(self, markets: Iterable[str]) -> None:
+        """Record markets whose queue was just polled; subscribed ones switch to push."""
+        self._synced.update(m for m in markets if m in self._subs)
+
+    @callback
+    def async_start(self) -> None:
+        """Start the feed in the background unless it is running."""
+        if self._task is not None and not self._task.done():
+            return
+        self._task = self._hass.async_create_background_task(
+            self._async_run(), f"nosana_node market stream {self.ws_url}"
+        )
+
+    @callback
+    def async_stop(self) -> None:
+        """Stop the feed; the service falls back to polling."""
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+    @callback
+    def async_markets_changed(self) -> None:
+        """Subscribe/unsubscribe after the set of registered markets changed."""
+        if self.connected:
+            self._hass.async_create_task(self._async_sync_subscriptions())
+
+    async def _async_send(self, method: str, params: list) -> int:
+        request_id = self._next_id
+        self._next_id += 1
+        await self._ws.send_json({"jsonrpc": "2.0", "id": request_id, "method": method, "params": params})
+        return request_id
+
+    async def _async_sync_subscriptions(self) -> None:
+        """Bring the subscriptions in line with the registered markets."""
+        if not self.connected:
+            return
+        wanted = set(self._service.markets)
+        pending = set(self._pending.values())
+        for market in wanted - set(self._subs) - pending:
+            request_id = await self._async_send(
+                "accountSubscribe", [market, {"encoding": "base64", "commitment": "confirmed"}]
+            )
+            self._pending[request_id] = market
+        for market in set(self._subs) - wanted:
+            sub_id = self._subs.pop(market)
+            self._markets_by_sub.pop(sub_id, None)
+            self._synced.discard(market)
+            await self._async_send("accountUnsubscribe", [sub_id])
+
+    @callback
+    def _handle_message(self, msg: Any) -> None:
+        """Handle one JSON-RPC message from the socket (anything but an object is ignored)."""
+        if not isinstance(msg, dict):
+            return
+        if msg.get("method") == "accountNotification":
+            params = msg.get("params")
+            if not isinstance(params, dict):
+                return
+            result = params.get("result")
+            market = self._markets_by_sub.get(params.get("subscription"))
+            if market is None:
+                return
+            value = result.get("value") if isinstance(result, dict) else None
+            data = _decode_account_data(value.get("data")) if isinstance(value, dict) else None
+            self.notifications += 1
+            self._service.async_push_slice(market, _queue_slice_from_account(data))
+            return
+        market = self._pending.pop(msg.get("id"), None)
+        if market is None:
+            return
+        sub_id = msg.get("result")
+        if not isinstance(sub_id, int):
+            _LOGGER.debug("accountSubscribe for %s failed: %s", market, msg.get("error"))
+            return
+        if market not in self._service.markets:
+            # unregistered while the subscription was being confirmed
+            self._hass.async_create_task(self._async_send("accountUnsubscribe", [sub_id]))
+            return
+        self._subs[market] = sub_id
+        self._markets_by_sub[sub_id] = market
+        # poll once more to cover changes made before the subscription started
+        self._service.async_expire()
+
+    async def _async_run(self) -> None:
+        """Keep a websocket open, reconnecting with exponential backoff."""
+        delay = self.reconnect_min
+        session = self._service.session
+        while True:
+            try:
+                async with session.ws_connect(self.ws_url, heartbeat=30) as ws:
+                    self._ws = ws
+                    delay = self.reconnect_min
+                    _LOGGER.debug("Market stream connected to %s", self.ws_url)
+                    await self._async_sync_subscriptions()
+                    async for message in ws:
+                        if message.type != WSMsgType.TEXT:
+                            continue
+                        try:
+                            self._handle_message(message.json())
+                        except ValueError:
+                            continue
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                _LOGGER.debug("Market stream %s error: %s", self.ws_url, e)
+            finally:
+                self._ws = None
+                self._pending.clear()
+                self._subs.clear()
+                self._markets_by_sub.clear()
+                self._synced.clear()
+                # poll until the socket is back
+                self._service.async_expire()
+            self.reconnects += 1
+            _LOGGER.debug("Market stream %s dropped; reconnecting in %.0fs", self.ws_url, delay)
+            await asyncio.sleep(delay)
+            delay = min(self.reconnect_max, delay * 2)
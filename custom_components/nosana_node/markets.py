@@ -0,0 +1,196 @@
+# custom_components/nosana_node/markets.py
+"""Fleet-wide markets cache for Nosana Node integration.
+
+Every configured node needs the same `/api/markets` payload, so a single
+service instance is kept in `hass.data[DOMAIN][DATA_MARKETS]` and shared by
+all coordinators. It keeps one TTL clock for everyone and deduplicates
+concurrent cache misses into a single in-flight request.
+"""
+import asyncio
+import logging
+from datetime import datetime
+from typing import Any, Dict, Optional
+
+import async_timeout
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.aiohttp_client import async_get_clientsession
+
+from .conditional import get_conditional_cache
+from .const import DOMAIN, DATA_MARKETS
+from .instrumentation import CacheStats, EndpointStats
+from .ratelimit import get_rate_limiter
+
+_LOGGER = logging.getLogger(__name__)
+
+MARKETS_URL = "https://dashboard.k8s.prd.nos.ci/api/markets"
+
+# key names a market may use for its address, in match priority order
+_ADDRESS_KEYS = ("address", "marketAddress", "market_address", "id")
+
+
+def _normalize_market(m: Dict[str, Any]) -> Dict[str, Any]:
+    """Resolve name/type/slug/reward fields of a raw market dict."""
+    return {
+        # extract a name from common keys
+        "name": m.get("name") or m.get("marketName") or m.get("title"),
+        # market type
+        "type": m.get("type") or m.get("marketType") or m.get("category"),
+        # slug
+        "slug": m.get("slug") or m.get("marketSlug"),
+        # try to extract reward fields using several possible keys
+        "nos_reward_per_second": (
+            m.get("nos_reward_per_second")
+            or m.get("nosRewardPerSecond")
+            or m.get("rewardPerSecond")
+            or m.get("reward_per_second")
+        ),
+        "usd_reward_per_hour": (
+            m.get("usd_reward_per_hour")
+            or m.get("usdRewardPerHour")
+            or m.get("rewardPerHourUsd")
+            or m.get("rewardPerHour")
+            or m.get("reward_per_hour_usd")
+        ),
+    }
+
+
+def _build_market_index(markets: Any) -> Dict[str, Dict[str, Any]]:
+    """Index the markets payload by every address-like key.
+
+    Each market is normalized once. When several markets claim the same address
+    the first one with a name wins, otherwise the last match (same precedence as
+    the former per-tick linear scan).
+    """
+    index: Dict[str, Dict[str, Any]] = {}
+    if not isinstance(markets, list):
+        return index
+    for m in markets:
+        if not isinstance(m, dict):
+            continue
+        normalized = None
+        for key in _ADDRESS_KEYS:
+            addr = m.get(key)
+            if not isinstance(addr, str) or not addr:
+                continue
+            existing = index.get(addr)
+            if existing is not None and existing.get("name"):
+                continue
+            if normalized is None:
+                normalized = _normalize_market(m)
+            index[addr] = {"address": addr, **normalized}
+    return index
+
+
+class NosanaMarketsService:
+    """Shared, single-flight cache of the dashboard markets list."""
+
+    def __init__(self, hass: HomeAssistant, ttl_seconds: int = 300, timeout: float = 15):
+        """Initialize the service."""
+        self._hass = hass
+        self._session = async_get_clientsession(hass)
+        self._limiter = get_rate_limiter(hass)
+        # ETag/Last-Modified validators; a 304 keeps the already-built index
+        self._conditional = get_conditional_cache(hass)
+        self.markets_url = MARKETS_URL
+        # configure how often to refetch markets (seconds)
+        self.ttl_seconds = ttl_seconds
+        self.timeout = timeout
+
+        self._markets: Optional[list] = None
+        # address -> normalized market, rebuilt only when a new payload arrives
+        self._index: Dict[str, Dict[str, Any]] = {}
+        self._last_fetch: Optional[datetime] = None
+        # last fetch that returned a usable payload, and whether the latest attempt did
+        self.last_success: Optional[datetime] = None
+        self.last_fetch_ok = True
+        self._inflight: Optional[asyncio.Task] = None
+        # request counters of the markets endpoint and TTL hit/miss counts
+        self.stats = EndpointStats()
+        self.cache = CacheStats()
+
+    def __len__(self) -> int:
+        """Number of indexed markets."""
+        return len(self._index)
+
+    def expired(self, now: Optional[datetime] = None) -> bool:
+        """Return True when the cached list must be refetched."""
+        if self._markets is None or self._last_fetch is None:
+            return True
+        now = now or datetime.utcnow()
+        return (now - self._last_fetch).total_seconds() >= self.ttl_seconds
+
+    def age(self, now: Optional[datetime] = None) -> Optional[float]:
+        """Seconds since the last successful fetch (None if never fetched)."""
+        if self.last_success is None:
+            return None
+        now = now or datetime.utcnow()
+        return round((now - self.last_success).total_seconds(), 1)
+
+    async def async_get_markets(self) -> list:
+        """Return the markets list, refetching it once for all callers when expired."""
+        if not self.expired():
+            self.cache.record(True)
+            return self._markets or []
+        self.cache.record(False)
+        if self._inflight is None:
+            self._inflight = self._hass.async_create_task(self._async_fetch())
+        # Shield the shared fetch so one caller's timeout doesn't cancel it for the others
+        return await asyncio.shield(self._inflight)
+
+    def get_market(self, market_address: Optional[str]) -> Dict[str, Any]:
+        """Return the normalized market for market_address (O(1) lookup).
+
+        The returned dict is shared by every node on that market; treat it as read-only.
+        """
+        if market_address:
+            market = self._index.get(market_address)
+            if market is not None:
+                return market
+        return {
+            "address": market_address,
+            "name": None,
+            "type": None,
+            "nos_reward_per_second": None,
+            "usd_reward_per_hour": None,
+        }
+
+    async def _async_fetch(self) -> list:
+        """Fetch the markets list; keep serving the previous list on failure."""
+        now = datetime.utcnow()
+        try:
+            async with async_timeout.timeout(self.timeout):
+                status, markets = await self._conditional.async_get_json(
+                    self._session, self._limiter, self.markets_url, stats=self.stats
+                )
+                # any response restarts the TTL clock so a non-200 isn't retried every tick
+                self._last_fetch = now
+                if status == 304 and self._markets is not None:
+                    # unchanged: reuse the parsed list and its index as-is
+                    self.last_success = datetime.utcnow()
+                    self.last_fetch_ok = True
+                elif status in (200, 304):
+                    self._markets = markets if isinstance(markets, list) else []
+                    self._index = _build_market_index(self._markets)
+                    self.last_success = datetime.utcnow()
+                    self.last_fetch_ok = True
+                else:
+                    _LOGGER.debug("Markets endpoint returned status %s", status)
+                    if self._markets is None:
+                        self._markets = []
+                    self.last_fetch_ok = False
+        except Exception:
+            _LOGGER.warning("Failed to fetch markets from %s", self.markets_url)
+            self.last_fetch_ok = False
+        finally:
+            self._inflight = None
+        return self._markets or []
+
+
+def get_markets_service(hass: HomeAssistant) -> NosanaMarketsService:
+    """Return the shared markets service, creating it on first use."""
+    domain_data = hass.data.setdefault(DOMAIN, {})
+    service = domain_data.get(DATA_MARKETS)
+    if service is None:
+        service = NosanaMarketsService(hass)
+        domain_data[DATA_MARKETS] = service
+    return service
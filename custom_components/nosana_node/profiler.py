@@ -0,0 +1,221 @@
+# custom_components/nosana_node/profiler.py
+"""Refresh profiling for Nosana Node integration.
+
+The `nosana_node.profile_refresh` service runs the next refreshes of one
+coordinator under a profiler, without restarting Home Assistant. A profiler
+has a single clock, so the wall-clock view and the CPU view (CPU time of the
+event loop thread) come from two consecutive windows of `refreshes` refreshes
+each. Each window writes a `.prof` file (load it with `pstats` or snakeviz) and
+a `.txt` report to the config directory. The report has the rows and callees of
+`_async_update_data` and `_async_update_jobs_and_earnings`, followed by the top
+functions of the loop thread.
+
+With cProfile (the default) every resumption of a coroutine counts as a call,
+so the time of the refresh methods is time spent running on the loop, not time
+spent awaiting. The profile covers the whole loop thread while a refresh is in
+flight, including other tasks that ran in between. yappi (optional, not a
+requirement of the integration) is coroutine-aware: its wall view of a
+coroutine includes the time it spent suspended.
+"""
+import cProfile
+import io
+import logging
+import pstats
+import time
+from pathlib import Path
+from typing import Any, Callable, Optional
+
+import voluptuous as vol
+
+from homeassistant.core import HomeAssistant, ServiceCall, callback
+from homeassistant.exceptions import HomeAssistantError
+import homeassistant.helpers.config_validation as cv
+from homeassistant.util import dt as dt_util
+
+from .const import DOMAIN, DATA_PROFILER, DEFAULT_PROFILE_REFRESHES, SERVICE_PROFILE_REFRESH
+from .coordinator import NosanaNodeCoordinator
+
+try:
+    import yappi
+except ImportError:  # optional profiler, not a requirement of the integration
+    yappi = None
+
+_LOGGER = logging.getLogger(__name__)
+
+ATTR_CONFIG_ENTRY_ID = "config_entry_id"
+ATTR_REFRESHES = "refreshes"
+ATTR_BACKEND = "backend"
+
+BACKEND_CPROFILE = "cprofile"
+BACKEND_YAPPI = "yappi"
+
+# profiled windows, in order
+CLOCKS = ("wall", "cpu")
+_CPROFILE_TIMERS = {"wall": time.perf_counter, "cpu": time.thread_time}
+
+PROFILED_METHODS = ("_async_update_data", "_async_update_jobs_and_earnings")
+# rows of the loop-thread section of the report
+REPORT_TOP = 40
+
+PROFILE_REFRESH_SCHEMA = vol.Schema(
+    {
+        vol.Required(ATTR_CONFIG_ENTRY_ID): cv.string,
+        vol.Optional(ATTR_REFRESHES, default=DEFAULT_PROFILE_REFRESHES): vol.All(
+            vol.Coerce(int), vol.Range(min=1, max=100)
+        ),
+        vol.Optional(ATTR_BACKEND, default=BACKEND_CPROFILE): vol.In((BACKEND_CPROFILE, BACKEND_YAPPI)),
+    }
+)
+
+
+def _write_report(prof_path: str, report_path: str, clock: str) -> None:
+    """Write the text report of a saved profile."""
+    stream = io.StringIO()
+    stats = pstats.Stats(prof_path, stream=stream)
+    stats.sort_stats(pstats.SortKey.CUMULATIVE)
+    for name in PROFILED_METHODS:
+        stream.write(f"==== {name} ({clock}) ====\n")
+        stats.print_stats(rf"\({name}\)")
+        stats.print_callees(rf"\({name}\)")
+    stream.write(f"==== event loop thread, top {REPORT_TOP} ({clock}) ====\n")
+    stats.print_stats(REPORT_TOP)
+    Path(report_path).write_text(stream.getvalue())
+
+
+def _dump_cprofile(profile: cProfile.Profile, prof_path: str, report_path: str, clock: str) -> None:
+    profile.dump_stats(prof_path)
+    _write_report(prof_path, report_path, clock)
+
+
+def _dump_yappi(stats: Any, prof_path: str, report_path: str, clock: str) -> None:
+    stats.save(prof_path, type="pstat")
+    _write_report(prof_path, report_path, clock)
+
+
+class RefreshProfiler:
+    """Profiles the next refreshes of one coordinator, one window per clock."""
+
+    def __init__(self, hass: HomeAssistant, coordinator: NosanaNodeCoordinator, refreshes: int, backend: str):
+        """Initialize the profiler."""
+        self._hass = hass
+        self._coordinator = coordinator
+        self.refreshes = refreshes
+        self.backend = backend
+        stamp = dt_util.utcnow().strftime("%Y%m%dT%H%M%SZ")
+        self.prefix = f"{DOMAIN}_profile_{coordinator.node_address[:8]}_{stamp}"
+        self.profiled = 0
+        self._profile: Optional[cProfile.Profile] = None
+
+    @property
+    def clock(self) -> str:
+        return CLOCKS[min(self.profiled // self.refreshes, len(CLOCKS) - 1)]
+
+    @callback
+    def async_start(self) -> None:
+        """Wrap the coordinator's refresh until both windows are profiled."""
+        update = self._coordinator._async_update_data
+
+        async def _async_profiled_update():
+            if self.profiled >= self.refreshes * len(CLOCKS) or not self._enable():
+                return await update()
+            try:
+                return await update()
+            finally:
+                self._disable()
+
+        self._coordinator._async_update_data = _async_profiled_update
+        _LOGGER.info(
+            "Profiling the next %d refreshes of %s per clock (%s)",
+            self.refreshes,
+            self._coordinator.node_address,
+            self.backend,
+        )
+
+    @callback
+    def async_cancel(self) -> None:
+        """Restore the coordinator's refresh and drop the session."""
+        vars(self._coordinator).pop("_async_update_data", None)
+        if self._hass.data.get(DOMAIN, {}).get(DATA_PROFILER) is self:
+            del self._hass.data[DOMAIN][DATA_PROFILER]
+
+    def _enable(self) -> bool:
+        clock = self.clock
+        try:
+            if self.backend == BACKEND_YAPPI:
+                if self.profiled % self.refreshes == 0:
+                    yappi.clear_stats()
+                    yappi.set_clock_type(clock)
+                yappi.start(builtins=False, profile_threads=False)
+            else:
+                if self._profile is None:
+                    self._profile = cProfile.Profile(_CPROFILE_TIMERS[clock])
+                self._profile.enable()
+        except ValueError as err:
+            # another profiler (e.g. the profiler integration) holds the interpreter hook
+            _LOGGER.warning("Refresh of %s not profiled: %s", self._coordinator.node_address, err)
+            return False
+        return True
+
+    def _disable(self) -> None:
+        if self.backend == BACKEND_YAPPI:
+            yappi.stop()
+        else:
+            self._profile.disable()
+        clock = self.clock
+        self.profiled += 1
+        if self.profiled % self.refreshes:
+            return
+        prof_path = self._hass.config.path(f"{self.prefix}_{clock}.prof")
+        report_path = self._hass.config.path(f"{self.prefix}_{clock}.txt")
+        if self.backend == BACKEND_YAPPI:
+            args: tuple = (_dump_yappi, yappi.get_func_stats(), prof_path, report_path, clock)
+            yappi.clear_stats()
+        else:
+            args = (_dump_cprofile, self._profile, prof_path, report_path, clock)
+            self._profile = None
+        self._hass.async_create_task(self._async_write(*args))
+        if self.profiled >= self.refreshes * len(CLOCKS):
+            self.async_cancel()
+
+    async def _async_write(self, dump: Callable[..., None], stats: Any, prof_path: str, report_path: str, clock: str) -> None:
+        try:
+            await self._hass.async_add_executor_job(dump, stats, prof_path, report_path, clock)
+        except OSError as err:
+            _LOGGER.error("Could not write refresh profile %s: %s", prof_path, err)
+            return
+        _LOGGER.info("Wrote %s refresh profile of %s to %s", clock, self._coordinator.node_address, report_path)
+
+
+@callback
+def async_register_services(hass: HomeAssistant) -> None:
+    """Register the profile_refresh service (once for all entries)."""
+    if hass.services.has_service(DOMAIN, SERVICE_PROFILE_REFRESH):
+        return
+
+    async def _async_profile_refresh(call: ServiceCall) -> None:
+        domain_data = hass.data.setdefault(DOMAIN, {})
+        coordinator = domain_data.get(call.data[ATTR_CONFIG_ENTRY_ID])
+        if not isinstance(coordinator, NosanaNodeCoordinator):
+            raise HomeAssistantError(f"No loaded Nosana Node entry {call.data[ATTR_CONFIG_ENTRY_ID]}")
+        if call.data[ATTR_BACKEND] == BACKEND_YAPPI and yappi is None:
+            raise HomeAssistantError("The yappi backend needs the yappi package installed")
+        if domain_data.get(DATA_PROFILER) is not None:
+            raise HomeAssistantError("A refresh profile is already running")
+        profiler = RefreshProfiler(hass, coordinator, call.data[ATTR_REFRESHES], call.data[ATTR_BACKEND])
+        domain_data[DATA_PROFILER] = profiler
+        profiler.async_start()
+
+    hass.services.async_register(
+        DOMAIN, SERVICE_PROFILE_REFRESH, _async_profile_refresh, schema=PROFILE_REFRESH_SCHEMA
+    )
+
+
+@callback
+def async_unload_services(hass: HomeAssistant, coordinator: NosanaNodeCoordinator) -> None:
+    """Stop profiling an unloaded node; remove the service with the last entry."""
+    domain_data = hass.data.get(DOMAIN, {})
+    profiler = domain_data.get(DATA_PROFILER)
+    if profiler is not None and profiler._coordinator is coordinator:
+        profiler.async_cancel()
+    if not any(isinstance(value, NosanaNodeCoordinator) for value in domain_data.values()):
+        hass.services.async_remove(DOMAIN, SERVICE_PROFILE_REFRESH)
@@ -0,0 +1,253 @@
+# custom_components/nosana_node/ratelimit.py
+"""Per-host rate limiting for Nosana Node integration.
+
+All coordinators share one limiter (stored in `hass.data[DOMAIN][DATA_RATE_LIMITER]`)
+holding a token bucket per upstream host, i.e. `dashboard.k8s.prd.nos.ci` and each
+per-node `*.node.k8s.prd.nos.ci` subdomain. Requests are classed by priority:
+
+- PRIORITY_STATUS (regular polling) may use the whole bucket and fails fast with
+  `RateLimited` while the host is blocked, so the coordinator serves stale data
+  instead of waiting.
+- PRIORITY_BACKFILL (job-history paging) keeps a reserve of tokens free for
+  status polling and waits out blocks.
+
+A 429 response blocks the host for its `Retry-After` (seconds or HTTP date), or
+for an exponential, jittered backoff when the header is missing.
+
+Callers may pass an `EndpointStats` (`stats=`) to have each request recorded:
+time to response headers, status (or throttled/timeout/error) and Content-Length.
+"""
+import asyncio
+import logging
+import random
+import time
+from email.utils import parsedate_to_datetime
+from datetime import datetime, timezone
+from typing import Any, Dict, Optional, Tuple
+from urllib.parse import urlsplit
+
+import async_timeout
+from homeassistant.core import HomeAssistant
+
+from .const import DOMAIN, DATA_RATE_LIMITER
+from .instrumentation import STATUS_ERROR, STATUS_THROTTLED, STATUS_TIMEOUT, EndpointStats
+
+_LOGGER = logging.getLogger(__name__)
+
+PRIORITY_STATUS = 0
+PRIORITY_BACKFILL = 1
+
+
+class RateLimited(Exception):
+    """Raised when a status request hits a host that is currently throttled."""
+
+    def __init__(self, host: str, retry_in: float):
+        super().__init__(f"{host} is rate limited for another {retry_in:.0f}s")
+        self.host = host
+        self.retry_in = retry_in
+
+
+def _parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Parse a Retry-After header (delta seconds or HTTP date) into seconds."""
+    if not value:
+        return None
+    value = value.strip()
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        when = parsedate_to_datetime(value)
+        if when.tzinfo is None:
+            when = when.replace(tzinfo=timezone.utc)
+        return max(0.0, (when - datetime.now(timezone.utc)).total_seconds())
+    except (TypeError, ValueError):
+        return None
+
+
+class _Bucket:
+    """Token bucket and throttle state for one host."""
+
+    __slots__ = ("rate", "capacity", "tokens", "updated", "blocked_until", "failures", "throttled")
+
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+        self.blocked_until = 0.0
+        self.failures = 0
+        self.throttled = 0
+
+    def refill(self, now: float) -> None:
+        if now <= self.updated:
+            return
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+
+class NosanaRateLimiter:
+    """Shared per-host token buckets with 429/Retry-After handling."""
+
+    def __init__(
+        self,
+        rate: float = 2.0,
+        capacity: float = 10.0,
+        backfill_reserve: float = 5.0,
+        backoff_base: float = 30.0,
+        backoff_max: float = 900.0,
+    ):
+        """Initialize the limiter.
+
+        rate/capacity: sustained requests per second and burst size per host.
+        backfill_reserve: tokens low-priority requests must leave for status polling.
+        """
+        self.rate = rate
+        self.capacity = capacity
+        self.backfill_reserve = min(backfill_reserve, capacity - 1)
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self._buckets: Dict[str, _Bucket] = {}
+
+    def _bucket(self, url: str) -> _Bucket:
+        host = urlsplit(url).hostname or url
+        bucket = self._buckets.get(host)
+        if bucket is None:
+            bucket = _Bucket(self.rate, self.capacity)
+            self._buckets[host] = bucket
+        return bucket
+
+    async def async_acquire(self, url: str, priority: int = PRIORITY_STATUS) -> None:
+        """Wait for a token for url's host.
+
+        Status requests raise `RateLimited` instead of waiting out a 429 block.
+        """
+        bucket = self._bucket(url)
+        need = 1.0 + (self.backfill_reserve if priority >= PRIORITY_BACKFILL else 0.0)
+        while True:
+            now = time.monotonic()
+            if bucket.blocked_until > now:
+                wait = bucket.blocked_until - now
+                if priority < PRIORITY_BACKFILL:
+                    raise RateLimited(urlsplit(url).hostname or url, wait)
+            else:
+                bucket.refill(now)
+                if bucket.tokens >= need:
+                    bucket.tokens -= 1.0
+                    return
+                wait = (need - bucket.tokens) / bucket.rate
+            await asyncio.sleep(wait)
+
+    def record_response(self, url: str, status: int, headers: Any = None) -> None:
+        """Update host state from a response: block on 429, reset backoff otherwise."""
+        bucket = self._bucket(url)
+        if status != 429:
+            if status < 500:
+                bucket.failures = 0
+            return
+        bucket.failures += 1
+        bucket.throttled += 1
+        retry_after = _parse_retry_after(headers.get("Retry-After") if headers is not None else None)
+        if retry_after is None:
+            backoff = min(self.backoff_max, self.backoff_base * (2 ** (bucket.failures - 1)))
+            # full jitter in [0.5, 1.5) so many nodes don't retry in lockstep
+            retry_after = backoff * (0.5 + random.random())
+        now = time.monotonic()
+        bucket.blocked_until = max(bucket.blocked_until, now + retry_after)
+        # start refilling from empty only once the block is over
+        bucket.tokens = 0.0
+        bucket.updated = bucket.blocked_until
+        _LOGGER.warning(
+            "Rate limited by %s; pausing requests for %.0fs", urlsplit(url).hostname, retry_after
+        )
+
+    async def _async_acquire_recorded(self, url: str, priority: int, stats: Optional[EndpointStats]) -> None:
+        try:
+            await self.async_acquire(url, priority)
+        except RateLimited:
+            if stats is not None:
+                stats.record(None, STATUS_THROTTLED)
+            raise
+
+    async def _async_send(self, session, method: str, url: str, stats: Optional[EndpointStats], **kwargs):
+        """Send the request, record the response for the host and in stats."""
+        start = time.monotonic()
+        try:
+            resp = await getattr(session, method)(url, **kwargs)
+        except asyncio.CancelledError:
+            # in practice the caller's async_timeout deadline expiring
+            if stats is not None:
+                stats.record(time.monotonic() - start, STATUS_TIMEOUT)
+            raise
+        except Exception:
+            if stats is not None:
+                stats.record(time.monotonic() - start, STATUS_ERROR)
+            raise
+        self.record_response(url, resp.status, getattr(resp, "headers", None))
+        if stats is not None:
+            stats.record(time.monotonic() - start, resp.status, getattr(resp, "content_length", None))
+        return resp
+
+    async def async_request(
+        self,
+        session,
+        method: str,
+        url: str,
+        priority: int = PRIORITY_STATUS,
+        stats: Optional[EndpointStats] = None,
+        **kwargs,
+    ):
+        """Rate-limited `session.<method>(url, **kwargs)`; records the response status for the host."""
+        await self._async_acquire_recorded(url, priority, stats)
+        return await self._async_send(session, method, url, stats, **kwargs)
+
+    async def async_get(
+        self, session, url: str, priority: int = PRIORITY_STATUS, stats: Optional[EndpointStats] = None, **kwargs
+    ):
+        """Rate-limited `session.get(url, **kwargs)`."""
+        return await self.async_request(session, "get", url, priority, stats, **kwargs)
+
+    async def async_get_json(
+        self,
+        session,
+        url: str,
+        timeout: float,
+        priority: int = PRIORITY_STATUS,
+        stats: Optional[EndpointStats] = None,
+        **kwargs,
+    ) -> Tuple[int, Any]:
+        """Rate-limited GET of url as JSON; return (status, body or None).
+
+        The token is acquired before the deadline starts, so a low-priority
+        request waiting for the bucket doesn't eat into its own timeout.
+        """
+        await self._async_acquire_recorded(url, priority, stats)
+        async with async_timeout.timeout(timeout):
+            resp = await self._async_send(session, "get", url, stats, **kwargs)
+            if resp.status != 200:
+                return resp.status, None
+            return resp.status, await resp.json()
+
+    def state(self) -> Dict[str, Any]:
+        """Return a snapshot of per-host limiter state."""
+        now = time.monotonic()
+        out: Dict[str, Any] = {}
+        for host, bucket in self._buckets.items():
+            bucket.refill(now)
+            out[host] = {
+                "tokens": round(bucket.tokens, 2),
+                "blocked_for": round(max(0.0, bucket.blocked_until - now), 1),
+                "consecutive_429": bucket.failures,
+                "throttled_total": bucket.throttled,
+            }
+        return out
+
+
+def get_rate_limiter(hass: HomeAssistant) -> NosanaRateLimiter:
+    """Return the shared rate limiter, creating it on first use."""
+    domain_data = hass.data.setdefault(DOMAIN, {})
+    limiter = domain_data.get(DATA_RATE_LIMITER)
+    if limiter is None:
+        limiter = NosanaRateLimiter()
+        domain_data[DATA_RATE_LIMITER] = limiter
+    return limiter
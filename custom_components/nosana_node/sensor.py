@@ -1,14 +1,23 @@
 # custom_components/nosana_node/sensor.py
 """Sensor platform for Nosana Node integration.
 
-This module exposes multiple SensorEntity classes that read from the
-NosanaNodeCoordinator and present discrete sensors for Home Assistant.
+Sensors are described by the `SENSOR_DESCRIPTIONS` table. Each description
+carries a precompiled accessor into `coordinator.data` and the section it reads
+from. A per-coordinator `_SensorSnapshot` runs the accessors once per
+coordinator update (only for sections that changed) into a flat tuple, and
+every entity reads its state from that tuple by index.
+
+`DIAGNOSTIC_SENSOR_DESCRIPTIONS` read the coordinator's request instrumentation
+instead; they are diagnostic entities, disabled by default.
 """
-from typing import List, Optional
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List, Mapping, Optional, Tuple
 
-from homeassistant.components.sensor import SensorEntity, SensorStateClass, SensorDeviceClass
+from homeassistant.components.sensor import SensorEntity, SensorEntityDescription, SensorStateClass
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
+from homeassistant.const import EntityCategory
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.typing import StateType
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
@@ -16,6 +25,426 @@ from homeassistant.helpers.update_coordinator import CoordinatorEntity
 from .const import DOMAIN, CONF_NODE_ADDRESS
 from .coordinator import NosanaNodeCoordinator
 
+# pseudo-section re-read on every tick of the coordinator's job countdown
+COUNTDOWN_SECTION = "countdown"
+
+
+def _path(section: str, key: str) -> Callable[[Mapping[str, Any]], Any]:
+    """Compile a `data[section][key]` accessor (None when missing)."""
+
+    def _get(data: Mapping[str, Any]) -> Any:
+        part = data.get(section)
+        return part.get(key) if isinstance(part, Mapping) else None
+
+    return _get
+
+
+def _node_status(data: Mapping[str, Any]) -> StateType:
+    """Map the node 'state' to Running/Queued/Offline.
+
+    Mapping:
+    - OTHER -> Running
+    - QUEUED -> Queued
+    - RUNNING -> Running
+    - OFFLINE/ERROR/missing -> Offline
+    """
+    state = data.get("state")
+    if not isinstance(state, str) or not state.strip():
+        return "Offline"
+    s = state.strip().upper()
+    if s in {"OFFLINE", "ERROR"}:
+        return "Offline"
+    if s == "QUEUED":
+        return "Queued"
+    if s in {"RUNNING", "OTHER"}:
+        return "Running"
+    # Fallback for any other unexpected value -> Offline
+    return "Offline"
+
+
+_specs_gpus = _path("specs", "gpus")
+
+
+def _gpu_model(data: Mapping[str, Any]) -> Optional[str]:
+    gpus = _specs_gpus(data) or []
+    if not isinstance(gpus, (list, tuple)) or not gpus:
+        return None
+    first = gpus[0]
+    return first.get("gpu") if isinstance(first, Mapping) else None
+
+
+def _latest_job(data: Mapping[str, Any]) -> Dict[str, Any]:
+    return (data.get("earnings") or {}).get("latest_job") or {}
+
+
+def _timeout_seconds(timeout_raw: int) -> float:
+    # Heuristic: if timeout looks like milliseconds (very large), convert to seconds
+    if timeout_raw > 1_000_000_000:
+        return timeout_raw / 1000.0
+    return float(timeout_raw)
+
+
+def _job_timeout_hours(data: Mapping[str, Any]) -> float:
+    """Job timeout in hours. 0 if the latest job is finished or missing."""
+    latest = _latest_job(data)
+    try:
+        if int(latest.get("timeEnd", 0) or 0) > 0:
+            return 0.0
+        # timeout may be stored in seconds (typical) or milliseconds in some APIs.
+        timeout_raw = int(latest.get("timeout", 0) or 0)
+        if timeout_raw <= 0:
+            return 0.0
+        return round(_timeout_seconds(timeout_raw) / 3600.0, 6)
+    except Exception:
+        return 0.0
+
+
+def _job_time_left_hours(data: Mapping[str, Any]) -> float:
+    """Time left (hours) for the latest running job. 0 if finished or no timeout."""
+    latest = _latest_job(data)
+    try:
+        if int(latest.get("timeEnd", 0) or 0) > 0:
+            return 0.0
+        time_start_raw = int(latest.get("timeStart", 0) or 0)
+        timeout_raw = int(latest.get("timeout", 0) or 0)
+        if time_start_raw <= 0 or timeout_raw <= 0:
+            return 0.0
+        # Heuristic: detect if timeStart is in milliseconds
+        if time_start_raw > 1_000_000_000_000:
+            time_start = int(time_start_raw / 1000)
+        else:
+            time_start = time_start_raw
+        now_ts = int(datetime.now(timezone.utc).timestamp())
+        expire_at = int(time_start + int(_timeout_seconds(timeout_raw)))
+        left = max(0, expire_at - now_ts)
+        return round(float(left) / 3600.0, 6)
+    except Exception:
+        return 0.0
+
+
+def _benchmark_tokens_per_second(data: Mapping[str, Any]) -> Optional[float]:
+    val = ((data.get("earnings") or {}).get("benchmark") or {}).get("tokens_per_second_mean")
+    return float(val) if isinstance(val, (int, float)) else None
+
+
+def _benchmark_attributes(data: Mapping[str, Any]) -> Dict[str, Any]:
+    model_id = ((data.get("earnings") or {}).get("benchmark") or {}).get("model_id")
+    return {"model_id": model_id} if isinstance(model_id, str) else {}
+
+
+def _queue_attributes(data: Mapping[str, Any]) -> Dict[str, Any]:
+    queue = data.get("queue") or {}
+    # "node": nodes are waiting for jobs; "job": jobs are waiting for nodes; "empty": nothing queued
+    return {"queue_type": queue.get("type"), "market_address": queue.get("market")}
+
+
+def _latest_job_attributes(data: Mapping[str, Any]) -> Dict[str, Any]:
+    # Expose the raw latest_job for debugging convenience
+    latest = (data.get("earnings") or {}).get("latest_job")
+    return {"latest_job": dict(latest)} if isinstance(latest, Mapping) else {}
+
+
+@dataclass(frozen=True, kw_only=True)
+class NosanaSensorEntityDescription(SensorEntityDescription):
+    """Describes a Nosana Node sensor."""
+
+    value_fn: Callable[[Mapping[str, Any]], Any]
+    # coordinator.data section the value is read from; None re-reads on every update
+    section: Optional[str]
+    attributes_fn: Optional[Callable[[Mapping[str, Any]], Dict[str, Any]]] = None
+    # also re-read on every tick of the local job countdown (clock-driven values)
+    countdown: bool = False
+    # keep the last known value (and attributes) while the source has none
+    keep_last: bool = False
+    entity_picture: Optional[str] = None
+
+
+SENSOR_DESCRIPTIONS: Tuple[NosanaSensorEntityDescription, ...] = (
+    NosanaSensorEntityDescription(
+        key="status",
+        icon="mdi:server",
+        value_fn=_node_status,
+        section="info",
+        # Prefer a local /local path per HA docs (place file under config/www/...)
+        entity_picture="/local/nosana_node/logomark.svg",
+    ),
+    NosanaSensorEntityDescription(key="version", icon="mdi:tag", value_fn=_path("info", "version"), section="info"),
+    NosanaSensorEntityDescription(
+        key="country", icon="mdi:map-marker", value_fn=_path("info", "country"), section="info"
+    ),
+    # network sensors restored from dashboard /metrics
+    NosanaSensorEntityDescription(
+        key="ping_ms",
+        icon="mdi:network-latency",
+        state_class=SensorStateClass.MEASUREMENT,
+        native_unit_of_measurement="ms",
+        value_fn=_path("specs", "ping_ms"),
+        section="specs",
+    ),
+    NosanaSensorEntityDescription(
+        key="download_mbps",
+        icon="mdi:download",
+        state_class=SensorStateClass.MEASUREMENT,
+        native_unit_of_measurement="Mbps",
+        value_fn=_path("specs", "download_mbps"),
+        section="specs",
+    ),
+    NosanaSensorEntityDescription(
+        key="upload_mbps",
+        icon="mdi:upload",
+        state_class=SensorStateClass.MEASUREMENT,
+        native_unit_of_measurement="Mbps",
+        value_fn=_path("specs", "upload_mbps"),
+        section="specs",
+    ),
+    # sensors from specs / markets
+    NosanaSensorEntityDescription(key="market", icon="mdi:store", value_fn=_path("market", "name"), section="market"),
+    NosanaSensorEntityDescription(
+        key="market_address", icon="mdi:map-marker", value_fn=_path("market", "address"), section="market"
+    ),
+    NosanaSensorEntityDescription(
+        key="market_type", icon="mdi:shape", value_fn=_path("market", "type"), section="market"
+    ),
+    NosanaSensorEntityDescription(
+        key="nos_reward_per_second",
+        icon="mdi:currency-usd",
+        state_class=SensorStateClass.MEASUREMENT,
+        value_fn=_path("market", "nos_reward_per_second"),
+        section="market",
+    ),
+    NosanaSensorEntityDescription(
+        key="usd_reward_per_hour",
+        icon="mdi:currency-usd",
+        state_class=SensorStateClass.MEASUREMENT,
+        native_unit_of_measurement="USD/h",
+        value_fn=_path("market", "usd_reward_per_hour"),
+        section="market",
+    ),
+    # market queue sensors (Solana RPC)
+    NosanaSensorEntityDescription(
+        key="queue_position",
+        icon="mdi:format-list-numbered",
+        state_class=SensorStateClass.MEASUREMENT,
+        value_fn=_path("queue", "position"),
+        section="queue",
+    ),
+    NosanaSensorEntityDescription(
+        key="queue_length",
+        icon="mdi:human-queue",
+        state_class=SensorStateClass.MEASUREMENT,
+        value_fn=_path("queue", "length"),
+        attributes_fn=_queue_attributes,
+        section="queue",
+    ),
+    NosanaSensorEntityDescription(
+        key="ram",
+        icon="mdi:memory",
+        state_class=SensorStateClass.MEASUREMENT,
+        native_unit_of_measurement="MB",
+        value_fn=_path("specs", "ram"),
+        section="specs",
+    ),
+    NosanaSensorEntityDescription(
+        key="disk_space",
+        icon="mdi:harddisk",
+        state_class=SensorStateClass.MEASUREMENT,
+        native_unit_of_measurement="GB",
+        value_fn=_path("specs", "diskSpace"),
+        section="specs",
+    ),
+    NosanaSensorEntityDescription(key="cpu", icon="mdi:cpu-64-bit", value_fn=_path("specs", "cpu"), section="specs"),
+    NosanaSensorEntityDescription(
+        key="logical_cores",
+        icon="mdi:chip",
+        state_class=SensorStateClass.MEASUREMENT,
+        native_unit_of_measurement="cores",
+        value_fn=_path("specs", "logicalCores"),
+        section="specs",
+    ),
+    NosanaSensorEntityDescription(
+        key="physical_cores",
+        icon="mdi:chip",
+        state_class=SensorStateClass.MEASUREMENT,
+        native_unit_of_measurement="cores",
+        value_fn=_path("specs", "physicalCores"),
+        section="specs",
+    ),
+    NosanaSensorEntityDescription(key="gpu_model", icon="mdi:gpu", value_fn=_gpu_model, section="specs"),
+    NosanaSensorEntityDescription(
+        key="memory_gpu",
+        icon="mdi:memory",
+        state_class=SensorStateClass.MEASUREMENT,
+        native_unit_of_measurement="MB",
+        value_fn=_path("specs", "memoryGPU"),
+        section="specs",
+    ),
+    # earnings sensors (aggregated via HA Store)
+    NosanaSensorEntityDescription(
+        key="earnings_usd_total",
+        icon="mdi:currency-usd",
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        native_unit_of_measurement="USD",
+        value_fn=_path("earnings", "usd_total"),
+        section="earnings",
+    ),
+    # Keeps the last known value when new data is unavailable (e.g., job not finalized yet)
+    NosanaSensorEntityDescription(
+        key="benchmark_tokens_per_second",
+        icon="mdi:chart-line",
+        state_class=SensorStateClass.MEASUREMENT,
+        native_unit_of_measurement="tokens/s",
+        value_fn=_benchmark_tokens_per_second,
+        attributes_fn=_benchmark_attributes,
+        keep_last=True,
+        section="earnings",
+    ),
+    NosanaSensorEntityDescription(
+        key="job_timeout_hours",
+        icon="mdi:timer-sand",
+        state_class=SensorStateClass.MEASUREMENT,
+        native_unit_of_measurement="h",
+        value_fn=_job_timeout_hours,
+        section="earnings",
+    ),
+    # depends on the clock: updated by the local countdown between polls
+    NosanaSensorEntityDescription(
+        key="job_time_left_hours",
+        icon="mdi:timer",
+        state_class=SensorStateClass.MEASUREMENT,
+        native_unit_of_measurement="h",
+        value_fn=_job_time_left_hours,
+        attributes_fn=_latest_job_attributes,
+        section="earnings",
+        countdown=True,
+    ),
+)
+
+
+def _description_sections(description: NosanaSensorEntityDescription) -> Optional[frozenset]:
+    """Sections a description reads from (None: re-read on every update)."""
+    if description.section is None:
+        return None
+    if description.countdown:
+        return frozenset((description.section, COUNTDOWN_SECTION))
+    return frozenset((description.section,))
+
+
+def _endpoint_latency(endpoint: str) -> Callable[[NosanaNodeCoordinator], Any]:
+    return lambda coordinator: coordinator.endpoint_stats()[endpoint].latency.last_ms
+
+
+def _endpoint_attributes(endpoint: str) -> Callable[[NosanaNodeCoordinator], Dict[str, Any]]:
+    return lambda coordinator: coordinator.endpoint_stats()[endpoint].as_dict()
+
+
+def _cache_hit_ratio(cache: str) -> Callable[[NosanaNodeCoordinator], Any]:
+    return lambda coordinator: coordinator.cache_stats()[cache].hit_ratio
+
+
+def _cache_attributes(cache: str) -> Callable[[NosanaNodeCoordinator], Dict[str, Any]]:
+    return lambda coordinator: coordinator.cache_stats()[cache].as_dict()
+
+
+def _bytes_received(coordinator: NosanaNodeCoordinator) -> int:
+    return sum(stats.bytes_received for stats in coordinator.endpoint_stats().values())
+
+
+def _bytes_received_attributes(coordinator: NosanaNodeCoordinator) -> Dict[str, Any]:
+    return {endpoint: stats.bytes_received for endpoint, stats in coordinator.endpoint_stats().items()}
+
+
+@dataclass(frozen=True, kw_only=True)
+class NosanaDiagnosticSensorEntityDescription(SensorEntityDescription):
+    """Describes a Nosana Node diagnostic sensor read from the coordinator's instrumentation."""
+
+    value_fn: Callable[[NosanaNodeCoordinator], Any]
+    attributes_fn: Optional[Callable[[NosanaNodeCoordinator], Dict[str, Any]]] = None
+    entity_category: Optional[EntityCategory] = EntityCategory.DIAGNOSTIC
+    entity_registry_enabled_default: bool = False
+
+
+DIAGNOSTIC_SENSOR_DESCRIPTIONS: Tuple[NosanaDiagnosticSensorEntityDescription, ...] = (
+    NosanaDiagnosticSensorEntityDescription(
+        key="refresh_duration_ms",
+        icon="mdi:timer-outline",
+        state_class=SensorStateClass.MEASUREMENT,
+        native_unit_of_measurement="ms",
+        value_fn=lambda coordinator: coordinator.refresh_latency.last_ms,
+        attributes_fn=lambda coordinator: coordinator.refresh_latency.as_dict(),
+    ),
+    # last request latency per upstream endpoint; histogram and status counts as attributes
+    *(
+        NosanaDiagnosticSensorEntityDescription(
+            key=f"{endpoint}_latency_ms",
+            icon="mdi:timer-outline",
+            state_class=SensorStateClass.MEASUREMENT,
+            native_unit_of_measurement="ms",
+            value_fn=_endpoint_latency(endpoint),
+            attributes_fn=_endpoint_attributes(endpoint),
+        )
+        for endpoint in ("info", "metrics", "jobs", "markets", "rpc")
+    ),
+    *(
+        NosanaDiagnosticSensorEntityDescription(
+            key=f"{cache}_cache_hit_ratio",
+            icon="mdi:cached",
+            state_class=SensorStateClass.MEASUREMENT,
+            native_unit_of_measurement="%",
+            value_fn=_cache_hit_ratio(cache),
+            attributes_fn=_cache_attributes(cache),
+        )
+        for cache in ("jobs", "markets")
+    ),
+    NosanaDiagnosticSensorEntityDescription(
+        key="bytes_received",
+        icon="mdi:download-network",
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        native_unit_of_measurement="B",
+        value_fn=_bytes_received,
+        attributes_fn=_bytes_received_attributes,
+    ),
+)
+
+
+class _SensorSnapshot:
+    """Sensor values of one coordinator update, extracted once and shared by all entities."""
+
+    __slots__ = ("_coordinator", "_descriptions", "_description_sections", "values", "attributes")
+
+    def __init__(self, coordinator: NosanaNodeCoordinator, descriptions: Tuple[NosanaSensorEntityDescription, ...]):
+        self._coordinator = coordinator
+        self._descriptions = descriptions
+        # per description: sections it reads from (None: re-read on every update)
+        self._description_sections = tuple(_description_sections(description) for description in descriptions)
+        self.values: Tuple[Any, ...] = (None,) * len(descriptions)
+        self.attributes: Tuple[Optional[Dict[str, Any]], ...] = (None,) * len(descriptions)
+        self._extract(None)
+
+    @callback
+    def async_update(self) -> None:
+        """Coordinator listener: re-extract the values of the sections that changed."""
+        self._extract(self._coordinator.changed_sections)
+
+    @callback
+    def async_countdown_tick(self) -> None:
+        """Countdown listener: re-extract the clock-driven values."""
+        self._extract(frozenset((COUNTDOWN_SECTION,)))
+
+    def _extract(self, changed) -> None:
+        data = self._coordinator.data or {}
+        values = []
+        attributes = []
+        for i, description in enumerate(self._descriptions):
+            sections = self._description_sections[i]
+            if changed is not None and sections is not None and sections.isdisjoint(changed):
+                values.append(self.values[i])
+                attributes.append(self.attributes[i])
+                continue
+            values.append(description.value_fn(data))
+            attributes.append(description.attributes_fn(data) if description.attributes_fn else None)
+        self.values = tuple(values)
+        self.attributes = tuple(attributes)
+
 
 async def async_setup_entry(
     hass: HomeAssistant,
@@ -26,34 +455,20 @@ async def async_setup_entry(
     coordinator: NosanaNodeCoordinator = hass.data[DOMAIN][entry.entry_id]
     node_address = entry.data[CONF_NODE_ADDRESS]
 
+    snapshot = _SensorSnapshot(coordinator, SENSOR_DESCRIPTIONS)
+    # registered before the entities so the snapshot is current when they write state
+    entry.async_on_unload(coordinator.async_add_listener(snapshot.async_update))
+    if coordinator.countdown is not None:
+        entry.async_on_unload(coordinator.countdown.async_add_listener(snapshot.async_countdown_tick))
+
     sensors: List[SensorEntity] = [
-        NosanaNodeStatusSensor(coordinator, entry.title, node_address),
-        NosanaNodeVersionSensor(coordinator, entry.title, node_address),
-        NosanaNodeCountrySensor(coordinator, entry.title, node_address),
-        # network sensors restored from dashboard /metrics
-        NosanaNodePingSensor(coordinator, entry.title, node_address),
-        NosanaNodeDownloadSensor(coordinator, entry.title, node_address),
-        NosanaNodeUploadSensor(coordinator, entry.title, node_address),
-        NosanaNodeCountrySensor(coordinator, entry.title, node_address),
-        # new sensors from specs / markets
-        NosanaNodeMarketSensor(coordinator, entry.title, node_address),
-        NosanaNodeMarketAddressSensor(coordinator, entry.title, node_address),
-        NosanaNodeMarketTypeSensor(coordinator, entry.title, node_address),
-        NosanaNodeMarketNosRewardSensor(coordinator, entry.title, node_address),
-        NosanaNodeMarketUsdRewardSensor(coordinator, entry.title, node_address),
-        NosanaNodeRamSensor(coordinator, entry.title, node_address),
-        NosanaNodeDiskSensor(coordinator, entry.title, node_address),
-        NosanaNodeCpuSensor(coordinator, entry.title, node_address),
-        NosanaNodeLogicalCoresSensor(coordinator, entry.title, node_address),
-        NosanaNodePhysicalCoresSensor(coordinator, entry.title, node_address),
-        NosanaNodeGpuModelSensor(coordinator, entry.title, node_address),
-        NosanaNodeMemoryGpuSensor(coordinator, entry.title, node_address),
-        # earnings sensors (aggregated via HA Store)
-        NosanaNodeEarningsUsdSensor(coordinator, entry.title, node_address),
-        NosanaNodeBenchmarkTokensPerSecondSensor(coordinator, entry.title, node_address),
-        NosanaNodeJobTimeoutHoursSensor(coordinator, entry.title, node_address),
-        NosanaNodeJobTimeLeftHoursSensor(coordinator, entry.title, node_address),
+        NosanaNodeSensor(coordinator, snapshot, index, description, entry.title, node_address)
+        for index, description in enumerate(SENSOR_DESCRIPTIONS)
     ]
+    sensors.extend(
+        NosanaDiagnosticSensor(coordinator, description, entry.title, node_address)
+        for description in DIAGNOSTIC_SENSOR_DESCRIPTIONS
+    )
 
     async_add_entities(sensors)
 
@@ -71,6 +486,16 @@ class _BaseNosanaSensor(CoordinatorEntity, SensorEntity):
         self._attr_unique_id = f"nosana_node_{node_address[:8]}_{suffix.replace(' ', '_').lower()}"
         # Keep the device name (based on the config entry title) so device_info can use it
         self._device_name = name
+        # coordinator.data sections the state/attributes are read from; None writes on every update
+        self._sections: Optional[frozenset] = None
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Write state only when a section this sensor reads from changed."""
+        sections = self._sections
+        if sections is not None and sections.isdisjoint(self.coordinator.changed_sections):
+            return
+        super()._handle_coordinator_update()
 
     @property
     def available(self) -> bool:
@@ -100,440 +525,83 @@ class _BaseNosanaSensor(CoordinatorEntity, SensorEntity):
         return info
 
 
-class NosanaNodeStatusSensor(_BaseNosanaSensor):
-    """Sensor for the node 'state' with explicit mapping.
-
-    Mapping:
-    - OTHER -> Running
-    - QUEUED -> Queued
-    - RUNNING -> Running
-    - OFFLINE/ERROR/missing -> Offline
-    """
-
-    def __init__(self, coordinator: NosanaNodeCoordinator, name: str, node_address: str):
-        super().__init__(coordinator, name, node_address, "status")
-        self._attr_icon = "mdi:server"
-
-    @property
-    def state(self) -> StateType:
-        if self.coordinator.data is None:
-            return None
-        state = self.coordinator.data.get("state")
-        if not isinstance(state, str) or not state.strip():
-            return "Offline"
-        s = state.strip().upper()
-        if s in {"OFFLINE", "ERROR"}:
-            return "Offline"
-        if s == "QUEUED":
-            return "Queued"
-        if s in {"RUNNING", "OTHER"}:
-            return "Running"
-        # Fallback for any other unexpected value -> Offline
-        return "Offline"
-
-    @property
-    def entity_picture(self) -> Optional[str]:
-        """Return a path to the integration image for UI display.
-
-        Prefer a local /local path per HA docs (place file under config/www/...).
-        """
-        return "/local/nosana_node/logomark.svg"
-
-
-# Uptime and network sensors removed — the dashboard /metrics endpoint no longer provides
-# uptime or network fields (ping_ms/download_mbps/upload_mbps). They were removed from setup
-# and the implementation to avoid exposing unavailable values.
-
-
-class NosanaNodeVersionSensor(_BaseNosanaSensor):
-    """Sensor for the node software version."""
-
-    def __init__(self, coordinator: NosanaNodeCoordinator, name: str, node_address: str):
-        super().__init__(coordinator, name, node_address, "version")
-        self._attr_icon = "mdi:tag"
-
-    @property
-    def state(self) -> StateType:
-        if self.coordinator.data is None:
-            return None
-        return self.coordinator.data.get("info", {}).get("version")
-
-
-class NosanaNodeCountrySensor(_BaseNosanaSensor):
-    """Sensor for the node country."""
-
-    def __init__(self, coordinator: NosanaNodeCoordinator, name: str, node_address: str):
-        super().__init__(coordinator, name, node_address, "country")
-        self._attr_icon = "mdi:map-marker"
+class NosanaNodeSensor(_BaseNosanaSensor):
+    """Nosana Node sensor reading its value from the shared per-update snapshot."""
+
+    entity_description: NosanaSensorEntityDescription
+
+    def __init__(
+        self,
+        coordinator: NosanaNodeCoordinator,
+        snapshot: _SensorSnapshot,
+        index: int,
+        description: NosanaSensorEntityDescription,
+        name: str,
+        node_address: str,
+    ):
+        super().__init__(coordinator, name, node_address, description.key)
+        self.entity_description = description
+        self._snapshot = snapshot
+        self._index = index
+        self._sections = _description_sections(description)
+        self._attr_entity_picture = description.entity_picture
+        self._last_value: Any = None
+        self._last_attributes: Dict[str, Any] = {}
+
+    async def async_added_to_hass(self) -> None:
+        await super().async_added_to_hass()
+        countdown = self.coordinator.countdown
+        if self.entity_description.countdown and countdown is not None:
+            # written locally on every tick, between coordinator refreshes
+            self.async_on_remove(countdown.async_add_listener(self.async_write_ha_state))
 
     @property
     def state(self) -> StateType:
-        if self.coordinator.data is None:
-            return None
-        return self.coordinator.data.get("info", {}).get("country")
-
-
-class NosanaNodePingSensor(_BaseNosanaSensor):
-    """Sensor for the network ping in milliseconds."""
-
-    def __init__(self, coordinator: NosanaNodeCoordinator, name: str, node_address: str):
-        super().__init__(coordinator, name, node_address, "ping_ms")
-        self._attr_icon = "mdi:network-latency"
-        self._attr_state_class = SensorStateClass.MEASUREMENT
-        self._attr_native_unit_of_measurement = "ms"
-
-    @property
-    def state(self) -> Optional[int]:
-        if self.coordinator.data is None:
-            return None
-        return self.coordinator.data.get("specs", {}).get("ping_ms")
-
-
-class NosanaNodeDownloadSensor(_BaseNosanaSensor):
-    """Sensor for the network download speed in Mbps."""
-
-    def __init__(self, coordinator: NosanaNodeCoordinator, name: str, node_address: str):
-        super().__init__(coordinator, name, node_address, "download_mbps")
-        self._attr_icon = "mdi:download"
-        self._attr_state_class = SensorStateClass.MEASUREMENT
-        self._attr_native_unit_of_measurement = "Mbps"
-
-    @property
-    def state(self) -> Optional[int]:
-        if self.coordinator.data is None:
-            return None
-        return self.coordinator.data.get("specs", {}).get("download_mbps")
-
-
-class NosanaNodeUploadSensor(_BaseNosanaSensor):
-    """Sensor for the network upload speed in Mbps."""
-
-    def __init__(self, coordinator: NosanaNodeCoordinator, name: str, node_address: str):
-        super().__init__(coordinator, name, node_address, "upload_mbps")
-        self._attr_icon = "mdi:upload"
-        self._attr_state_class = SensorStateClass.MEASUREMENT
-        self._attr_native_unit_of_measurement = "Mbps"
-
-    @property
-    def state(self) -> Optional[int]:
-        if self.coordinator.data is None:
-            return None
-        return self.coordinator.data.get("specs", {}).get("upload_mbps")
-
-
-# network-related sensors removed
-
-
-# New sensors from specs/markets
-class NosanaNodeMarketSensor(_BaseNosanaSensor):
-    """Sensor for the market name determined from specs/markets endpoints."""
-
-    def __init__(self, coordinator: NosanaNodeCoordinator, name: str, node_address: str):
-        super().__init__(coordinator, name, node_address, "market")
-        self._attr_icon = "mdi:store"
-
-    @property
-    def state(self) -> Optional[str]:
-        if self.coordinator.data is None:
-            return None
-        # market_name is populated by the coordinator
-        return self.coordinator.data.get("market", {}).get("name")
-
-
-class NosanaNodeMarketAddressSensor(_BaseNosanaSensor):
-    def __init__(self, coordinator: NosanaNodeCoordinator, name: str, node_address: str):
-        super().__init__(coordinator, name, node_address, "market_address")
-        self._attr_icon = "mdi:map-marker"
-
-    @property
-    def state(self) -> Optional[str]:
-        if self.coordinator.data is None:
-            return None
-        return self.coordinator.data.get("market", {}).get("address")
-
-
-class NosanaNodeMarketTypeSensor(_BaseNosanaSensor):
-    def __init__(self, coordinator: NosanaNodeCoordinator, name: str, node_address: str):
-        super().__init__(coordinator, name, node_address, "market_type")
-        self._attr_icon = "mdi:shape"
-
-    @property
-    def state(self) -> Optional[str]:
-        if self.coordinator.data is None:
-            return None
-        return self.coordinator.data.get("market", {}).get("type")
-
-
-class NosanaNodeMarketNosRewardSensor(_BaseNosanaSensor):
-    def __init__(self, coordinator: NosanaNodeCoordinator, name: str, node_address: str):
-        super().__init__(coordinator, name, node_address, "nos_reward_per_second")
-        self._attr_icon = "mdi:currency-usd"
-        self._attr_state_class = SensorStateClass.MEASUREMENT
-
-    @property
-    def state(self) -> Optional[float]:
-        if self.coordinator.data is None:
-            return None
-        return self.coordinator.data.get("market", {}).get("nos_reward_per_second")
-
-
-class NosanaNodeMarketUsdRewardSensor(_BaseNosanaSensor):
-    def __init__(self, coordinator: NosanaNodeCoordinator, name: str, node_address: str):
-        super().__init__(coordinator, name, node_address, "usd_reward_per_hour")
-        self._attr_icon = "mdi:currency-usd"
-        self._attr_state_class = SensorStateClass.MEASUREMENT
-        self._attr_native_unit_of_measurement = "USD/h"
-
-    @property
-    def state(self) -> Optional[float]:
-        if self.coordinator.data is None:
-            return None
-        return self.coordinator.data.get("market", {}).get("usd_reward_per_hour")
-
-
-class NosanaNodeRamSensor(_BaseNosanaSensor):
-    """Sensor for the node RAM in MB."""
-
-    def __init__(self, coordinator: NosanaNodeCoordinator, name: str, node_address: str):
-        super().__init__(coordinator, name, node_address, "ram")
-        self._attr_native_unit_of_measurement = "MB"
-        self._attr_icon = "mdi:memory"
-        self._attr_state_class = SensorStateClass.MEASUREMENT
-
-    @property
-    def state(self) -> Optional[int]:
-        if self.coordinator.data is None:
-            return None
-        return self.coordinator.data.get("specs", {}).get("ram")
-
-
-class NosanaNodeDiskSensor(_BaseNosanaSensor):
-    """Sensor for the node disk space in GB."""
-
-    def __init__(self, coordinator: NosanaNodeCoordinator, name: str, node_address: str):
-        super().__init__(coordinator, name, node_address, "disk_space")
-        self._attr_native_unit_of_measurement = "GB"
-        self._attr_icon = "mdi:harddisk"
-        self._attr_state_class = SensorStateClass.MEASUREMENT
-
-    @property
-    def state(self) -> Optional[int]:
-        if self.coordinator.data is None:
-            return None
-        return self.coordinator.data.get("specs", {}).get("diskSpace")
-
-
-class NosanaNodeCpuSensor(_BaseNosanaSensor):
-    """Sensor for the CPU model string."""
-
-    def __init__(self, coordinator: NosanaNodeCoordinator, name: str, node_address: str):
-        super().__init__(coordinator, name, node_address, "cpu")
-        self._attr_icon = "mdi:cpu-64-bit"
-
-    @property
-    def state(self) -> Optional[str]:
-        if self.coordinator.data is None:
-            return None
-        return self.coordinator.data.get("specs", {}).get("cpu")
-
-
-class NosanaNodeLogicalCoresSensor(_BaseNosanaSensor):
-    def __init__(self, coordinator: NosanaNodeCoordinator, name: str, node_address: str):
-        super().__init__(coordinator, name, node_address, "logical_cores")
-        self._attr_icon = "mdi:chip"
-        self._attr_state_class = SensorStateClass.MEASUREMENT
-        self._attr_native_unit_of_measurement = "cores"
+        value = self._snapshot.values[self._index]
+        if self.entity_description.keep_last:
+            if value is None:
+                return self._last_value
+            self._last_value = value
+        return value
 
     @property
-    def state(self) -> Optional[int]:
-        if self.coordinator.data is None:
+    def extra_state_attributes(self) -> Optional[Dict[str, Any]]:
+        if self.entity_description.attributes_fn is None:
             return None
-        return self.coordinator.data.get("specs", {}).get("logicalCores")
+        attributes = self._snapshot.attributes[self._index] or {}
+        if self.entity_description.keep_last:
+            if not attributes:
+                return self._last_attributes
+            self._last_attributes = attributes
+        return attributes
 
 
-class NosanaNodePhysicalCoresSensor(_BaseNosanaSensor):
-    def __init__(self, coordinator: NosanaNodeCoordinator, name: str, node_address: str):
-        super().__init__(coordinator, name, node_address, "physical_cores")
-        self._attr_icon = "mdi:chip"
-        self._attr_state_class = SensorStateClass.MEASUREMENT
-        self._attr_native_unit_of_measurement = "cores"
-
-    @property
-    def state(self) -> Optional[int]:
-        if self.coordinator.data is None:
-            return None
-        return self.coordinator.data.get("specs", {}).get("physicalCores")
+class NosanaDiagnosticSensor(_BaseNosanaSensor):
+    """Diagnostic sensor reading the coordinator's request instrumentation on every update."""
 
+    entity_description: NosanaDiagnosticSensorEntityDescription
 
-class NosanaNodeGpuModelSensor(_BaseNosanaSensor):
-    def __init__(self, coordinator: NosanaNodeCoordinator, name: str, node_address: str):
-        super().__init__(coordinator, name, node_address, "gpu_model")
-        self._attr_icon = "mdi:gpu"
+    def __init__(
+        self,
+        coordinator: NosanaNodeCoordinator,
+        description: NosanaDiagnosticSensorEntityDescription,
+        name: str,
+        node_address: str,
+    ):
+        super().__init__(coordinator, name, node_address, description.key)
+        self.entity_description = description
 
     @property
-    def state(self) -> Optional[str]:
-        if self.coordinator.data is None:
-            return None
-        gpus = self.coordinator.data.get("specs", {}).get("gpus") or []
-        if not isinstance(gpus, list) or not gpus:
-            return None
-        first = gpus[0]
-        return first.get("gpu") if isinstance(first, dict) else None
-
-
-class NosanaNodeMemoryGpuSensor(_BaseNosanaSensor):
-    def __init__(self, coordinator: NosanaNodeCoordinator, name: str, node_address: str):
-        super().__init__(coordinator, name, node_address, "memory_gpu")
-        self._attr_native_unit_of_measurement = "MB"
-        self._attr_icon = "mdi:memory"
-        self._attr_state_class = SensorStateClass.MEASUREMENT
+    def available(self) -> bool:
+        # counters are meaningful even while the node itself is unreachable
+        return True
 
     @property
-    def state(self) -> Optional[float]:
-        if self.coordinator.data is None:
-            return None
-        return self.coordinator.data.get("specs", {}).get("memoryGPU")
-
-
-class NosanaNodeEarningsUsdSensor(_BaseNosanaSensor):
-    """Total USD earned (aggregated from jobs via HA Store)."""
-
-    def __init__(self, coordinator: NosanaNodeCoordinator, name: str, node_address: str):
-        super().__init__(coordinator, name, node_address, "earnings_usd_total")
-        self._attr_icon = "mdi:currency-usd"
-        self._attr_state_class = SensorStateClass.TOTAL_INCREASING
-        self._attr_native_unit_of_measurement = "USD"
+    def state(self) -> StateType:
+        return self.entity_description.value_fn(self.coordinator)
 
     @property
-    def state(self) -> Optional[float]:
-        if self.coordinator.data is None:
+    def extra_state_attributes(self) -> Optional[Dict[str, Any]]:
+        if self.entity_description.attributes_fn is None:
             return None
-        return (self.coordinator.data.get("earnings") or {}).get("usd_total")
-
-
-class NosanaNodeBenchmarkTokensPerSecondSensor(_BaseNosanaSensor):
-    """Latest LLM benchmark tokens/sec (mean) with model_id attribute.
-
-    Keeps the last known value when new data is unavailable (e.g., job not finalized yet).
-    """
-
-    def __init__(self, coordinator: NosanaNodeCoordinator, name: str, node_address: str):
-        super().__init__(coordinator, name, node_address, "benchmark_tokens_per_second")
-        self._attr_icon = "mdi:chart-line"
-        self._attr_state_class = SensorStateClass.MEASUREMENT
-        self._attr_native_unit_of_measurement = "tokens/s"
-        self._last_value: Optional[float] = None
-        self._last_model_id: Optional[str] = None
-
-    @property
-    def state(self) -> Optional[float]:
-        data = self.coordinator.data or {}
-        bench = (data.get("earnings") or {}).get("benchmark") or {}
-        val = bench.get("tokens_per_second_mean")
-        if isinstance(val, (int, float)):
-            self._last_value = float(val)
-            # update cached model id if present
-            mid = bench.get("model_id")
-            if isinstance(mid, str):
-                self._last_model_id = mid
-            return self._last_value
-        # No new finalized benchmark → keep last known value
-        return self._last_value
-
-    @property
-    def extra_state_attributes(self) -> dict:
-        data = self.coordinator.data or {}
-        bench = (data.get("earnings") or {}).get("benchmark") or {}
-        model_id = bench.get("model_id")
-        if isinstance(model_id, str):
-            self._last_model_id = model_id
-        return {"model_id": self._last_model_id} if isinstance(self._last_model_id, str) else {}
-
-
-class NosanaNodeJobTimeoutHoursSensor(_BaseNosanaSensor):
-    """Job timeout in hours. 0 if the latest job is finished or missing."""
-
-    def __init__(self, coordinator: NosanaNodeCoordinator, name: str, node_address: str):
-        super().__init__(coordinator, name, node_address, "job_timeout_hours")
-        self._attr_icon = "mdi:timer-sand"
-        self._attr_native_unit_of_measurement = "h"
-        self._attr_state_class = SensorStateClass.MEASUREMENT
-
-    @property
-    def state(self) -> float:
-        if self.coordinator.data is None:
-            return 0.0
-        data = self.coordinator.data
-        latest = (data.get("earnings") or {}).get("latest_job") or {}
-        try:
-            time_end = int(latest.get("timeEnd", 0) or 0)
-            if time_end > 0:
-                return 0.0
-
-            # timeout may be stored in seconds (typical) or milliseconds in some APIs.
-            timeout_raw = int(latest.get("timeout", 0) or 0)
-            if timeout_raw <= 0:
-                return 0.0
-
-            # Heuristic: if timeout looks like milliseconds (very large), convert to seconds
-            if timeout_raw > 1_000_000_000:
-                timeout_seconds = timeout_raw / 1000.0
-            else:
-                timeout_seconds = float(timeout_raw)
-
-            return round(timeout_seconds / 3600.0, 6)
-        except Exception:
-            return 0.0
-
-
-class NosanaNodeJobTimeLeftHoursSensor(_BaseNosanaSensor):
-    """Time left (hours) for the latest running job. 0 if finished or no timeout."""
-
-    def __init__(self, coordinator: NosanaNodeCoordinator, name: str, node_address: str):
-        super().__init__(coordinator, name, node_address, "job_time_left_hours")
-        self._attr_icon = "mdi:timer"
-        self._attr_native_unit_of_measurement = "h"
-        self._attr_state_class = SensorStateClass.MEASUREMENT
-
-    @property
-    def state(self) -> float:
-        from datetime import datetime, timezone
-        if self.coordinator.data is None:
-            return 0.0
-        data = self.coordinator.data
-        latest = (data.get("earnings") or {}).get("latest_job") or {}
-        try:
-            time_end = int(latest.get("timeEnd", 0) or 0)
-            if time_end > 0:
-                return 0.0
-
-            time_start_raw = int(latest.get("timeStart", 0) or 0)
-            timeout_raw = int(latest.get("timeout", 0) or 0)
-            if time_start_raw <= 0 or timeout_raw <= 0:
-                return 0.0
-
-            # Heuristic: detect if timeStart is in milliseconds
-            if time_start_raw > 1_000_000_000_000:
-                time_start = int(time_start_raw / 1000)
-            else:
-                time_start = time_start_raw
-
-            # timeout likely in seconds; if extremely large assume ms
-            if timeout_raw > 1_000_000_000:
-                timeout_seconds = timeout_raw / 1000.0
-            else:
-                timeout_seconds = float(timeout_raw)
-
-            now_ts = int(datetime.now(timezone.utc).timestamp())
-            expire_at = int(time_start + int(timeout_seconds))
-            left = max(0, expire_at - now_ts)
-            return round(float(left) / 3600.0, 6)
-        except Exception:
-            return 0.0
-
-    @property
-    def extra_state_attributes(self) -> dict:
-        # Expose the raw latest_job for debugging convenience
-        data = self.coordinator.data or {}
-        latest = (data.get("earnings") or {}).get("latest_job")
-        return {"latest_job": latest} if isinstance(latest, dict) else {}
+        return self.entity_description.attributes_fn(self.coordinator)
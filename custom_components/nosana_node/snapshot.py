@@ -0,0 +1,218 @@
+# custom_components/nosana_node/snapshot.py
+"""Typed coordinator data for Nosana Node integration.
+
+`coordinator.data` is a `NodeSnapshot`: frozen, slotted section objects
+(`Specs`, `Market`, `Earnings`, `LatestJob`) plus the raw `/node/info` mapping.
+Every type is also a read-only `Mapping`, so existing `data.get("specs", {})
+.get("ram")` style access keeps working.
+
+Snapshots are shared structurally: a section equal to the previous tick's is
+replaced by the previous object, and a tick where nothing changed returns the
+previous snapshot itself. Consumers can therefore detect changes by identity.
+"""
+from collections.abc import Mapping
+from dataclasses import dataclass, fields
+from typing import Any, Dict, FrozenSet, Iterator, Optional, Tuple
+
+# sections of coordinator.data; everything else at the top level is the `info` section
+SECTION_KEYS = ("specs", "market", "queue", "earnings", "stale")
+ALL_SECTIONS: FrozenSet[str] = frozenset(("info",) + SECTION_KEYS)
+
+
+class _FieldMapping(Mapping):
+    """Read-only dict view over the fields of a slotted dataclass."""
+
+    __slots__ = ()
+    _keys: Tuple[str, ...] = ()
+
+    def __getitem__(self, key: str) -> Any:
+        if key not in self._keys:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._keys)
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    @classmethod
+    def from_dict(cls, data: Optional[Mapping]):
+        """Build from a plain dict, ignoring unknown keys."""
+        if isinstance(data, cls):
+            return data
+        data = data if isinstance(data, Mapping) else {}
+        return cls(**{key: _frozen(data.get(key)) for key in cls._keys})
+
+    def as_dict(self) -> Dict[str, Any]:
+        """Return a plain (JSON-serializable) dict copy."""
+        return {key: _plain(getattr(self, key)) for key in self._keys}
+
+
+def _frozen(value: Any) -> Any:
+    return tuple(value) if isinstance(value, list) else value
+
+
+def _plain(value: Any) -> Any:
+    if isinstance(value, _FieldMapping):
+        return value.as_dict()
+    if isinstance(value, tuple):
+        return [_plain(v) for v in value]
+    return value
+
+
+def _field_keys(cls):
+    cls._keys = tuple(f.name for f in fields(cls))
+    return cls
+
+
+@_field_keys
+@dataclass(frozen=True, slots=True, eq=True)
+class Specs(_FieldMapping):
+    """Normalized dashboard /metrics (`specs` section)."""
+
+    packageVersion: Optional[str] = None
+    marketAddress: Optional[str] = None
+    ram: Optional[int] = None
+    diskSpace: Optional[float] = None
+    ping_ms: Optional[float] = None
+    download_mbps: Optional[float] = None
+    upload_mbps: Optional[float] = None
+    network_country: Optional[str] = None
+    cpu: Optional[str] = None
+    logicalCores: Optional[int] = None
+    physicalCores: Optional[int] = None
+    # ({"gpu": name}, ...) per device
+    gpus: Optional[Tuple[Mapping, ...]] = None
+    memoryGPU: Optional[float] = None
+    system_environment: Optional[str] = None
+
+
+@_field_keys
+@dataclass(frozen=True, slots=True, eq=True)
+class Market(_FieldMapping):
+    """Normalized market of the node (`market` section)."""
+
+    address: Optional[str] = None
+    name: Optional[str] = None
+    type: Optional[str] = None
+    slug: Optional[str] = None
+    nos_reward_per_second: Optional[float] = None
+    usd_reward_per_hour: Optional[float] = None
+
+
+@_field_keys
+@dataclass(frozen=True, slots=True, eq=True)
+class LatestJob(_FieldMapping):
+    """Running (or most recent) job of the node."""
+
+    id: int = 0
+    timeStart: int = 0
+    timeEnd: int = 0
+    timeout: int = 0
+
+
+@_field_keys
+@dataclass(frozen=True, slots=True, eq=True)
+class Earnings(_FieldMapping):
+    """Ledger totals, latest benchmark and latest job (`earnings` section)."""
+
+    usd_total: float = 0.0
+    seconds_total: int = 0
+    jobs_tracked: int = 0
+    benchmark: Optional[Mapping[str, Any]] = None
+    latest_job: Optional[LatestJob] = None
+
+    @classmethod
+    def from_dict(cls, data: Optional[Mapping]) -> "Earnings":
+        if isinstance(data, cls):
+            return data
+        data = data if isinstance(data, Mapping) else {}
+        latest = data.get("latest_job")
+        return cls(
+            usd_total=data.get("usd_total") or 0.0,
+            seconds_total=data.get("seconds_total") or 0,
+            jobs_tracked=data.get("jobs_tracked") or 0,
+            benchmark=data.get("benchmark"),
+            latest_job=LatestJob.from_dict(latest) if latest else None,
+        )
+
+
+@dataclass(frozen=True, slots=True, eq=True)
+class NodeSnapshot(Mapping):
+    """Coordinator data of one node; `data[key]` reads info keys or sections."""
+
+    info: Mapping[str, Any]
+    specs: Specs
+    market: Market
+    queue: Mapping[str, Any]
+    earnings: Earnings
+    stale: Mapping[str, Any]
+
+    def __getitem__(self, key: str) -> Any:
+        if key in SECTION_KEYS:
+            return getattr(self, key)
+        return self.info[key]
+
+    def __iter__(self) -> Iterator[str]:
+        yield from (k for k in self.info if k not in SECTION_KEYS)
+        yield from SECTION_KEYS
+
+    def __len__(self) -> int:
+        return sum(1 for k in self.info if k not in SECTION_KEYS) + len(SECTION_KEYS)
+
+    def as_dict(self) -> Dict[str, Any]:
+        """Return the former merged-dict shape as plain (JSON-serializable) dicts."""
+        out = {k: v for k, v in self.info.items() if k not in SECTION_KEYS}
+        for key in SECTION_KEYS:
+            out[key] = _plain(getattr(self, key))
+        return out
+
+
+def _share(previous: Any, current: Any) -> Any:
+    """Return previous when equal to current, so unchanged sections keep their identity."""
+    if previous is current or previous != current:
+        return current
+    return previous
+
+
+def build_snapshot(
+    previous: Optional[NodeSnapshot],
+    info: Mapping[str, Any],
+    specs: Specs,
+    market: Market,
+    queue: Mapping[str, Any],
+    earnings: Earnings,
+    stale: Mapping[str, Any],
+) -> NodeSnapshot:
+    """Build the next snapshot, reusing every section (or the whole snapshot) that is unchanged."""
+    if previous is None:
+        return NodeSnapshot(info, specs, market, queue, earnings, stale)
+    info = _share(previous.info, info)
+    specs = _share(previous.specs, specs)
+    market = _share(previous.market, market)
+    queue = _share(previous.queue, queue)
+    earnings = _share(previous.earnings, earnings)
+    stale = _share(previous.stale, stale)
+    if (
+        info is previous.info
+        and specs is previous.specs
+        and market is previous.market
+        and queue is previous.queue
+        and earnings is previous.earnings
+        and stale is previous.stale
+    ):
+        return previous
+    return NodeSnapshot(info, specs, market, queue, earnings, stale)
+
+
+def changed_sections(previous: Optional[NodeSnapshot], current: NodeSnapshot) -> FrozenSet[str]:
+    """Return the sections that differ between two snapshots (identity check)."""
+    if previous is None:
+        return ALL_SECTIONS
+    if previous is current:
+        return frozenset()
+    changed = {key for key in SECTION_KEYS if getattr(previous, key) is not getattr(current, key)}
+    if previous.info is not current.info:
+        changed.add("info")
+    return frozenset(changed)
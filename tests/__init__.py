@@ -0,0 +1 @@
+"""Tests for the Nosana Node integration."""
@@ -0,0 +1,55 @@
+# tests/common.py
+"""Helpers shared by the Nosana Node tests.
+
+Modules without Home Assistant imports (ledger, snapshot, market_account,
+instrumentation) are loaded straight from their files, like the benchmarks do,
+so their tests run without Home Assistant installed. Importing them through the
+package would run `custom_components/nosana_node/__init__.py`, which needs it.
+"""
+import asyncio
+import importlib.util
+import tempfile
+from pathlib import Path
+from types import ModuleType
+from typing import Any, Awaitable, Callable, Dict
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+COMPONENT_DIR = REPO_ROOT / "custom_components" / "nosana_node"
+BENCHMARKS_DIR = REPO_ROOT / "benchmarks"
+
+_loaded: Dict[Path, ModuleType] = {}
+
+
+def _load(path: Path, name: str) -> ModuleType:
+    module = _loaded.get(path)
+    if module is None:
+        spec = importlib.util.spec_from_file_location(name, path)
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+        _loaded[path] = module
+    return module
+
+
+def load_component_module(name: str) -> ModuleType:
+    """Load a Home Assistant-free module of the integration from its file."""
+    return _load(COMPONENT_DIR / f"{name}.py", f"nosana_node_{name}")
+
+
+def load_benchmark_module(name: str) -> ModuleType:
+    """Load a module of benchmarks/ (e.g. the baseline scanner or the stand-in server)."""
+    return _load(BENCHMARKS_DIR / f"{name}.py", name)
+
+
+def run_with_hass(test: Callable[[Any], Awaitable[None]]) -> None:
+    """Run test(hass) on a throwaway Home Assistant instance (needs Home Assistant)."""
+    from homeassistant.core import HomeAssistant
+
+    async def _async_main() -> None:
+        with tempfile.TemporaryDirectory() as config_dir:
+            hass = HomeAssistant(config_dir)
+            try:
+                await test(hass)
+            finally:
+                await hass.async_stop(force=True)
+
+    asyncio.run(_async_main())
@@ -0,0 +1,102 @@
+# tests/test_conditional.py
+"""Tests for conditional GETs: validators are sent and a 304 returns the cached object."""
+import asyncio
+from typing import Any, Dict, List, Optional
+
+import pytest
+
+pytest.importorskip("homeassistant")
+
+from custom_components.nosana_node.conditional import ConditionalCache  # noqa: E402
+
+URL = "https://dashboard.k8s.prd.nos.ci/api/markets"
+
+
+class _Response:
+    def __init__(self, status: int, payload: Any = None, headers: Optional[Dict[str, str]] = None):
+        self.status = status
+        self._payload = payload
+        self.headers = headers or {}
+
+    async def json(self) -> Any:
+        # a fresh object per parse, like aiohttp
+        return [dict(item) for item in self._payload]
+
+
+class _Limiter:
+    """Stands in for NosanaRateLimiter.async_get; replays responses and records request headers."""
+
+    def __init__(self, *responses: _Response):
+        self._responses = list(responses)
+        self.sent_headers: List[Optional[Dict[str, str]]] = []
+
+    async def async_get(self, session, url, priority, stats, headers=None):
+        self.sent_headers.append(headers)
+        return self._responses.pop(0)
+
+
+def _get(cache: ConditionalCache, limiter: _Limiter):
+    return asyncio.run(cache.async_get_json(None, limiter, URL))
+
+
+def test_304_returns_the_cached_object_itself():
+    cache = ConditionalCache()
+    limiter = _Limiter(_Response(200, [{"address": "m"}], {"ETag": '"v1"'}), _Response(304))
+    status, first = _get(cache, limiter)
+    assert status == 200
+    status, second = _get(cache, limiter)
+    assert status == 304
+    assert second is first
+    assert limiter.sent_headers == [None, {"If-None-Match": '"v1"'}]
+    assert (cache.hits, cache.misses, len(cache)) == (1, 1, 1)
+
+
+def test_last_modified_is_sent_back():
+    cache = ConditionalCache()
+    stamp = "Tue, 02 Jan 2024 00:00:00 GMT"
+    limiter = _Limiter(_Response(200, [], {"Last-Modified": stamp}), _Response(304))
+    _get(cache, limiter)
+    _get(cache, limiter)
+    assert limiter.sent_headers[1] == {"If-Modified-Since": stamp}
+
+
+def test_changed_payload_replaces_the_entry():
+    cache = ConditionalCache()
+    limiter = _Limiter(
+        _Response(200, [{"v": 1}], {"ETag": '"v1"'}),
+        _Response(200, [{"v": 2}], {"ETag": '"v2"'}),
+        _Response(304),
+    )
+    _, first = _get(cache, limiter)
+    _, second = _get(cache, limiter)
+    _, third = _get(cache, limiter)
+    assert second is not first and second == [{"v": 2}]
+    assert third is second
+    assert limiter.sent_headers[2] == {"If-None-Match": '"v2"'}
+
+
+def test_responses_without_validators_are_not_kept():
+    cache = ConditionalCache()
+    limiter = _Limiter(_Response(200, [{"v": 1}]), _Response(200, [{"v": 1}]))
+    _get(cache, limiter)
+    _get(cache, limiter)
+    assert len(cache) == 0
+    assert limiter.sent_headers == [None, None]
+
+
+def test_errors_return_no_payload_and_keep_the_entry():
+    cache = ConditionalCache()
+    limiter = _Limiter(_Response(200, [{"v": 1}], {"ETag": '"v1"'}), _Response(500), _Response(304))
+    _, first = _get(cache, limiter)
+    assert _get(cache, limiter) == (500, None)
+    assert _get(cache, limiter)[1] is first
+
+
+def test_forget_drops_the_validators():
+    cache = ConditionalCache()
+    limiter = _Limiter(_Response(200, [], {"ETag": '"v1"'}), _Response(304))
+    _get(cache, limiter)
+    cache.forget(URL)
+    # an unexpected 304 without a cached body carries no payload
+    assert _get(cache, limiter) == (304, None)
+    assert limiter.sent_headers[1] is None
@@ -0,0 +1,118 @@
+# tests/test_ledger.py
+"""Tests for the jobs ledger: incremental aggregates, migration and backfill cursor."""
+from tests.common import load_component_module
+
+ledger = load_component_module("ledger")
+
+DAY = 86400
+# 2024-01-02 00:00:00 UTC
+T0 = 1704153600
+
+
+def _job(job_id, start, end=0, timeout=3600, usd_per_hour=0.36, **extra):
+    return {"id": job_id, "timeStart": start, "timeEnd": end, "timeout": timeout, "usdRewardPerHour": usd_per_hour, **extra}
+
+
+def test_running_job_is_stored_but_not_counted():
+    book = ledger.JobsLedger()
+    changed, _ = book.ingest(_job(1, T0))
+    assert changed
+    assert book.dirty
+    assert book.totals() == {"usd_total": 0.0, "seconds_total": 0, "jobs_tracked": 1}
+    assert book.aggregates["days"] == {}
+    assert book.latest_job() == {"id": 1, "timeStart": T0, "timeEnd": 0, "timeout": 3600}
+
+
+def test_finalizing_a_job_updates_totals_and_day_bucket():
+    book = ledger.JobsLedger()
+    book.ingest(_job(1, T0))
+    changed, _ = book.ingest(_job(1, T0, T0 + 1800))
+    assert changed
+    assert book.totals() == {"usd_total": 0.18, "seconds_total": 1800, "jobs_tracked": 1}
+    assert book.aggregates["jobs_finalized"] == 1
+    assert book.aggregates["days"] == {"2024-01-02": {"usd": 0.18, "seconds": 1800, "jobs": 1}}
+
+
+def test_runtime_is_capped_at_timeout():
+    book = ledger.JobsLedger()
+    book.ingest(_job(1, T0, T0 + 7200, timeout=3600))
+    assert book.totals()["seconds_total"] == 3600
+
+
+def test_reingesting_an_unchanged_job_is_a_no_op():
+    book = ledger.JobsLedger()
+    book.ingest(_job(1, T0, T0 + 1800))
+    book.dirty = False
+    changed, _ = book.ingest(_job(1, T0, T0 + 1800))
+    assert not changed
+    assert not book.dirty
+    assert book.aggregates["jobs_finalized"] == 1
+
+
+def test_changed_end_time_moves_the_contribution_between_days():
+    book = ledger.JobsLedger()
+    book.ingest(_job(1, T0, T0 + 1800))
+    book.ingest(_job(1, T0, T0 + DAY + 1800, timeout=0))
+    assert book.aggregates["jobs_finalized"] == 1
+    assert list(book.aggregates["days"]) == ["2024-01-03"]
+
+
+def test_aggregates_match_a_full_recount():
+    book = ledger.JobsLedger()
+    for i in range(20):
+        start = T0 + i * 5000
+        book.ingest(_job(i, start))
+        if i % 3:
+            book.ingest(_job(i, start, start + 600 + i * 10))
+    rebuilt = ledger.JobsLedger(dict(book.jobs))
+    assert rebuilt.aggregates["jobs_finalized"] == book.aggregates["jobs_finalized"]
+    assert rebuilt.aggregates["seconds_total"] == book.aggregates["seconds_total"]
+    assert round(rebuilt.aggregates["usd_total"], 9) == round(book.aggregates["usd_total"], 9)
+    assert rebuilt.aggregates["days"].keys() == book.aggregates["days"].keys()
+
+
+def test_store_without_aggregates_is_migrated():
+    source = ledger.JobsLedger()
+    source.ingest(_job(1, T0, T0 + 1800))
+    source.ingest(_job(2, T0 + 3600))
+    migrated = ledger.JobsLedger.from_store_data({"jobs": source.as_store_data()["jobs"]})
+    assert migrated.dirty
+    assert migrated.aggregates["jobs_finalized"] == 1
+    assert migrated.totals() == source.totals()
+
+
+def test_store_with_aggregates_is_not_rebuilt():
+    data = {"jobs": {}, "aggregates": {"usd_total": 5.0, "seconds_total": 10, "jobs_finalized": 2, "days": {}}}
+    book = ledger.JobsLedger.from_store_data(data)
+    assert not book.dirty
+    assert book.totals()["usd_total"] == 5.0
+
+
+def test_backfill_cursor_round_trips_through_the_store():
+    book = ledger.JobsLedger()
+    assert book.backfill == {"offset": 0, "complete": False}
+    book.backfill = {"offset": 40, "complete": True, "last_run": "2024-01-02T00:00:00+00:00"}
+    restored = ledger.JobsLedger.from_store_data(book.as_store_data())
+    assert restored.backfill == book.backfill
+
+
+def test_invalid_store_data_gives_an_empty_ledger():
+    for data in (None, [], "x"):
+        book = ledger.JobsLedger.from_store_data(data)
+        assert book.jobs == {}
+        assert book.totals()["jobs_tracked"] == 0
+
+
+def test_jobs_without_id_or_start_are_ignored():
+    book = ledger.JobsLedger()
+    assert book.ingest({"timeStart": T0}) == (False, None)
+    assert book.ingest(_job(1, 0)) == (False, None)
+    assert book.ingest("not a job") == (False, None)
+    assert book.jobs == {}
+
+
+def test_running_job_wins_latest_job_over_newer_finished_one():
+    book = ledger.JobsLedger()
+    book.ingest(_job(1, T0))
+    book.ingest(_job(2, T0 + 100, T0 + 200))
+    assert book.latest_job()["id"] == 1
@@ -0,0 +1,140 @@
+# tests/test_market_account.py
+"""Tests for market account decoding and queue lookups.
+
+The lookups are checked against the original per-byte `Vec<Pubkey>` scanner,
+kept as the baseline in benchmarks/bench_market_account.py.
+"""
+import random
+import struct
+
+import pytest
+
+from tests.common import load_benchmark_module, load_component_module
+
+ma = load_component_module("market_account")
+bench = load_benchmark_module("bench_market_account")
+
+
+def _keys(rng, count):
+    return [rng.randbytes(32) for _ in range(count)]
+
+
+def _slice(queue_type, keys):
+    body = bytes([queue_type]) + struct.pack("<I", len(keys)) + b"".join(keys)
+    return body + bytes(ma.MARKET_QUEUE_SLICE_LENGTH - len(body))
+
+
+def test_base58_round_trip():
+    rng = random.Random(1)
+    for data in (bytes(32), b"\0\0" + rng.randbytes(30), rng.randbytes(32)):
+        assert ma._b58decode(ma._b58encode(data)) == data
+    with pytest.raises(ValueError):
+        ma._b58decode("0OIl")
+
+
+def test_node_key_rejects_invalid_addresses():
+    key = random.Random(2).randbytes(32)
+    assert ma._node_key(ma._b58encode(key)) == key
+    assert ma._node_key("not base58!") is None
+    assert ma._node_key(ma._b58encode(b"short")) is None
+
+
+def test_decode_account_data_shapes():
+    assert ma._decode_account_data(["AQID", "base64"]) == b"\x01\x02\x03"
+    assert ma._decode_account_data(b"\x01") == b"\x01"
+    assert ma._decode_account_data(None) is None
+    assert ma._decode_account_data({"data": "x"}) is None
+
+
+def test_slice_decoder_finds_the_node():
+    keys = _keys(random.Random(3), 12)
+    position, queue = ma._get_queue_position_from_slice(_slice(ma.QUEUE_TYPE_NODE, keys), keys[4])
+    assert position == 5
+    assert (queue.queue_type, queue.length) == (ma.QUEUE_TYPE_NODE, 12)
+
+
+def test_slice_decoder_node_not_queued():
+    keys = _keys(random.Random(4), 3)
+    position, queue = ma._get_queue_position_from_slice(_slice(ma.QUEUE_TYPE_NODE, keys[:2]), keys[2])
+    assert position is None
+    assert queue.length == 2
+
+
+def test_slice_decoder_job_and_empty_queues_have_no_position():
+    keys = _keys(random.Random(5), 2)
+    position, queue = ma._get_queue_position_from_slice(_slice(ma.QUEUE_TYPE_JOB, keys), keys[0])
+    assert position is None and queue.queue_type == ma.QUEUE_TYPE_JOB
+    position, queue = ma._get_queue_position_from_slice(bytes([ma.QUEUE_TYPE_EMPTY, 0, 0, 0, 0]), keys[0])
+    assert position is None and queue.length == 0
+
+
+def test_slice_decoder_ignores_unaligned_matches():
+    keys = _keys(random.Random(6), 3)
+    data = bytearray(_slice(ma.QUEUE_TYPE_NODE, keys))
+    target = random.Random(7).randbytes(32)
+    # the target straddles items 0 and 1: found by bytes.find but not at a slot boundary
+    data[5 + 16 : 5 + 48] = target
+    position, _ = ma._get_queue_position_from_slice(bytes(data), target)
+    assert position is None
+
+
+def test_slice_decoder_rejects_bad_slices():
+    key = bytes(32)
+    assert ma._get_queue_position_from_slice(b"", key) is None
+    assert ma._get_queue_position_from_slice(bytes([7, 0, 0, 0, 0]), key) is None
+    # length beyond the queue capacity
+    assert ma._get_queue_position_from_slice(bytes([1]) + struct.pack("<I", 1000) + bytes(64), key) is None
+    # length beyond the returned bytes
+    assert ma._get_queue_position_from_slice(bytes([1]) + struct.pack("<I", 3) + bytes(64), key) is None
+
+
+def test_full_account_and_slice_agree():
+    rng = random.Random(8)
+    keys = _keys(rng, 40)
+    blob = bench._market_blob(rng, 16384, keys, discriminator=True)
+    account = ma._get_queue_position(blob, keys[17])
+    position, queue = ma._get_queue_position_from_slice(
+        blob[ma.MARKET_QUEUE_SLICE_OFFSET : ma.MARKET_QUEUE_SLICE_OFFSET + ma.MARKET_QUEUE_SLICE_LENGTH], keys[17]
+    )
+    assert account == (position, queue.length) == (18, 40)
+
+
+@pytest.mark.parametrize("use_numpy", [True, False])
+@pytest.mark.parametrize("size,queue", [(1024, 1), (1024, 10), (16384, 100), (16384, 314)])
+def test_lookups_agree_with_the_baseline_scanner(monkeypatch, use_numpy, size, queue):
+    if use_numpy and ma.np is None:
+        pytest.skip("numpy not installed")
+    if not use_numpy:
+        monkeypatch.setattr(ma, "np", None)
+    rng = random.Random(size * 1000 + queue)
+    keys = _keys(rng, queue)
+    for index in {0, queue // 2, queue - 1}:
+        node_key = keys[index]
+        node_addr = ma._b58encode(node_key)
+        with_layout = bench._market_blob(rng, size, keys, discriminator=True)
+        without_layout = bench._market_blob(rng, size, keys, discriminator=False)
+        expected = bench._baseline_queue_position(without_layout, node_addr)
+        assert expected == (index + 1, queue)
+        assert ma._get_queue_position(with_layout, node_key) == expected
+        # unknown layout: the heuristic fallback
+        assert ma._get_queue_position(without_layout, node_key) == expected
+        assert ma._get_queue_position_from_market_raw(with_layout, node_addr) == expected
+
+
+def test_absent_node_agrees_with_the_baseline_scanner():
+    rng = random.Random(9)
+    keys = _keys(rng, 20)
+    stranger = rng.randbytes(32)
+    blob = bench._market_blob(rng, 4096, keys, discriminator=False)
+    assert bench._baseline_queue_position(blob, ma._b58encode(stranger)) is None
+    assert ma._get_queue_position(blob, stranger) is None
+
+
+def test_heuristic_prefers_the_longest_vec():
+    rng = random.Random(10)
+    node = rng.randbytes(32)
+    short = struct.pack("<I", 2) + rng.randbytes(32) + node
+    long = struct.pack("<I", 4) + rng.randbytes(32) * 2 + node + rng.randbytes(32)
+    blob = bytes(8) + short + bytes(7) + long + bytes(16)
+    assert ma._find_pubkey_in_vecs(blob, node) == (3, 4)
+    assert bench._baseline_queue_position(blob, ma._b58encode(node)) == (3, 4)
@@ -0,0 +1,116 @@
+# tests/test_market_queue.py
+"""Tests for the batched market queue service against the stand-in `/rpc` endpoint."""
+import asyncio
+import struct
+
+import pytest
+
+pytest.importorskip("homeassistant")
+
+from custom_components.nosana_node.const import DATA_RATE_LIMITER, DOMAIN  # noqa: E402
+from custom_components.nosana_node.market_account import QUEUE_TYPE_NODE  # noqa: E402
+from custom_components.nosana_node.market_queue import NosanaMarketQueueService  # noqa: E402
+from custom_components.nosana_node.ratelimit import NosanaRateLimiter  # noqa: E402
+
+from tests.common import load_benchmark_module, run_with_hass  # noqa: E402
+
+standin = load_benchmark_module("standin")
+
+
+def _market(i: int) -> str:
+    return f"market{i:040d}"
+
+
+def _run(test, latency_ms: float = 0.0) -> None:
+    """Run test(hass, server, service) with a queue service aimed at a fresh stand-in server."""
+
+    async def _async_test(hass) -> None:
+        # everything is served from one local host: lift the per-host limit
+        hass.data.setdefault(DOMAIN, {})[DATA_RATE_LIMITER] = NosanaRateLimiter(rate=1000.0, capacity=1000.0)
+        server = standin.StandInServer(standin.StandInConfig(latency_ms=latency_ms, jitter_ms=0.0, seed=1))
+        base_url = await server.async_start()
+        try:
+            await test(hass, server, NosanaMarketQueueService(hass, f"{base_url}/rpc"))
+        finally:
+            await server.async_stop()
+
+    run_with_hass(_async_test)
+
+
+def test_markets_are_fetched_in_chunks_of_100():
+    async def _test(hass, server, service):
+        for i in range(250):
+            service.register(_market(i))
+        queue = bytes([QUEUE_TYPE_NODE]) + struct.pack("<I", 1) + bytes(range(32))
+        server.queues[_market(249)] = queue
+        await service.async_refresh()
+        assert [len(call) for call in server.rpc_calls] == [100, 100, 50]
+        assert sorted(a for call in server.rpc_calls for a in call) == sorted(_market(i) for i in range(250))
+        assert service.get_slice(_market(249)) == queue
+        assert service.get_slice(_market(0))[0] == 255
+        assert service.last_fetch_ok
+
+    _run(_test)
+
+
+def test_one_call_per_market_per_tick_for_any_number_of_nodes():
+    async def _test(hass, server, service):
+        market = _market(1)
+        # ten nodes in the same market
+        for _ in range(10):
+            service.register(market)
+        slices = await asyncio.gather(*(service.async_get_slice(market) for _ in range(10)))
+        assert server.rpc_calls == [[market]]
+        assert len(set(slices)) == 1
+        # within the TTL every node is served from the cache
+        await asyncio.gather(*(service.async_get_slice(market) for _ in range(10)))
+        assert len(server.rpc_calls) == 1
+        # after expiry: one more call, still a single address
+        service.async_expire()
+        await service.async_refresh()
+        assert server.rpc_calls == [[market], [market]]
+
+    _run(_test, latency_ms=20.0)
+
+
+def test_registrations_are_refcounted():
+    async def _test(hass, server, service):
+        first = service.register(_market(1))
+        second = service.register(_market(1))
+        other = service.register(_market(2))
+        await service.async_refresh()
+        first()
+        assert service.markets == [_market(1), _market(2)]
+        assert service.get_slice(_market(1)) is not None
+        second()
+        assert service.markets == [_market(2)]
+        assert service.get_slice(_market(1)) is None
+        service.async_expire()
+        await service.async_refresh()
+        assert server.rpc_calls[-1] == [_market(2)]
+        other()
+        assert service.markets == []
+        # nothing registered: no call at all
+        service.async_expire()
+        await service.async_refresh()
+        assert len(server.rpc_calls) == 2
+
+    _run(_test)
+
+
+def test_market_registered_mid_batch_is_fetched_before_refresh_returns():
+    async def _test(hass, server, service):
+        service.register(_market(1))
+        refresh = hass.async_create_task(service.async_refresh())
+        # register while the first getMultipleAccounts call waits on the (slow) server
+        await asyncio.sleep(0.05)
+        assert service._inflight is not None
+        service.register(_market(2))
+        await refresh
+        assert server.rpc_calls[0] == [_market(1)]
+        assert len(server.rpc_calls) == 2
+        assert _market(2) in server.rpc_calls[1]
+        assert service.get_slice(_market(2)) is not None
+        assert not service.expired()
+
+    _run(_test, latency_ms=150.0)
@@ -0,0 +1,144 @@
+# tests/test_market_stream.py
+"""Tests for the accountSubscribe push feed against the stand-in websocket."""
+import asyncio
+import struct
+import time
+
+import pytest
+
+pytest.importorskip("homeassistant")
+
+from custom_components.nosana_node.const import DATA_RATE_LIMITER, DOMAIN  # noqa: E402
+from custom_components.nosana_node.market_account import (  # noqa: E402
+    MARKET_ACCOUNT_DISCRIMINATOR,
+    MARKET_QUEUE_SLICE_OFFSET,
+    QUEUE_TYPE_NODE,
+)
+from custom_components.nosana_node.market_queue import NosanaMarketQueueService  # noqa: E402
+from custom_components.nosana_node.market_stream import NosanaMarketStream, ws_url_for  # noqa: E402
+from custom_components.nosana_node.ratelimit import NosanaRateLimiter  # noqa: E402
+
+from tests.common import load_benchmark_module, run_with_hass  # noqa: E402
+
+standin = load_benchmark_module("standin")
+
+MARKET = standin.MARKET_ADDRESS
+RECONNECT_MIN = 0.05
+
+
+def _queue(*keys: bytes) -> bytes:
+    return bytes([QUEUE_TYPE_NODE]) + struct.pack("<I", len(keys)) + b"".join(keys)
+
+
+def _account(queue: bytes) -> bytes:
+    """A full MarketAccount whose queue region holds queue."""
+    return MARKET_ACCOUNT_DISCRIMINATOR + bytes(MARKET_QUEUE_SLICE_OFFSET - 8) + queue
+
+
+async def _wait_for(condition, timeout: float = 5.0) -> None:
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "timed out"
+        await asyncio.sleep(0.01)
+
+
+def _run(test) -> None:
+    """Run test(server, service, stream, changed) with push mode on for MARKET."""
+
+    async def _async_test(hass) -> None:
+        hass.data.setdefault(DOMAIN, {})[DATA_RATE_LIMITER] = NosanaRateLimiter(rate=1000.0, capacity=1000.0)
+        server = standin.StandInServer(standin.StandInConfig(latency_ms=0.0, jitter_ms=0.0, seed=1))
+        base_url = await server.async_start()
+        service = NosanaMarketQueueService(hass, f"{base_url}/rpc")
+        # a short backoff so reconnects happen within the test
+        stream = NosanaMarketStream(hass, service, ws_url_for(service.rpc_url), reconnect_min=RECONNECT_MIN)
+        service._stream = stream
+        service.register(MARKET)
+        changed = []
+        leave = service.async_enable_push(changed.append)
+        try:
+            await _wait_for(lambda: MARKET in stream._subs)
+            await test(server, service, stream, changed)
+        finally:
+            leave()
+            await server.async_stop()
+
+    run_with_hass(_async_test)
+
+
+def test_notification_reaches_push_slice():
+    async def _test(server, service, stream, changed):
+        pushed = []
+        push_slice = service.async_push_slice
+
+        def _spy(market, data):
+            pushed.append((market, data))
+            push_slice(market, data)
+
+        service.async_push_slice = _spy
+        await service.async_refresh()
+        queue = _queue(bytes(range(32)))
+        assert await server.async_notify(MARKET, _account(queue)) == 1
+        await _wait_for(lambda: changed)
+        assert pushed == [(MARKET, queue)]
+        assert changed == [MARKET]
+        assert service.get_slice(MARKET) == queue
+        # same queue again: stored, but listeners are not called
+        await server.async_notify(MARKET, _account(queue))
+        await _wait_for(lambda: len(pushed) == 2)
+        assert changed == [MARKET]
+        # non-object messages are ignored without dropping the socket
+        await server.async_send_raw("[1, 2]")
+        await server.async_send_raw('{"method": "accountNotification", "params": [1]}')
+        queue = _queue(bytes(range(32)), bytes(range(1, 33)))
+        await server.async_notify(MARKET, _account(queue))
+        await _wait_for(lambda: len(changed) == 2)
+        assert service.get_slice(MARKET) == queue
+        assert stream.reconnects == 0
+
+    _run(_test)
+
+
+def test_market_counts_as_covered_after_its_post_subscribe_poll():
+    async def _test(server, service, stream, changed):
+        assert server.subscribed(MARKET)
+        assert not stream.covers(MARKET)
+        assert service.expired()
+        assert service._poll_markets() == [MARKET]
+        await service.async_refresh()
+        assert server.rpc_calls == [[MARKET]]
+        assert stream.covers(MARKET)
+        # pushed markets are left out of the poll
+        service.async_expire()
+        await service.async_refresh()
+        assert server.rpc_calls == [[MARKET]]
+
+    _run(_test)
+
+
+def test_dropped_socket_falls_back_to_polling_and_backs_off():
+    async def _test(server, service, stream, changed):
+        await service.async_refresh()
+        assert stream.covers(MARKET)
+        server.ws_enabled = False
+        await server.async_drop_sockets()
+        await _wait_for(lambda: not stream.connected)
+        assert not stream.covers(MARKET)
+        assert service.expired()
+        await service.async_refresh()
+        assert server.rpc_calls == [[MARKET], [MARKET]]
+        # refused handshakes: the delay between attempts doubles
+        await _wait_for(lambda: len(server.ws_connects) >= 4)
+        assert stream.reconnects >= 3
+        attempts = server.ws_connects[1:4]
+        gaps = [b - a for a, b in zip(attempts, attempts[1:])]
+        assert gaps[0] >= 2 * RECONNECT_MIN * 0.9
+        assert gaps[1] > gaps[0] * 1.5
+        # back up: subscribed again, covered after the next poll
+        server.ws_enabled = True
+        await _wait_for(lambda: MARKET in stream._subs)
+        assert not stream.covers(MARKET)
+        await service.async_refresh()
+        assert stream.covers(MARKET)
+
+    _run(_test)
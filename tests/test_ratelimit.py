@@ -0,0 +1,110 @@
+# tests/test_ratelimit.py
+"""Tests for the per-host rate limiter: Retry-After parsing, 429 blocks and the backfill reserve."""
+import asyncio
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+
+import pytest
+
+pytest.importorskip("homeassistant")
+
+from custom_components.nosana_node.ratelimit import (  # noqa: E402
+    PRIORITY_BACKFILL,
+    PRIORITY_STATUS,
+    NosanaRateLimiter,
+    RateLimited,
+    _parse_retry_after,
+)
+
+DASHBOARD = "https://dashboard.k8s.prd.nos.ci/api/jobs"
+NODE = "https://abc.node.k8s.prd.nos.ci/node/info"
+
+
+@pytest.mark.parametrize(
+    "value,expected",
+    [("120", 120.0), (" 3.5 ", 3.5), ("-5", 0.0), ("0", 0.0), (None, None), ("", None), ("soon", None)],
+)
+def test_parse_retry_after_seconds(value, expected):
+    assert _parse_retry_after(value) == expected
+
+
+def test_parse_retry_after_http_date():
+    when = datetime.now(timezone.utc) + timedelta(seconds=90)
+    assert 85 <= _parse_retry_after(format_datetime(when, usegmt=True)) <= 90
+    past = datetime.now(timezone.utc) - timedelta(hours=1)
+    assert _parse_retry_after(format_datetime(past, usegmt=True)) == 0.0
+
+
+def test_429_with_retry_after_blocks_only_that_host():
+    limiter = NosanaRateLimiter()
+    limiter.record_response(DASHBOARD, 429, {"Retry-After": "60"})
+
+    async def _acquire():
+        with pytest.raises(RateLimited) as err:
+            await limiter.async_acquire(DASHBOARD, PRIORITY_STATUS)
+        assert 55 <= err.value.retry_in <= 60
+        assert err.value.host == "dashboard.k8s.prd.nos.ci"
+        # another host keeps its own bucket
+        await limiter.async_acquire(NODE, PRIORITY_STATUS)
+
+    asyncio.run(_acquire())
+    state = limiter.state()
+    assert state["dashboard.k8s.prd.nos.ci"]["consecutive_429"] == 1
+    assert state["dashboard.k8s.prd.nos.ci"]["throttled_total"] == 1
+    assert state["abc.node.k8s.prd.nos.ci"]["blocked_for"] == 0
+
+
+def test_429_without_retry_after_backs_off_exponentially_with_jitter():
+    limiter = NosanaRateLimiter(backoff_base=30.0, backoff_max=900.0)
+    for failures in range(1, 7):
+        limiter.record_response(DASHBOARD, 429, {})
+        blocked_for = limiter.state()["dashboard.k8s.prd.nos.ci"]["blocked_for"]
+        backoff = min(900.0, 30.0 * 2 ** (failures - 1))
+        # blocks only ever extend, so the floor is the previous block
+        assert blocked_for <= backoff * 1.5 + 0.1
+    assert limiter.state()["dashboard.k8s.prd.nos.ci"]["consecutive_429"] == 6
+
+
+def test_success_resets_the_backoff():
+    limiter = NosanaRateLimiter()
+    limiter.record_response(DASHBOARD, 429, {"Retry-After": "1"})
+    limiter.record_response(DASHBOARD, 200, {})
+    assert limiter.state()["dashboard.k8s.prd.nos.ci"]["consecutive_429"] == 0
+    # server errors are not a sign the host recovered
+    limiter.record_response(DASHBOARD, 429, {"Retry-After": "1"})
+    limiter.record_response(DASHBOARD, 503, {})
+    assert limiter.state()["dashboard.k8s.prd.nos.ci"]["consecutive_429"] == 1
+
+
+def test_backfill_leaves_the_reserve_for_status_requests():
+    # practically no refill during the test
+    limiter = NosanaRateLimiter(rate=0.001, capacity=10.0, backfill_reserve=5.0)
+
+    async def _run():
+        for _ in range(5):
+            await limiter.async_acquire(DASHBOARD, PRIORITY_BACKFILL)
+        # the next backfill request would dig into the reserve: it waits
+        with pytest.raises(asyncio.TimeoutError):
+            await asyncio.wait_for(limiter.async_acquire(DASHBOARD, PRIORITY_BACKFILL), 0.05)
+        # status polling still gets the reserved tokens without waiting
+        for _ in range(5):
+            await asyncio.wait_for(limiter.async_acquire(DASHBOARD, PRIORITY_STATUS), 0.05)
+
+    asyncio.run(_run())
+
+
+def test_backfill_waits_out_a_block_instead_of_raising():
+    limiter = NosanaRateLimiter(rate=1000.0, capacity=10.0, backfill_reserve=5.0)
+    limiter.record_response(DASHBOARD, 429, {"Retry-After": "0.05"})
+
+    async def _run():
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        await asyncio.wait_for(limiter.async_acquire(DASHBOARD, PRIORITY_BACKFILL), 2)
+        assert loop.time() - start >= 0.04
+
+    asyncio.run(_run())
+
+
+def test_reserve_never_exceeds_the_bucket():
+    assert NosanaRateLimiter(capacity=3.0, backfill_reserve=5.0).backfill_reserve == 2.0
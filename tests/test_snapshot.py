@@ -0,0 +1,76 @@
+# tests/test_snapshot.py
+"""Tests for NodeSnapshot structural sharing and changed_sections."""
+from tests.common import load_component_module
+
+snapshot = load_component_module("snapshot")
+
+
+def _sections(ram=64, usd=1.5, position=3, info_state="QUEUED"):
+    return (
+        {"state": info_state, "version": "1.0.0"},
+        snapshot.Specs.from_dict({"ram": ram, "gpus": [{"gpu": "RTX 4090"}]}),
+        snapshot.Market.from_dict({"address": "market", "name": "Market"}),
+        {"position": position, "length": 10},
+        snapshot.Earnings.from_dict({"usd_total": usd, "latest_job": {"id": 7, "timeStart": 100, "timeEnd": 0, "timeout": 3600}}),
+        {},
+    )
+
+
+def test_first_snapshot_reports_every_section_changed():
+    current = snapshot.build_snapshot(None, *_sections())
+    assert snapshot.changed_sections(None, current) == snapshot.ALL_SECTIONS
+
+
+def test_unchanged_tick_returns_the_previous_snapshot():
+    previous = snapshot.build_snapshot(None, *_sections())
+    # equal but freshly built sections
+    current = snapshot.build_snapshot(previous, *_sections())
+    assert current is previous
+    assert snapshot.changed_sections(previous, current) == frozenset()
+
+
+def test_only_changed_sections_are_replaced():
+    previous = snapshot.build_snapshot(None, *_sections())
+    current = snapshot.build_snapshot(previous, *_sections(usd=2.0))
+    assert current is not previous
+    assert current.earnings is not previous.earnings
+    for key in ("info", "specs", "market", "queue", "stale"):
+        assert getattr(current, key) is getattr(previous, key)
+    assert snapshot.changed_sections(previous, current) == frozenset({"earnings"})
+
+
+def test_info_change_is_reported_as_info():
+    previous = snapshot.build_snapshot(None, *_sections())
+    current = snapshot.build_snapshot(previous, *_sections(info_state="RUNNING"))
+    assert snapshot.changed_sections(previous, current) == frozenset({"info"})
+    assert current["state"] == "RUNNING"
+
+
+def test_several_changes_are_all_reported():
+    previous = snapshot.build_snapshot(None, *_sections())
+    current = snapshot.build_snapshot(previous, *_sections(ram=128, position=1))
+    assert snapshot.changed_sections(previous, current) == frozenset({"specs", "queue"})
+
+
+def test_snapshot_reads_like_the_former_merged_dict():
+    current = snapshot.build_snapshot(None, *_sections())
+    assert current.get("state") == "QUEUED"
+    assert current["specs"]["ram"] == 64
+    assert current.get("earnings", {}).get("latest_job", {}).get("id") == 7
+    plain = current.as_dict()
+    assert plain["specs"]["gpus"] == [{"gpu": "RTX 4090"}]
+    assert plain["earnings"]["latest_job"] == {"id": 7, "timeStart": 100, "timeEnd": 0, "timeout": 3600}
+    assert set(current) == {"state", "version", *snapshot.SECTION_KEYS}
+
+
+def test_sections_are_immutable_and_hashable_by_value():
+    specs = snapshot.Specs.from_dict({"ram": 64, "gpus": [{"gpu": "a"}], "unknown": 1})
+    assert specs == snapshot.Specs.from_dict({"ram": 64, "gpus": [{"gpu": "a"}]})
+    assert "unknown" not in specs
+    assert snapshot.Specs.from_dict(specs) is specs
+    try:
+        specs.ram = 1
+    except Exception:
+        pass
+    else:
+        raise AssertionError("Specs must be frozen")